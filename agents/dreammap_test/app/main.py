@@ -1,26 +1,59 @@
 # GoalAura_AI/app/main.py
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 import uvicorn
 import os
 
 # Import the core logic and models
 # GoalAura_AI/app/main.py (CORRECTED IMPORT)
-from core.agent import generate_dynamic_roadmap
-from core.comparison_agent import generate_comparison_insights
-from core.opportunity_cost_agent import orchestrate_opportunity_cost
-from core.income_growth_agent import analyze_income_growth_paths, format_income_growth_report
-from core.models import DreamRoadmap, UserComparisonInsights, IncomeGrowthRequest
-from google import genai
+from core.agent import fast_dynamic_roadmap, generate_dynamic_roadmap, generate_dynamic_roadmaps, plan_goal_allocation, simulate_dream_goal_impact, stream_dynamic_roadmap, speculation_stats
+from core.comparison_agent import (
+    fast_comparison_insights,
+    fast_comparison_insights_from_analyses,
+    generate_comparison_insights,
+    generate_comparison_insights_from_analyses,
+)
+from core.opportunity_cost_agent import fast_opportunity_cost, orchestrate_opportunity_cost, stream_opportunity_cost
+from core.deadline import DeadlineExceeded, request_budget
+from core.income_growth_agent import analyze_income_growth_paths, fast_income_growth_paths, format_income_growth_report
+from core.models import DreamRoadmap, ExistingGoal, UserComparisonInsights, IncomeGrowthRequest
+from core.llm_gateway import get_gateway
+from core.model_router import TASK_REASONING, generate_for_task, get_router
+from core.quantum_tree import fast_quantum_decision, qdt_rate_limiter
+from core.singleflight import singleflight_stats
+from tools.cost_engine import classifier_stats
+from tools.transaction_bundle import aggregate_transaction_file, read_transaction_table
+from tools.transaction_store import get_transaction_store
+from tools.transaction_stream import parse_csv_table
 from google.genai import types
+import hmac
+import io
 import json
 
 
-if os.environ.get("GEMINI_API_KEY"):
-    client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
-else:
-    client = None
+# "fast" answers every endpoint from its deterministic analysis with a templated
+# narrative - no LLM call and no GEMINI_API_KEY needed (latency-critical screens,
+# degraded operation). Passed as ?mode=fast.
+AnalysisMode = Literal["full", "fast"]
+
+# Time budget (seconds) for the LLM calls of one request. A client can ask for a
+# tighter one with the X-Deadline-Ms header. When it runs out the agents answer
+# from their deterministic fallback and the response carries X-Degraded.
+DEFAULT_DEADLINE_S = float(os.environ.get("REQUEST_DEADLINE_S", "30"))
+ENDPOINT_DEADLINES_S = {
+    "/api/dream-map": 20.0,
+    "/api/dream-map/batch": 45.0,
+    "/api/opportunity-cost": 15.0,
+    "/api/quantum-decision-tree": 45.0,
+    "/api/compare-users": 25.0,
+    "/api/compare-users/stored": 25.0,
+    "/api/income-growth": 25.0,
+    "/api/income-growth-report": 25.0,
+}
 
 
 # --- 1. Define the Input Schema for the API ---
@@ -30,6 +63,14 @@ class DreamRequest(BaseModel):
     estimated_budget: float = Field(..., gt=0, description="User's estimated budget for the dream in INR.", example=150000)
     user_monthly_income: float = Field(..., gt=0, description="The user's monthly income in INR.", example=50000)
     target_months: int = Field(..., gt=0, description="Number of months to achieve the dream.", example=12)
+    existing_goals: Optional[List[ExistingGoal]] = Field(default=None, description="Goals already competing for the user's savings.")
+    monthly_savings: Optional[float] = Field(default=None, gt=0, description="What the user can save per month; defaults to the dream's required monthly saving.")
+    allocation_strategy: Literal["priority", "deadline", "proportional"] = Field(default="priority", description="How savings are split across goals.")
+
+
+class DreamBatchRequest(BaseModel):
+    """Schema for several dreams submitted together (e.g. during onboarding)."""
+    dreams: List[DreamRequest] = Field(..., min_length=1, max_length=50, description="Dreams to map, answered in the same order.")
 
 
 class ComparisonRequest(BaseModel):
@@ -39,6 +80,18 @@ class ComparisonRequest(BaseModel):
     current_user_transactions: str = Field(..., description="Current user's transaction data in CSV format as string")
     other_user_transactions: str = Field(..., description="Comparison user's transaction data in CSV format as string")
 
+
+class StoredComparisonRequest(BaseModel):
+    """Schema for comparing two users whose transactions are kept server-side."""
+    current_user_id: str = Field(..., min_length=1, description="Current user's id in the transaction store")
+    other_user_id: str = Field(..., min_length=1, description="Comparison user's id in the transaction store")
+    current_user_info: str = Field(..., description="Current user info in format: job_salary_savings", example="SoftwareEngineer_80000_50000")
+    other_user_info: str = Field(..., description="Comparison user info in format: job_salary_savings", example="SoftwareEngineer_85000_65000")
+    current_user_transactions: Optional[str] = Field(default=None, description="Current user's NEW transactions (CSV) since the last call, appended before comparing")
+    other_user_transactions: Optional[str] = Field(default=None, description="Comparison user's NEW transactions (CSV) since the last call, appended before comparing")
+    current_user_batch_id: Optional[str] = Field(default=None, description="Id of the current user's delta; re-sending the last applied id is a no-op")
+    other_user_batch_id: Optional[str] = Field(default=None, description="Id of the comparison user's delta; re-sending the last applied id is a no-op")
+
 # --- 2. Initialize FastAPI App ---
 app = FastAPI(
     title="GoalAura AI Backend",
@@ -55,21 +108,65 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+def _request_deadline_s(request: Request) -> float:
+    header = request.headers.get("x-deadline-ms")
+    if header:
+        try:
+            return max(0.0, float(header) / 1000.0)
+        except ValueError:
+            pass
+    return ENDPOINT_DEADLINES_S.get(request.url.path, DEFAULT_DEADLINE_S)
+
+
+@app.middleware("http")
+async def apply_request_deadline(request: Request, call_next):
+    """Give every LLM call made for this request the same deadline."""
+    with request_budget(_request_deadline_s(request)) as budget:
+        response = await call_next(request)
+    if budget.degraded:
+        response.headers["X-Degraded"] = ",".join(budget.degraded)
+    return response
+
+
+@app.on_event("shutdown")
+async def close_llm_gateway():
+    """Release the shared, pooled Gemini HTTP connections."""
+    await get_gateway().aclose()
+
 # --- 3. Define the API Endpoint ---
 @app.post("/api/dream-map", response_model=DreamRoadmap)
-async def create_dream_map(request: DreamRequest):
+async def create_dream_map(request: DreamRequest, mode: AnalysisMode = "full"):
     """
     Receives the user's dream with budget and timeline,
     returns brutally honest, realistic roadmap with detailed action plan.
     """
     try:
-        # Call the enhanced AI logic
-        roadmap = generate_dynamic_roadmap(
-            dream_text=request.dream_text,
-            estimated_budget=request.estimated_budget,
-            user_income=request.user_monthly_income,
-            target_months=request.target_months
-        )
+        if mode == "fast":
+            roadmap = fast_dynamic_roadmap(
+                dream_text=request.dream_text,
+                estimated_budget=request.estimated_budget,
+                user_income=request.user_monthly_income,
+                target_months=request.target_months
+            )
+        else:
+            # Call the enhanced AI logic
+            roadmap = await generate_dynamic_roadmap(
+                dream_text=request.dream_text,
+                estimated_budget=request.estimated_budget,
+                user_income=request.user_monthly_income,
+                target_months=request.target_months
+            )
+
+        if request.existing_goals:
+            goal_impact = simulate_dream_goal_impact(
+                roadmap,
+                [g.model_dump() for g in request.existing_goals],
+                request.monthly_savings or roadmap.monthlySaving,
+                request.allocation_strategy
+            )
+            # Roadmaps may be shared with coalesced/cached callers, so copy before annotating
+            roadmap = roadmap.model_copy(update={"goalImpact": goal_impact})
 
         # FastAPI automatically converts the Pydantic object to JSON
         return roadmap
@@ -82,6 +179,91 @@ async def create_dream_map(request: DreamRequest):
         )
 
 
+@app.post("/api/dream-map/batch")
+async def create_dream_map_batch(request: DreamBatchRequest, mode: AnalysisMode = "full"):
+    """
+    Generates roadmaps for several dreams in one call.
+
+    Identical dreams are generated once and generations run concurrently (bounded
+    by DREAM_BATCH_CONCURRENCY). Results are returned in input order; an item that
+    fails carries an "error" instead of failing the whole batch.
+    """
+    dreams = [
+        (d.dream_text, d.estimated_budget, d.user_monthly_income, d.target_months)
+        for d in request.dreams
+    ]
+    if mode == "fast":
+        results, unique = [fast_dynamic_roadmap(*d) for d in dreams], len(set(dreams))
+    else:
+        results, unique = await generate_dynamic_roadmaps(dreams)
+
+    items = []
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            print(f"Error processing dream map batch item {index}: {result}")
+            items.append({"index": index, "roadmap": None, "error": str(result)})
+        else:
+            items.append({"index": index, "roadmap": result, "error": None})
+
+    return {"results": items, "uniqueDreams": unique}
+
+
+class GoalPlanRequest(BaseModel):
+    """Schema for fitting several goals into one income."""
+    goals: List[ExistingGoal] = Field(..., min_length=1, max_length=500, description="Goals to fund from the same income.")
+    user_monthly_income: float = Field(..., gt=0, description="User's monthly income in INR.")
+    monthly_fixed_expenses: float = Field(0, ge=0, description="Rent, EMIs and other fixed monthly costs in INR.")
+    objective: Literal["max_on_time", "min_total_delay"] = Field(default="max_on_time", description="Maximize goals met by their deadlines, or minimize total months late.")
+
+
+@app.post("/api/goals/optimize")
+async def optimize_goals(request: GoalPlanRequest):
+    """
+    Checks whether several dreams fit together in one income and returns a
+    month-by-month allocation schedule: which goal to fund in which order, when
+    each completes, and which deadlines slip.
+    """
+    try:
+        return plan_goal_allocation(
+            [g.model_dump() for g in request.goals],
+            request.user_monthly_income,
+            request.monthly_fixed_expenses,
+            request.objective
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {str(e)}")
+
+
+@app.post("/api/dream-map/stream")
+async def create_dream_map_stream(request: DreamRequest, mode: AnalysisMode = "full"):
+    """
+    Streaming variant of /api/dream-map (NDJSON, one event per line).
+
+    The locally computed numbers (estimatedCost, budgetGap, monthlySaving,
+    savingPercentage, feasibilityScore, isRealistic) are sent first, then the
+    roadmap sections as they are generated, then the complete roadmap.
+    """
+    async def events():
+        if mode == "fast":
+            roadmap = fast_dynamic_roadmap(
+                request.dream_text, request.estimated_budget, request.user_monthly_income, request.target_months
+            )
+            yield json.dumps({"event": "roadmap", "data": roadmap.model_dump()}, ensure_ascii=False) + "\n"
+            return
+        try:
+            async for event in stream_dynamic_roadmap(
+                dream_text=request.dream_text,
+                estimated_budget=request.estimated_budget,
+                user_income=request.user_monthly_income,
+                target_months=request.target_months
+            ):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            print(f"Error streaming dream map: {e}")
+            yield json.dumps({"event": "error", "data": str(e)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
 
 
 # --- New Input Schema ---
@@ -94,12 +276,12 @@ class PurchaseRequest(BaseModel):
 # --- New Endpoint for Opportunity Cost ---
 # Add this endpoint below the existing create_dream_map function
 @app.post("/api/opportunity-cost")
-async def get_opportunity_cost(request: PurchaseRequest):
+async def get_opportunity_cost(request: PurchaseRequest, mode: AnalysisMode = "full"):
     """
     Calculates the opportunity cost (time vs. investment) for an impulse purchase.
     """
     try:
-        if not os.environ.get("GEMINI_API_KEY"):
+        if mode != "fast" and not os.environ.get("GEMINI_API_KEY"):
             raise HTTPException(
                 status_code=500, 
                 detail="Server error: GEMINI_API_KEY not configured."
@@ -111,11 +293,18 @@ async def get_opportunity_cost(request: PurchaseRequest):
         hourly_wage = request.user_monthly_income / HOURS_PER_MONTH
         
         # 2. Call the dedicated Agent function
-        visualizer_text = orchestrate_opportunity_cost(
-            purchase_item=request.purchase_item,
-            purchase_cost=request.purchase_cost_inr,
-            user_hourly_wage=hourly_wage
-        )
+        if mode == "fast":
+            visualizer_text = fast_opportunity_cost(
+                purchase_item=request.purchase_item,
+                purchase_cost=request.purchase_cost_inr,
+                user_hourly_wage=hourly_wage
+            )
+        else:
+            visualizer_text = await orchestrate_opportunity_cost(
+                purchase_item=request.purchase_item,
+                purchase_cost=request.purchase_cost_inr,
+                user_hourly_wage=hourly_wage
+            )
         
         return {"visualizer_message": visualizer_text}
 
@@ -127,6 +316,31 @@ async def get_opportunity_cost(request: PurchaseRequest):
         )
 
 
+@app.post("/api/opportunity-cost/stream")
+async def get_opportunity_cost_stream(request: PurchaseRequest, mode: AnalysisMode = "full"):
+    """
+    Streaming variant of /api/opportunity-cost (plain text).
+
+    The time-cost and future-value lines are computed locally and flushed
+    before the model call starts; the narrative follows as it is generated.
+    """
+    HOURS_PER_MONTH = 160.0
+    hourly_wage = request.user_monthly_income / HOURS_PER_MONTH
+
+    if mode == "fast":
+        text = fast_opportunity_cost(request.purchase_item, request.purchase_cost_inr, hourly_wage)
+        return StreamingResponse(iter([text]), media_type="text/plain; charset=utf-8")
+
+    return StreamingResponse(
+        stream_opportunity_cost(
+            purchase_item=request.purchase_item,
+            purchase_cost=request.purchase_cost_inr,
+            user_hourly_wage=hourly_wage
+        ),
+        media_type="text/plain; charset=utf-8"
+    )
+
+
 
 
 
@@ -155,11 +369,16 @@ class QuantumDecisionRequest(BaseModel):
 
 
 @app.post("/api/quantum-decision-tree")
-async def quantum_decision_tree(request: QuantumDecisionRequest):
+async def quantum_decision_tree(request: QuantumDecisionRequest, mode: AnalysisMode = "full"):
     """
     Evaluates a user's dilemma using a Quantum Decision Tree (QDT) model.
     Uses a single Gemini call and behaves like a professional financial advisor.
     """
+    if mode == "fast":
+        return fast_quantum_decision(
+            request.situation, request.user_monthly_income, request.user_savings_inr, request.risk_profile
+        )
+
     try:
         if not os.environ.get("GEMINI_API_KEY"):
             raise HTTPException(
@@ -229,8 +448,8 @@ Return the output strictly in this JSON structure:
         """
 
         # --- GEMINI CALL (Only One Call) ---
-        response = client.models.generate_content(
-            model="gemini-2.5-pro",
+        response_text = await generate_for_task(
+            TASK_REASONING,
             contents=prompt,
             config=types.GenerateContentConfig(
                 system_instruction=system_instruction,
@@ -239,9 +458,13 @@ Return the output strictly in this JSON structure:
         )
 
 
-        result = json.loads(response.text)
+        result = json.loads(response_text)
         return result
 
+    except DeadlineExceeded:
+        return fast_quantum_decision(
+            request.situation, request.user_monthly_income, request.user_savings_inr, request.risk_profile
+        )
     except Exception as e:
         print(f"QDT error: {e}")
         raise HTTPException(status_code=500, detail=f"QDT processing error: {str(e)}")
@@ -254,14 +477,22 @@ Return the output strictly in this JSON structure:
 
 
 @app.post("/api/compare-users", response_model=UserComparisonInsights)
-async def compare_users(request: ComparisonRequest):
+async def compare_users(request: ComparisonRequest, mode: AnalysisMode = "full"):
     """
     Compares two users' financial profiles and transaction patterns.
     Returns personalized insights and recommendations for the current user.
     """
     try:
+        if mode == "fast":
+            return fast_comparison_insights(
+                current_user_info=request.current_user_info,
+                other_user_info=request.other_user_info,
+                current_user_transactions=request.current_user_transactions,
+                other_user_transactions=request.other_user_transactions
+            )
+
         # Call the comparison agent
-        insights = generate_comparison_insights(
+        insights = await generate_comparison_insights(
             current_user_info=request.current_user_info,
             other_user_info=request.other_user_info,
             current_user_transactions=request.current_user_transactions,
@@ -283,13 +514,165 @@ async def compare_users(request: ComparisonRequest):
         )
 
 
+@app.post("/api/compare-users/upload", response_model=UserComparisonInsights)
+async def compare_users_upload(
+    current_user_info: str = Form(..., description="Current user info in format: job_salary_savings"),
+    other_user_info: str = Form(..., description="Comparison user info in format: job_salary_savings"),
+    current_user_transactions: UploadFile = File(..., description="Current user's transactions: CSV (optionally gzipped) or a GATX bundle"),
+    other_user_transactions: UploadFile = File(..., description="Comparison user's transactions: CSV (optionally gzipped) or a GATX bundle"),
+    mode: AnalysisMode = "full"
+):
+    """
+    Multipart variant of /api/compare-users for large histories.
+
+    Each CSV file (plain or gzip) is parsed in fixed-size chunks and folded into
+    per-category totals as it is read, so memory stays flat regardless of file size.
+    A file in the binary columnar format (tools/transaction_bundle.py, detected by
+    its GATX magic) skips parsing: its columns are mapped straight onto the upload.
+    """
+    try:
+        current_analysis = await run_in_threadpool(aggregate_transaction_file, current_user_transactions.file)
+        other_analysis = await run_in_threadpool(aggregate_transaction_file, other_user_transactions.file)
+
+        if mode == "fast":
+            return fast_comparison_insights_from_analyses(
+                current_user_info, other_user_info, current_analysis, other_analysis
+            )
+        return await generate_comparison_insights_from_analyses(
+            current_user_info, other_user_info, current_analysis, other_analysis
+        )
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid input format: {str(e)}"
+        )
+    except Exception as e:
+        print(f"Error processing uploaded user comparison: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred while comparing users: {str(e)}"
+        )
+
+
+def _check_store_access(http_request: Request):
+    """
+    The transaction store endpoints return and change users' spending history, so
+    they are for trusted backend callers only: each call must send the value of
+    TRANSACTION_STORE_API_KEY in X-Store-Key. With no key configured they are off.
+    """
+    api_key = os.environ.get("TRANSACTION_STORE_API_KEY")
+    if not api_key:
+        raise HTTPException(
+            status_code=503,
+            detail="Server error: TRANSACTION_STORE_API_KEY not configured."
+        )
+    if not hmac.compare_digest(http_request.headers.get("x-store-key", "").encode(), api_key.encode()):
+        raise HTTPException(status_code=403, detail="Missing or invalid X-Store-Key header.")
+
+
+def _append_csv_delta(user_id: str, csv_text: str, batch_id: Optional[str]) -> dict:
+    return get_transaction_store().append(user_id, parse_csv_table(io.StringIO(csv_text)), batch_id)
+
+
+def _append_file_delta(user_id: str, fileobj, batch_id: Optional[str]) -> dict:
+    return get_transaction_store().append(user_id, read_transaction_table(fileobj), batch_id)
+
+
+@app.post("/api/users/{user_id}/transactions")
+async def append_user_transactions(
+    user_id: str,
+    http_request: Request,
+    transactions: UploadFile = File(..., description="New transactions since the last upload: CSV (optionally gzipped) or a GATX bundle"),
+    batch_id: Optional[str] = Form(default=None, description="Id of this delta; re-sending the last applied id is a no-op"),
+):
+    """
+    Appends a delta of new transactions to the user's stored aggregates and
+    returns the new watermark (revision, last batch id, latest date, row count).
+    Internal: requires X-Store-Key.
+    """
+    _check_store_access(http_request)
+    try:
+        return await run_in_threadpool(_append_file_delta, user_id, transactions.file, batch_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input format: {str(e)}")
+
+
+@app.get("/api/users/{user_id}/transactions")
+async def get_user_transactions_watermark(user_id: str, http_request: Request):
+    """
+    The user's watermark, so a client knows which transactions it still has to send.
+    Internal: requires X-Store-Key.
+    """
+    _check_store_access(http_request)
+    watermark = await run_in_threadpool(get_transaction_store().watermark, user_id)
+    if watermark is None:
+        raise HTTPException(status_code=404, detail=f"No stored transactions for user '{user_id}'")
+    return watermark
+
+
+@app.post("/api/compare-users/stored", response_model=UserComparisonInsights)
+async def compare_stored_users(request: StoredComparisonRequest, http_request: Request, mode: AnalysisMode = "full"):
+    """
+    Variant of /api/compare-users for users whose transactions are kept in the
+    transaction store: send only user ids, plus any transactions that are new
+    since the last call. The comparison reads the running aggregates, so its cost
+    depends on the new data, not on the length of either history.
+    Internal: requires X-Store-Key.
+    """
+    _check_store_access(http_request)
+    store = get_transaction_store()
+    try:
+        for user_id, delta, batch_id in (
+            (request.current_user_id, request.current_user_transactions, request.current_user_batch_id),
+            (request.other_user_id, request.other_user_transactions, request.other_user_batch_id),
+        ):
+            if delta:
+                await run_in_threadpool(_append_csv_delta, user_id, delta, batch_id)
+
+        current_analysis = await run_in_threadpool(store.summary, request.current_user_id)
+        other_analysis = await run_in_threadpool(store.summary, request.other_user_id)
+        for user_id, analysis in ((request.current_user_id, current_analysis), (request.other_user_id, other_analysis)):
+            if analysis is None:
+                raise HTTPException(status_code=404, detail=f"No stored transactions for user '{user_id}'")
+
+        if mode == "fast":
+            return fast_comparison_insights_from_analyses(
+                request.current_user_info, request.other_user_info, current_analysis, other_analysis
+            )
+        return await generate_comparison_insights_from_analyses(
+            request.current_user_info, request.other_user_info, current_analysis, other_analysis
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid input format: {str(e)}"
+        )
+    except Exception as e:
+        print(f"Error processing stored user comparison: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred while comparing users: {str(e)}"
+        )
+
+
 @app.post("/api/income-growth")
-async def income_growth_analysis(request: IncomeGrowthRequest):
+async def income_growth_analysis(request: IncomeGrowthRequest, mode: AnalysisMode = "full"):
     """
     Analyzes user's current income and profession to suggest structured paths for income growth.
     Returns detailed recommendations including skill upgrades, side income opportunities, and career advancement paths.
     """
     try:
+        if mode == "fast":
+            return fast_income_growth_paths(
+                current_income=request.current_income,
+                profession=request.profession,
+                current_skills=request.current_skills
+            )
+
         if not os.environ.get("GEMINI_API_KEY"):
             raise HTTPException(
                 status_code=500,
@@ -297,7 +680,7 @@ async def income_growth_analysis(request: IncomeGrowthRequest):
             )
         
         # Call the income growth agent
-        analysis = analyze_income_growth_paths(
+        analysis = await analyze_income_growth_paths(
             current_income=request.current_income,
             profession=request.profession,
             current_skills=request.current_skills
@@ -319,20 +702,29 @@ async def income_growth_analysis(request: IncomeGrowthRequest):
 
 
 @app.post("/api/income-growth-report")
-async def income_growth_report(request: IncomeGrowthRequest):
+async def income_growth_report(request: IncomeGrowthRequest, mode: AnalysisMode = "full"):
     """
     Generates a formatted text report for income growth analysis.
     Returns a human-readable report instead of JSON.
     """
     try:
+        if mode == "fast":
+            analysis = fast_income_growth_paths(
+                current_income=request.current_income,
+                profession=request.profession,
+                current_skills=request.current_skills
+            )
+            return {"report": format_income_growth_report(analysis)}
+
         if not os.environ.get("GEMINI_API_KEY"):
             raise HTTPException(
                 status_code=500,
                 detail="Server error: GEMINI_API_KEY not configured."
             )
         
-        # Call the income growth agent
-        analysis = analyze_income_growth_paths(
+        # Shares the bucketed analysis cache with /api/income-growth, so a report
+        # for an already-analysed profile is rendered without another LLM call
+        analysis = await analyze_income_growth_paths(
             current_income=request.current_income,
             profession=request.profession,
             current_skills=request.current_skills
@@ -355,6 +747,24 @@ async def income_growth_report(request: IncomeGrowthRequest):
             detail=f"An error occurred while generating income growth report: {str(e)}"
         )
 
+@app.get("/api/llm/stats")
+async def llm_stats():
+    """
+    Reports LLM gateway counters: per-model calls/errors/reroutes and circuit
+    breaker state, response-cache hit ratio,
+    how many agent calls were coalesced onto an in-flight twin, the share of
+    dream classifications answered locally without an LLM call, rate-limiter
+    allow/reject/wait counts and the task->model routing table with per-task
+    latency, estimated cost and how often hedged requests fired and won.
+    """
+    stats = get_gateway().stats()
+    stats["coalescing"] = singleflight_stats()
+    stats["dream_classifier"] = classifier_stats()
+    stats["roadmap_speculation"] = speculation_stats()
+    stats["rate_limits"] = {qdt_rate_limiter.name: qdt_rate_limiter.stats()}
+    stats["routing"] = get_router().stats()
+    return stats
+
 # --- 4. Running the Server (for local testing/hackathon deployment) ---
 if __name__ == "__main__":
     # Ensure environment variables are loaded if running this file directly
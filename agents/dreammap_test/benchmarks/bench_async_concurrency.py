@@ -0,0 +1,60 @@
+"""
+Throughput benchmark for /api/dream-map against a stubbed Gemini backend.
+
+The stub sleeps for a fixed latency instead of calling the network, so the
+numbers show how many in-flight requests a single worker can overlap.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_async_concurrency
+"""
+
+import asyncio
+import os
+import time
+
+import httpx
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-dummy-key")
+
+from app.main import app
+from core.llm_gateway import FakeBackend, LLMGateway, set_gateway
+
+LLM_LATENCY_S = 0.25
+TOTAL_REQUESTS = 64
+
+
+PAYLOAD = {
+    "dream_text": "I want to buy a Royal Enfield bike",
+    "estimated_budget": 150000,
+    "user_monthly_income": 50000,
+    "target_months": 12,
+}
+
+
+async def _run(concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        async def one():
+            async with sem:
+                r = await http.post("/api/dream-map", json=PAYLOAD)
+                r.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(TOTAL_REQUESTS)))
+        return time.perf_counter() - start
+
+
+def main():
+    # Per-model semaphores are lifted so only the event loop limits overlap
+    set_gateway(LLMGateway(backend=FakeBackend(latency_s=LLM_LATENCY_S), default_concurrency=1024))
+
+    print(f"{TOTAL_REQUESTS} requests, stub LLM latency {LLM_LATENCY_S * 1000:.0f} ms per call")
+    print(f"{'concurrency':>12} {'seconds':>10} {'req/s':>10}")
+    for concurrency in (1, 4, 16, 64):
+        elapsed = asyncio.run(_run(concurrency))
+        print(f"{concurrency:>12} {elapsed:>10.2f} {TOTAL_REQUESTS / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
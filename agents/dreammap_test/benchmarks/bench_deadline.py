@@ -0,0 +1,65 @@
+"""
+Latency of full-mode endpoints when the LLM hangs, with and without a deadline.
+
+The FakeBackend takes LLM_LATENCY_S per call. With X-Deadline-Ms set, each
+endpoint should answer from its deterministic fallback shortly after the
+deadline and mark the response with X-Degraded.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_deadline
+"""
+
+import asyncio
+import os
+import time
+
+import httpx
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-dummy-key")
+
+from app.main import app
+from core.llm_gateway import FakeBackend, LLMGateway, set_gateway
+
+LLM_LATENCY_S = 5.0
+DEADLINES_MS = (None, 300, 1000)
+
+INCOME = {"current_income": 60000, "profession": "Software Engineer", "current_skills": ["python"]}
+CSV_A = "date,category,amount\n2024-01-01,Food,2000\n2024-01-02,Travel,1500"
+CSV_B = "date,category,amount\n2024-01-01,Food,1200\n2024-01-03,Rent,15000"
+REQUESTS = [
+    ("/api/dream-map", {"dream_text": "I want to learn pottery in a weekend workshop", "estimated_budget": 8000,
+                        "user_monthly_income": 50000, "target_months": 3}),
+    ("/api/opportunity-cost", {"purchase_item": "iPhone 15", "purchase_cost_inr": 80000, "user_monthly_income": 60000}),
+    ("/api/quantum-decision-tree", {"situation": "Should I buy a gaming laptop for ₹1,20,000?", "user_monthly_income": 60000,
+                                    "user_savings_inr": 300000, "risk_profile": "medium"}),
+    ("/api/compare-users", {"current_user_info": "Engineer_80000_50000", "other_user_info": "Engineer_85000_65000",
+                            "current_user_transactions": CSV_A, "other_user_transactions": CSV_B}),
+    ("/api/income-growth", INCOME),
+]
+
+
+async def _run():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        print(f"{'endpoint':>28} {'deadline':>9} {'status':>7} {'ms':>8} {'degraded':>9}")
+        for run, deadline_ms in enumerate(DEADLINES_MS):
+            for path, body in REQUESTS:
+                if "current_income" in body:
+                    body = {**body, "current_income": body["current_income"] + run * 50000}  # skip the bucket cache
+                headers = {}
+                if deadline_ms is not None:
+                    headers["X-Deadline-Ms"] = str(deadline_ms)
+                start = time.perf_counter()
+                r = await client.post(path, json=body, headers=headers)
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"{path:>28} {str(deadline_ms or 'default'):>9} {r.status_code:>7} {elapsed:>8.0f} "
+                      f"{r.headers.get('x-degraded', '-'):>9}")
+
+
+def main():
+    set_gateway(LLMGateway(backend=FakeBackend(latency_s=LLM_LATENCY_S), default_concurrency=1024))
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
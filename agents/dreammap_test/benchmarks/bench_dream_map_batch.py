@@ -0,0 +1,64 @@
+"""
+Throughput of /api/dream-map/batch versus one /api/dream-map call per dream,
+against a stubbed backend where every LLM call takes a fixed time.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_dream_map_batch
+"""
+
+import asyncio
+import os
+import time
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-dummy-key")
+
+import httpx
+
+from app.main import app
+from core.llm_gateway import FakeBackend, LLMGateway, set_gateway
+
+LLM_LATENCY_S = 0.2
+DREAMS = [
+    "I want to buy a Royal Enfield bike",
+    "Plan a world tour across Europe",
+    "Start a small cafe in my area",
+    "Buy a new MacBook for work",
+    "I want to buy a Royal Enfield bike",  # duplicate, deduped by the batch endpoint
+    "Renovate my home kitchen",
+    "Do an MBA abroad",
+    "Buy a golden retriever puppy",
+]
+
+
+def _payload(text):
+    return {"dream_text": text, "estimated_budget": 150000, "user_monthly_income": 50000, "target_months": 12}
+
+
+async def _run():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        start = time.perf_counter()
+        for text in DREAMS:
+            r = await client.post("/api/dream-map", json=_payload(text))
+            r.raise_for_status()
+        sequential = time.perf_counter() - start
+
+        # Fresh gateway so the batch pays for its own LLM calls
+        set_gateway(LLMGateway(backend=FakeBackend(latency_s=LLM_LATENCY_S)))
+        start = time.perf_counter()
+        r = await client.post("/api/dream-map/batch", json={"dreams": [_payload(t) for t in DREAMS]})
+        r.raise_for_status()
+        batch = time.perf_counter() - start
+        return sequential, batch, r.json()["uniqueDreams"]
+
+
+def main():
+    set_gateway(LLMGateway(backend=FakeBackend(latency_s=LLM_LATENCY_S)))
+    sequential, batch, unique = asyncio.run(_run())
+    print(f"{len(DREAMS)} dreams ({unique} unique), stub LLM latency {LLM_LATENCY_S * 1000:.0f} ms per call")
+    print(f"{'sequential /api/dream-map':>28} {sequential * 1000:>8.0f} ms")
+    print(f"{'/api/dream-map/batch':>28} {batch * 1000:>8.0f} ms  ({sequential / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Server-side latency of every endpoint in mode=fast (no LLM, no API key).
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_fast_mode
+"""
+
+import asyncio
+import os
+import time
+
+os.environ.pop("GEMINI_API_KEY", None)
+
+import httpx
+
+from app.main import app
+
+RUNS = 50
+CSV_A = "date,category,amount\n" + "\n".join(f"2024-01-{d % 28 + 1:02d},Food,{200 + d}" for d in range(200))
+CSV_B = "date,category,amount\n" + "\n".join(f"2024-01-{d % 28 + 1:02d},Travel,{150 + d}" for d in range(200))
+DREAM = {"dream_text": "I want to buy a Royal Enfield bike", "estimated_budget": 150000, "user_monthly_income": 50000, "target_months": 12}
+INCOME = {"current_income": 60000, "profession": "Software Engineer", "current_skills": ["python"]}
+
+REQUESTS = [
+    ("/api/dream-map", DREAM),
+    ("/api/dream-map/batch", {"dreams": [DREAM] * 5}),
+    ("/api/dream-map/stream", DREAM),
+    ("/api/opportunity-cost", {"purchase_item": "iPhone 15", "purchase_cost_inr": 80000, "user_monthly_income": 60000}),
+    ("/api/opportunity-cost/stream", {"purchase_item": "iPhone 15", "purchase_cost_inr": 80000, "user_monthly_income": 60000}),
+    ("/api/quantum-decision-tree", {"situation": "Should I buy a gaming laptop for ₹1,20,000?", "user_monthly_income": 60000, "user_savings_inr": 300000, "risk_profile": "medium"}),
+    ("/api/compare-users", {"current_user_info": "Engineer_80000_50000", "other_user_info": "Engineer_85000_65000",
+                            "current_user_transactions": CSV_A, "other_user_transactions": CSV_B}),
+    ("/api/income-growth", INCOME),
+    ("/api/income-growth-report", INCOME),
+]
+
+
+async def _run():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'endpoint':>30} {'median ms':>10} {'max ms':>8}")
+        for path, body in REQUESTS:
+            times = []
+            for _ in range(RUNS):
+                start = time.perf_counter()
+                r = await client.post(path, params={"mode": "fast"}, json=body)
+                times.append((time.perf_counter() - start) * 1000)
+                r.raise_for_status()
+            times.sort()
+            print(f"{path:>30} {times[len(times) // 2]:>10.2f} {times[-1]:>8.2f}")
+
+
+def main():
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Batch evaluation of the shared financial kernel (tools.finance_math) over random
+purchase scenarios, compared with the scalar Python formulas it replaced.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_finance_math
+"""
+
+import math
+import time
+
+import numpy as np
+
+from tools.finance_math import depreciated_value, future_value, future_values, months_to_save, time_cost_hours
+
+N_SCENARIOS = 1_000_000
+SCALAR_SAMPLE = 100_000
+
+
+def _scenarios(n, seed=7):
+    rng = np.random.default_rng(seed)
+    return {
+        "amount": rng.uniform(1_000, 2_000_000, n),
+        "rate": rng.uniform(0.04, 0.15, n),
+        "years": rng.integers(1, 31, n).astype(np.float64),
+        "dep_rate": rng.uniform(0.05, 0.40, n),
+        "monthly": rng.uniform(-1_000, 50_000, n),
+        "wage": rng.uniform(50, 2_000, n),
+    }
+
+
+def _vectorized(s):
+    fv = future_value(s["amount"], s["rate"], s["years"])
+    horizons = future_values(s["amount"], s["rate"])
+    dep = depreciated_value(s["amount"], s["years"], s["dep_rate"])
+    months = months_to_save(s["amount"], s["monthly"])
+    hours = time_cost_hours(s["amount"], s["wage"])
+    return fv, horizons, dep, months, hours
+
+
+def _scalar(s, n):
+    out = []
+    for i in range(n):
+        amount, rate, years = float(s["amount"][i]), float(s["rate"][i]), float(s["years"][i])
+        dep_rate, monthly, wage = float(s["dep_rate"][i]), float(s["monthly"][i]), float(s["wage"][i])
+        fv = amount * ((1 + rate) ** years)
+        horizons = [amount * ((1 + rate) ** y) for y in (1, 5, 10)]
+        dep = amount * ((1 - dep_rate) ** years) if dep_rate < 1 else 0.0
+        months = 9999 if monthly <= 0 else max(0, math.ceil(amount / monthly - 1e-9))
+        hours = amount / wage if wage > 0 else 0
+        out.append((fv, horizons, dep, months, hours))
+    return out
+
+
+def main():
+    s = _scenarios(N_SCENARIOS)
+
+    vec_s = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        fv, _, _, months, _ = _vectorized(s)
+        vec_s = min(vec_s, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    scalar = _scalar(s, SCALAR_SAMPLE)
+    scalar_s = (time.perf_counter() - start) * N_SCENARIOS / SCALAR_SAMPLE
+
+    assert np.allclose(fv[:SCALAR_SAMPLE], [r[0] for r in scalar])
+    assert (months[:SCALAR_SAMPLE] == [r[3] for r in scalar]).all()
+
+    print(f"{N_SCENARIOS:,} scenarios (FV, FV at 1/5/10y, depreciation, months-to-save, time cost)")
+    print(f"{'scalar Python (extrapolated)':>30} {scalar_s * 1000:>9.0f} ms")
+    print(f"{'tools.finance_math (best of 3)':>30} {vec_s * 1000:>9.0f} ms  ({scalar_s / vec_s:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Latency and quality of the multi-goal allocation optimizer as the number of
+goals grows, for both objectives.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_goal_optimizer
+"""
+
+import time
+
+import numpy as np
+
+from tools.goal_optimizer import OBJECTIVES, optimize_goal_allocation
+
+GOAL_COUNTS = (10, 50, 200)
+INCOME = 150_000
+FIXED_EXPENSES = 40_000
+RUNS = 20
+
+
+def _goals(n, rng):
+    return [
+        {
+            "name": f"goal-{i}",
+            "target_amount": float(rng.integers(10, 500)) * 1000,
+            "deadline_months": int(rng.integers(3, 120)),
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    rng = np.random.default_rng(11)
+    print(f"capacity {INCOME - FIXED_EXPENSES:,}/month, mean of {RUNS} runs")
+    print(f"{'goals':>6} {'objective':>16} {'ms':>8} {'on time':>8} {'months late':>12}")
+    for n in GOAL_COUNTS:
+        goals = _goals(n, rng)
+        for objective in OBJECTIVES:
+            start = time.perf_counter()
+            for _ in range(RUNS):
+                plan = optimize_goal_allocation(goals, INCOME, FIXED_EXPENSES, objective)
+            ms = (time.perf_counter() - start) / RUNS * 1000
+            print(f"{n:>6} {objective:>16} {ms:>8.2f} {plan['goals_on_time']:>8} {plan['total_delay_months']:>12}")
+
+
+if __name__ == "__main__":
+    main()
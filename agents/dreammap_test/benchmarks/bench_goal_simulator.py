@@ -0,0 +1,39 @@
+"""
+Latency of the multi-goal cash-flow simulator for users with many goals over a
+10-year horizon, per allocation strategy.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_goal_simulator
+"""
+
+import time
+
+import numpy as np
+
+from tools.goal_simulator import STRATEGIES, simulate_cash_flow
+
+HORIZON_MONTHS = 120
+GOAL_COUNTS = (5, 25, 60)
+RUNS = 200
+
+
+def main():
+    rng = np.random.default_rng(3)
+    print(f"{HORIZON_MONTHS}-month horizon, mean of {RUNS} runs")
+    print(f"{'goals':>6} " + " ".join(f"{s + ' ms':>16}" for s in STRATEGIES))
+    for n in GOAL_COUNTS:
+        targets = rng.uniform(10_000, 300_000, n)
+        deadlines = rng.integers(6, HORIZON_MONTHS, n)
+        weights = rng.uniform(1, 5, n)
+        savings = np.full(HORIZON_MONTHS, targets.sum() / (HORIZON_MONTHS * 0.8))
+        row = []
+        for strategy in STRATEGIES:
+            start = time.perf_counter()
+            for _ in range(RUNS):
+                simulate_cash_flow(targets, savings, HORIZON_MONTHS, strategy, deadlines=deadlines, weights=weights)
+            row.append((time.perf_counter() - start) / RUNS * 1000)
+        print(f"{n:>6} " + " ".join(f"{ms:>16.3f}" for ms in row))
+
+
+if __name__ == "__main__":
+    main()
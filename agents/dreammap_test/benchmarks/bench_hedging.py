@@ -0,0 +1,80 @@
+"""
+Tail latency of a hedged task against a FakeBackend with slow outliers.
+
+Most calls take FAST_S, but SLOW_SHARE of them take SLOW_S. With hedging, a
+call still pending at the task's p95 latency gets a second request, and the
+first to finish wins. Prints p50/p99 with hedging off and on, plus how often
+hedges fired and won and how many losing calls were cancelled (not errors).
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_hedging
+"""
+
+import asyncio
+import random
+import time
+
+from google.genai import types
+
+from core.llm_gateway import FakeBackend, LLMGateway, set_gateway
+from core.model_router import TASK_STRUCTURED_REPORT, ModelRouter
+
+FAST_S = 0.05
+SLOW_S = 1.0
+SLOW_SHARE = 0.03
+CALLS = 400
+CONCURRENCY = 20
+
+
+class TailLatencyBackend(FakeBackend):
+    def __init__(self, seed: int):
+        super().__init__()
+        self._rng = random.Random(seed)
+
+    async def generate(self, *, model: str, contents, config) -> str:
+        self.calls += 1
+        await asyncio.sleep(SLOW_S if self._rng.random() < SLOW_SHARE else FAST_S)
+        return "{}"
+
+
+async def _run(hedging) -> dict:
+    backend = TailLatencyBackend(seed=7)
+    set_gateway(LLMGateway(backend=backend, default_concurrency=1024))
+    router = ModelRouter(hedging={TASK_STRUCTURED_REPORT: hedging})
+    sem = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def one(i: int):
+        async with sem:
+            start = time.perf_counter()
+            await router.generate(
+                TASK_STRUCTURED_REPORT,
+                contents=f"report {i}",
+                config=types.GenerateContentConfig(response_mime_type="application/json"),
+            )
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(CALLS)))
+    latencies.sort()
+    stats = router.stats()["tasks"][TASK_STRUCTURED_REPORT]
+    return {
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p99": latencies[int(0.99 * len(latencies))] * 1000,
+        "backend_calls": backend.calls,
+        "fired": stats["hedges_fired"],
+        "won": stats["hedges_won"],
+        "cancelled": stats["hedges_cancelled"],
+        "errors": stats["errors"],
+    }
+
+
+def main():
+    print(f"{CALLS} calls, {SLOW_SHARE:.0%} take {SLOW_S * 1000:.0f} ms, the rest {FAST_S * 1000:.0f} ms")
+    print(f"{'hedging':>8} {'p50 ms':>8} {'p99 ms':>8} {'backend calls':>14} {'fired':>6} {'won':>5} {'cancelled':>10} {'errors':>7}")
+    for label, hedging in (("off", None), ("p95", {"percentile": 0.95})):
+        r = asyncio.run(_run(hedging))
+        print(f"{label:>8} {r['p50']:>8.0f} {r['p99']:>8.0f} {r['backend_calls']:>14} {r['fired']:>6} {r['won']:>5} {r['cancelled']:>10} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
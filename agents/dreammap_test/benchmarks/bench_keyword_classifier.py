@@ -0,0 +1,72 @@
+"""
+Per-call cost of dream keyword classification as the keyword table grows.
+
+Compares the old approach (substring scan over a dict, first hit wins) with the
+compiled KeywordMatcher used by tools.cost_engine.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_keyword_classifier
+"""
+
+import random
+import string
+import time
+
+from tools.cost_engine import TEMPLATES
+from tools.keyword_matcher import KeywordMatcher
+
+TEXTS = [
+    "I want to buy a Royal Enfield bike next year",
+    "Planning a career change and a Europe trip with friends",
+    "Saving for my wedding and a new sofa for the flat",
+    "Open a small coffee shop near the station",
+    "Get an MBA from a good college abroad",
+]
+CALLS = 20000
+
+
+def _legacy_classify(text: str, mapping: dict) -> str:
+    t = text.lower()
+    for kw, key in mapping.items():
+        if kw in t:
+            return key
+    return "other"
+
+
+def _synthetic_table(n: int, rng: random.Random) -> dict:
+    table = {key: dict(tpl.get("keywords", {})) for key, tpl in TEMPLATES.items()}
+    labels = list(table)
+    for _ in range(n):
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10)))
+        table[rng.choice(labels)][word] = 1
+    return table
+
+
+def _time_per_call(fn) -> float:
+    start = time.perf_counter()
+    for i in range(CALLS):
+        fn(TEXTS[i % len(TEXTS)])
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+def main():
+    rng = random.Random(7)
+    print(f"{'keywords':>10} {'legacy us/call':>16} {'matcher us/call':>16} {'classify_many us/text':>22}")
+    for extra in (0, 1_000, 10_000, 100_000):
+        table = _synthetic_table(extra, rng)
+        flat = {kw: label for label, kws in table.items() for kw in kws}
+        matcher = KeywordMatcher(table)
+
+        legacy_us = _time_per_call(lambda t: _legacy_classify(t, flat))
+        matcher_us = _time_per_call(matcher.classify)
+
+        batch = [TEXTS[i % len(TEXTS)] for i in range(CALLS)]
+        start = time.perf_counter()
+        matcher.classify_many(batch)
+        batch_us = (time.perf_counter() - start) / CALLS * 1e6
+
+        print(f"{len(flat):>10} {legacy_us:>16.2f} {matcher_us:>16.2f} {batch_us:>22.2f}")
+
+
+if __name__ == "__main__":
+    main()
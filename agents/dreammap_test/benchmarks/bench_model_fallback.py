@@ -0,0 +1,73 @@
+"""
+Circuit-breaker fallback against a FakeBackend whose primary model goes out of
+quota (429) for a while and then recovers.
+
+Phase 1: primary healthy. Phase 2: primary returns 429, the breaker opens and
+traffic moves to the fallback. Phase 3: primary recovers, a half-open probe
+closes the breaker and traffic returns to the primary.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_model_fallback
+"""
+
+import asyncio
+import time
+
+from google.genai import types
+
+from core.circuit_breaker import BreakerRegistry
+from core.llm_gateway import FakeBackend, LLMGateway
+
+PRIMARY = "gemini-2.5-pro"
+FALLBACK = "gemini-2.5-flash"
+CALLS_PER_PHASE = 40
+OPEN_S = 0.2
+
+
+class QuotaError(Exception):
+    code = 429
+
+
+def main():
+    state = {"primary_down": False}
+
+    def responder(model, contents, config):
+        if model == PRIMARY and state["primary_down"]:
+            raise QuotaError("RESOURCE_EXHAUSTED")
+        return model
+
+    backend = FakeBackend(responder=responder, latency_s=0.002)
+    gateway = LLMGateway(
+        backend=backend,
+        fallbacks={PRIMARY: FALLBACK},
+        breakers=BreakerRegistry(window=10, min_calls=4, failure_threshold=0.5, slow_call_s=1.0, open_s=OPEN_S),
+    )
+    config = types.GenerateContentConfig(response_mime_type="text")
+
+    async def phase(name: str):
+        served, failed = {}, 0
+        start = time.perf_counter()
+        for _ in range(CALLS_PER_PHASE):
+            try:
+                model = await gateway.generate_text(model=PRIMARY, contents="hi", config=config)
+                served[model] = served.get(model, 0) + 1
+            except Exception:
+                failed += 1
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{name:>18}: served {served}, failed {failed}, breaker {gateway.breakers.get(PRIMARY).state}, {elapsed:.0f} ms")
+
+    async def run():
+        await phase("primary healthy")
+        state["primary_down"] = True
+        await phase("primary 429")
+        state["primary_down"] = False
+        await asyncio.sleep(OPEN_S)
+        await phase("primary recovered")
+        print("breakers:", gateway.stats()["breakers"])
+        print("backend calls by model:", backend.calls_by_model)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
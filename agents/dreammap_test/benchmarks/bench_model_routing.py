@@ -0,0 +1,66 @@
+"""
+Per-task latency and cost report from the model routing table.
+
+Runs each full-mode endpoint against a FakeBackend whose latency depends on the
+model, then prints the task -> tier -> model table with the observed latency
+percentiles and estimated token cost, as served by /api/llm/stats.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_model_routing
+"""
+
+import asyncio
+import os
+
+import httpx
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-dummy-key")
+
+from app.main import app
+from core.llm_gateway import FakeBackend, LLMGateway, set_gateway
+
+MODEL_LATENCY_S = {"gemini-2.0-flash": 0.05, "gemini-2.0-flash-exp": 0.15, "gemini-2.5-pro": 0.4}
+RUNS = 5
+
+REQUESTS = [
+    ("/api/dream-map", {"dream_text": "I want to learn pottery in a weekend workshop", "estimated_budget": 8000,
+                        "user_monthly_income": 50000, "target_months": 3}),
+    ("/api/opportunity-cost", {"purchase_item": "iPhone 15", "purchase_cost_inr": 80000, "user_monthly_income": 60000}),
+    ("/api/quantum-decision-tree", {"situation": "Should I buy a gaming laptop for ₹1,20,000?", "user_monthly_income": 60000,
+                                    "user_savings_inr": 300000, "risk_profile": "medium"}),
+    ("/api/income-growth", {"current_income": 60000, "profession": "Software Engineer", "current_skills": ["python"]}),
+]
+
+
+async def _run():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        for i in range(RUNS):
+            for path, body in REQUESTS:
+                body = dict(body)
+                if "current_income" in body:
+                    body["current_income"] += i * 50000  # new income band, so no bucket cache hit
+                await client.post(path, json=body)
+        return (await client.get("/api/llm/stats")).json()["routing"]
+
+
+def main():
+    backend = FakeBackend()
+    backend.model_latency_s = MODEL_LATENCY_S
+    set_gateway(LLMGateway(backend=backend, default_concurrency=1024))
+
+    routing = asyncio.run(_run())
+    print(f"{'task':>18} {'tier':>6} {'model':>22} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} {'est $':>10}")
+    for task, route in routing["routes"].items():
+        s = routing["tasks"].get(task)
+        if s is None:
+            print(f"{task:>18} {route['tier']:>6} {route['model']:>22} {0:>6}")
+            continue
+        lat = s["latency_ms"]
+        print(f"{task:>18} {route['tier']:>6} {route['model']:>22} {s['calls']:>6} "
+              f"{lat['p50']:>8} {lat['p95']:>8} {s['est_cost_usd']:>10.6f}")
+    print("backend calls by model:", backend.calls_by_model)
+
+
+if __name__ == "__main__":
+    main()
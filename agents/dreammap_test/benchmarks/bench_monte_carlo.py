@@ -0,0 +1,32 @@
+"""
+Latency of the quantum decision tree's Monte Carlo simulator at different path
+counts.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_monte_carlo
+"""
+
+import time
+
+from tools.monte_carlo import simulate_purchase_scenarios
+
+PATH_COUNTS = (10_000, 100_000, 1_000_000)
+RUNS = 5
+
+
+def main():
+    simulate_purchase_scenarios(80000, 0.10, 0.25, n_paths=1000)  # warm-up
+    print(f"{'paths':>10} {'best ms':>9} {'mean ms':>9}   Buy Now 5y value p10/p50/p90")
+    for n in PATH_COUNTS:
+        times = []
+        for i in range(RUNS):
+            start = time.perf_counter()
+            result = simulate_purchase_scenarios(80000, 0.10, 0.25, n_paths=n, seed=i)
+            times.append(time.perf_counter() - start)
+        band = result["scenarios"][0]["value_5yr"]
+        print(f"{n:>10,} {min(times) * 1000:>9.1f} {sum(times) / RUNS * 1000:>9.1f}   "
+              f"{band['p10']:,.0f} / {band['p50']:,.0f} / {band['p90']:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
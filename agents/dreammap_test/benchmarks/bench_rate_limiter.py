@@ -0,0 +1,75 @@
+"""
+Checks that the token-bucket limiter holds one limit across worker processes,
+and measures the cost of a single acquire.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_rate_limiter
+"""
+
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+from core.rate_limiter import RateLimitExceeded, TokenBucketLimiter
+
+WORKERS = 4
+ATTEMPTS_PER_WORKER = 50
+PER_USER = 2
+GLOBAL_LIMIT = 20
+
+
+def _limiter(path: str) -> TokenBucketLimiter:
+    return TokenBucketLimiter("bench", per_user=PER_USER, global_limit=GLOBAL_LIMIT, period_s=3600, path=path)
+
+
+def _worker(path: str, worker: int, queue):
+    limiter = _limiter(path)
+    allowed = 0
+    for i in range(ATTEMPTS_PER_WORKER):
+        ok, _ = limiter.try_acquire(f"user-{(worker * ATTEMPTS_PER_WORKER + i) % 30}")
+        allowed += ok
+    queue.put(allowed)
+
+
+async def _queued_wait(path: str) -> float:
+    limiter = TokenBucketLimiter("bench_wait", per_user=1, global_limit=100, period_s=0.5, path=path)
+    limiter.reset()
+    await limiter.acquire("u")
+    start = time.perf_counter()
+    await limiter.acquire("u", max_wait_s=2.0)
+    waited = time.perf_counter() - start
+    try:
+        await limiter.acquire("u")
+    except RateLimitExceeded:
+        pass
+    return waited
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "bench_rate_limit.db")
+    _limiter(path).reset()
+
+    queue = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_worker, args=(path, w, queue)) for w in range(WORKERS)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    allowed = sum(queue.get() for _ in procs)
+    print(f"{WORKERS} processes x {ATTEMPTS_PER_WORKER} attempts: {allowed} allowed (global limit {GLOBAL_LIMIT})")
+
+    limiter = _limiter(path)
+    limiter.reset()
+    runs = 2000
+    start = time.perf_counter()
+    for i in range(runs):
+        limiter.try_acquire(f"user-{i}")
+    print(f"try_acquire: {(time.perf_counter() - start) / runs * 1e6:.0f} us per call")
+
+    print(f"queued acquire waited {asyncio.run(_queued_wait(path)):.2f}s for a 0.5s refill")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Wall-clock latency of generate_dynamic_roadmap with and without speculation,
+against a stubbed backend where every LLM call takes a fixed time.
+
+The local confidence threshold is forced above 1.0 so classify_dream always
+makes its LLM call - the case speculation is meant to hide.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_speculative_roadmap
+"""
+
+import asyncio
+import os
+import time
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-dummy-key")
+
+import core.agent
+import tools.cost_engine
+from core.llm_gateway import FakeBackend, LLMGateway, set_gateway
+
+LLM_LATENCY_S = 0.3
+RUNS = 5
+DREAM = "I want to buy a Royal Enfield bike"
+
+
+def _responder(llm_category):
+    def respond(model, contents, config):
+        if getattr(config, "response_mime_type", None) == "application/json":
+            return "{}"
+        return llm_category
+    return respond
+
+
+async def _mean_latency() -> float:
+    total = 0.0
+    for i in range(RUNS):
+        # Distinct budgets keep single-flight from merging the runs
+        start = time.perf_counter()
+        await core.agent.generate_dynamic_roadmap(DREAM, 150000 + i, 50000, 12)
+        total += time.perf_counter() - start
+    return total / RUNS
+
+
+def main():
+    tools.cost_engine.LOCAL_CONFIDENCE_THRESHOLD = 1.01
+    print(f"stub LLM latency {LLM_LATENCY_S * 1000:.0f} ms per call, {RUNS} runs each")
+    print(f"{'mode':>34} {'mean ms':>10}")
+    for label, speculative, llm_category in (
+        ("sequential", False, "purchase_vehicle"),
+        ("speculative, categories agree", True, "purchase_vehicle"),
+        ("speculative, categories disagree", True, "purchase_car"),
+    ):
+        core.agent.SPECULATIVE_ROADMAP = speculative
+        # No response cache on this gateway, so each run pays for its classification call
+        set_gateway(LLMGateway(backend=FakeBackend(_responder(llm_category), latency_s=LLM_LATENCY_S)))
+        ms = asyncio.run(_mean_latency()) * 1000
+        print(f"{label:>34} {ms:>10.0f}")
+    print(core.agent.speculation_stats())
+
+
+if __name__ == "__main__":
+    main()
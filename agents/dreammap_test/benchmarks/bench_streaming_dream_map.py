@@ -0,0 +1,79 @@
+"""
+Time to first useful output for the streaming dream map versus the buffered
+/api/dream-map path, against a stubbed backend with a fixed time-to-first-token
+and a steady chunk rate.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_streaming_dream_map
+"""
+
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-dummy-key")
+
+from core.agent import generate_dynamic_roadmap, stream_dynamic_roadmap
+from core.llm_gateway import FakeBackend, LLMGateway, set_gateway
+
+FIRST_TOKEN_S = 0.8
+CHUNK_DELAY_S = 0.05
+CHUNK_CHARS = 40
+DREAM = "I want to buy a Royal Enfield bike"
+
+ROADMAP_JSON = json.dumps({
+    "realityCheck": "With a steady saving habit this is achievable within the year.",
+    "actionPlan": [f"Month {i}: set aside the planned amount and review spending" for i in range(1, 9)],
+    "challenges": ["Unexpected expenses", "Price increases", "Lifestyle creep"],
+    "alternatives": ["A used bike", "A lower-spec model"],
+    "proTips": ["Automate the transfer on payday", "Watch for festive-season offers"],
+})
+
+
+def _respond(model, contents, config):
+    if getattr(config, "response_mime_type", None) == "application/json":
+        return ROADMAP_JSON
+    return "purchase_vehicle"
+
+
+async def _buffered() -> float:
+    start = time.perf_counter()
+    await generate_dynamic_roadmap(DREAM, 150000, 50000, 12)
+    return time.perf_counter() - start
+
+
+async def _streamed():
+    start = time.perf_counter()
+    marks = {}
+    async for event in stream_dynamic_roadmap(DREAM, 150001, 50000, 12):
+        marks.setdefault(event["event"], time.perf_counter() - start)
+    return marks
+
+
+def main():
+    # The buffered call has no chunking, so charge it the same total generation time
+    chunks = -(-len(ROADMAP_JSON) // CHUNK_CHARS)
+    set_gateway(LLMGateway(backend=FakeBackend(
+        _respond,
+        latency_s=FIRST_TOKEN_S + chunks * CHUNK_DELAY_S,
+        stream_chunk_chars=CHUNK_CHARS,
+        stream_chunk_delay_s=CHUNK_DELAY_S,
+    )))
+    buffered_ms = asyncio.run(_buffered()) * 1000
+    set_gateway(LLMGateway(backend=FakeBackend(
+        _respond,
+        latency_s=FIRST_TOKEN_S,
+        stream_chunk_chars=CHUNK_CHARS,
+        stream_chunk_delay_s=CHUNK_DELAY_S,
+    )))
+    marks = asyncio.run(_streamed())
+
+    print(f"stub first token {FIRST_TOKEN_S * 1000:.0f} ms, {chunks} chunks every {CHUNK_DELAY_S * 1000:.0f} ms")
+    print(f"{'buffered /api/dream-map':>28} {buffered_ms:>8.0f} ms to any output")
+    for event, seconds in marks.items():
+        print(f"{'stream: ' + event:>28} {seconds * 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
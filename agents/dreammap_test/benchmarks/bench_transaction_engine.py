@@ -0,0 +1,77 @@
+"""
+Columnar transaction engine against the per-row dict loop it replaced.
+
+Times, on the same CSV text:
+  - parse: csv.DictReader into row dicts vs parsing straight into columns
+  - aggregate: the old analyze_transactions loop (float() per row, category sums
+    only) vs the same per-category totals from TransactionTable, and vs the full
+    summary() (totals, counts, monthly series) and per-category medians
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_transaction_engine
+"""
+
+import csv
+import io
+import random
+import time
+
+from tools.transaction_stream import parse_csv_table
+
+ROW_COUNTS = (10_000, 100_000, 1_000_000)
+CATEGORIES = ["Food", "Travel", "Rent", "Shopping", "Bills", "Entertainment", "Health", "Education"]
+
+
+def _csv_text(rows: int) -> str:
+    rng = random.Random(rows)
+    lines = ["date,category,amount"]
+    lines += [
+        f"20{22 + i % 3}-{i % 12 + 1:02d}-{i % 28 + 1:02d},{rng.choice(CATEGORIES)},{rng.randint(50, 5000)}.25"
+        for i in range(rows)
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _row_loop(transactions):
+    """analyze_transactions before the columnar engine."""
+    categories = {}
+    total_spent = 0.0
+    for txn in transactions:
+        category = txn.get("category", "Other")
+        try:
+            amount = float(txn.get("amount", 0))
+            total_spent += amount
+            categories[category] = categories.get(category, 0) + amount
+        except ValueError:
+            continue
+    return {"total_spent": total_spent, "categories": categories, "transaction_count": len(transactions)}
+
+
+def _best_of(fn, runs: int = 3):
+    best, result = float("inf"), None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def main():
+    print(f"{'rows':>9} {'parse dicts':>12} {'parse cols':>11} {'row loop':>9} {'totals':>8} {'speedup':>8} "
+          f"{'summary':>8} {'medians':>8}")
+    for rows in ROW_COUNTS:
+        text = _csv_text(rows)
+        dicts, parse_dicts_ms = _best_of(lambda: list(csv.DictReader(io.StringIO(text))))
+        table, parse_cols_ms = _best_of(lambda: parse_csv_table(io.StringIO(text)))
+        old, loop_ms = _best_of(lambda: _row_loop(dicts))
+        totals, totals_ms = _best_of(table.category_totals)
+        new, summary_ms = _best_of(table.summary)
+        _, medians_ms = _best_of(table.category_medians)
+        assert new["transaction_count"] == old["transaction_count"]
+        assert abs(totals.sum() - old["total_spent"]) < 1e-6 * old["total_spent"]
+        print(f"{rows:>9} {parse_dicts_ms:>10.0f}ms {parse_cols_ms:>9.0f}ms {loop_ms:>7.1f}ms {totals_ms:>6.1f}ms "
+              f"{loop_ms / totals_ms:>7.0f}x {summary_ms:>6.1f}ms {medians_ms:>6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
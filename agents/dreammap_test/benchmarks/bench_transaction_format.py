@@ -0,0 +1,66 @@
+"""
+Binary columnar transaction bundle (GATX) against CSV text.
+
+For the same transactions, reports payload size (raw and gzipped) and the time
+to go from the received bytes to the comparison summary:
+  - CSV: streamed parse into columns (tools.transaction_stream.read_csv_table)
+  - bundle: zero-copy decode from an in-memory buffer, and from a memory-mapped file
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_transaction_format
+"""
+
+import gzip
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.bench_transaction_engine import _best_of, _csv_text
+from tools.transaction_bundle import decode_bundle, encode_bundle, read_transaction_table
+from tools.transaction_stream import read_csv_table
+
+ROW_COUNTS = (10_000, 100_000, 1_000_000)
+
+
+def main():
+    print(f"{'rows':>9} {'csv KB':>9} {'csv.gz KB':>10} {'gatx KB':>9} {'gatx.gz KB':>11} "
+          f"{'csv ms':>8} {'gatx ms':>8} {'mmap ms':>8} {'speedup':>8}")
+    for rows in ROW_COUNTS:
+        csv_bytes = _csv_text(rows).encode("utf-8")
+        table = read_csv_table(io.BytesIO(csv_bytes))
+        bundle = encode_bundle(table)
+
+        csv_summary, csv_ms = _best_of(lambda: read_csv_table(io.BytesIO(csv_bytes)).summary())
+        bundle_summary, bundle_ms = _best_of(lambda: decode_bundle(bundle).summary())
+        assert bundle_summary == csv_summary
+
+        with tempfile.NamedTemporaryFile(suffix=".gatx", delete=False) as f:
+            f.write(bundle)
+        try:
+            def from_file():
+                with open(f.name, "rb") as fh:
+                    return read_transaction_table(fh).summary()
+
+            mmap_summary, mmap_ms = _best_of(from_file)
+            assert mmap_summary == csv_summary
+        finally:
+            os.unlink(f.name)
+
+        print(f"{rows:>9} {len(csv_bytes) / 1024:>9.0f} {len(gzip.compress(csv_bytes)) / 1024:>10.0f} "
+              f"{len(bundle) / 1024:>9.0f} {len(gzip.compress(bundle)) / 1024:>11.0f} "
+              f"{csv_ms:>8.1f} {bundle_ms:>8.1f} {mmap_ms:>8.1f} {csv_ms / bundle_ms:>7.0f}x")
+
+    # The parse step alone: bytes -> columns, without the aggregation both paths share
+    csv_bytes = _csv_text(ROW_COUNTS[-1]).encode("utf-8")
+    bundle = encode_bundle(read_csv_table(io.BytesIO(csv_bytes)))
+    _, csv_ms = _best_of(lambda: read_csv_table(io.BytesIO(csv_bytes)))
+    start = time.perf_counter()
+    for _ in range(100):
+        decode_bundle(bundle)
+    bundle_ms = (time.perf_counter() - start) * 10
+    print(f"\nbytes -> columns at {ROW_COUNTS[-1]:,} rows: csv {csv_ms:.1f} ms, gatx {bundle_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Incremental per-user transaction store against re-sending the whole history.
+
+A user has H transactions on file and 100 new ones arrive before each
+comparison. Times the work needed to get that user's up-to-date summary:
+  - resend: parse the full H+100 row CSV (what /api/compare-users does)
+  - store: append the 100-row delta to the stored aggregates, then read the
+    summary back (what /api/compare-users/stored does)
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_transaction_store
+"""
+
+import io
+import os
+import tempfile
+
+from benchmarks.bench_transaction_engine import _best_of, _csv_text
+from tools.transaction_store import TransactionStore
+from tools.transaction_stream import parse_csv_table
+
+HISTORY_ROWS = (10_000, 100_000, 1_000_000)
+DELTA_ROWS = 100
+
+
+def main():
+    delta_csv = _csv_text(DELTA_ROWS)
+    print(f"{'history':>9} {'resend ms':>10} {'append ms':>10} {'summary ms':>11} {'store ms':>9} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TransactionStore(os.path.join(tmp, "transactions.db"))
+        for rows in HISTORY_ROWS:
+            user = f"user-{rows}"
+            history_csv = _csv_text(rows)
+            store.append(user, parse_csv_table(io.StringIO(history_csv)))
+            full_csv = history_csv + delta_csv.split("\n", 1)[1]
+
+            _, resend_ms = _best_of(lambda: parse_csv_table(io.StringIO(full_csv)).summary())
+            # Each append is a new batch, so every run really adds the delta
+            _, append_ms = _best_of(lambda: store.append(user, parse_csv_table(io.StringIO(delta_csv))), runs=5)
+            summary, summary_ms = _best_of(lambda: store.summary(user), runs=5)
+            assert summary["transaction_count"] == rows + 5 * DELTA_ROWS
+
+            store_ms = append_ms + summary_ms
+            print(f"{rows:>9} {resend_ms:>10.1f} {append_ms:>10.2f} {summary_ms:>11.2f} {store_ms:>9.2f} "
+                  f"{resend_ms / store_ms:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Parse time and peak memory for transaction CSVs: the JSON-string path
+(parse_csv_transactions + analyze_transactions) against the chunked parser used
+by /api/compare-users/upload, for plain and gzipped files up to 1M rows.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.bench_transaction_upload
+"""
+
+import gzip
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from core.comparison_agent import analyze_transactions, parse_csv_transactions
+from tools.transaction_stream import aggregate_csv_file
+
+ROW_COUNTS = (100_000, 1_000_000)
+CATEGORIES = ["Food", "Travel", "Rent", "Shopping", "Bills", "Entertainment", "Health", "Education"]
+
+
+def _write_csv(path: str, rows: int, compress: bool):
+    rng = random.Random(rows)
+    opener = gzip.open if compress else open
+    with opener(path, "wt", encoding="utf-8", newline="") as f:
+        f.write("date,category,amount,description\n")
+        for i in range(rows):
+            f.write(f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d},{rng.choice(CATEGORIES)},{rng.randint(50, 5000)}.50,\"txn {i}, card\"\n")
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    print(f"{'rows':>9} {'input':>14} {'MB on disk':>11} {'seconds':>8} {'peak MB':>8}")
+    for rows in ROW_COUNTS:
+        plain = os.path.join(tmp, f"txns_{rows}.csv")
+        gz = plain + ".gz"
+        _write_csv(plain, rows, compress=False)
+        _write_csv(gz, rows, compress=True)
+
+        def json_string_path():
+            with open(plain, "r", encoding="utf-8") as f:
+                text = f.read()
+            return analyze_transactions(parse_csv_transactions(text))
+
+        def chunked(path):
+            with open(path, "rb") as f:
+                return aggregate_csv_file(f)
+
+        expected = None
+        for label, path, fn in (
+            ("string+dicts", plain, json_string_path),
+            ("chunked csv", plain, lambda: chunked(plain)),
+            ("chunked gzip", gz, lambda: chunked(gz)),
+        ):
+            result, elapsed, peak = _measure(fn)
+            if expected is None:
+                expected = result
+            assert result["transaction_count"] == expected["transaction_count"] == rows
+            assert abs(result["total_spent"] - expected["total_spent"]) < 1e-3 * rows
+            print(f"{rows:>9} {label:>14} {os.path.getsize(path) / 1e6:>11.1f} {elapsed:>8.2f} {peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
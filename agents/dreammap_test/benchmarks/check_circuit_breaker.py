@@ -0,0 +1,146 @@
+"""
+Invariant checks for the per-model circuit breaker (assert-based, no LLM).
+
+Half-open admits exactly one probe, and only that probe's outcome can close or
+re-open the breaker: a call admitted while the breaker was still closed that
+finishes late must not decide it, and a cancelled probe must free the slot.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.check_circuit_breaker
+"""
+
+import asyncio
+
+from core.circuit_breaker import CALL, CLOSED, HALF_OPEN, OPEN, PROBE, BreakerRegistry, CircuitBreaker
+from core.llm_gateway import FakeBackend, LLMGateway
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+SETTINGS = {"window": 10, "min_calls": 4, "failure_threshold": 0.5, "open_s": 30.0}
+
+
+def _trip(breaker: CircuitBreaker):
+    for _ in range(4):
+        assert breaker.allow() == CALL
+        breaker.record(False, 0.1)
+    assert breaker.state == OPEN
+
+
+def _tripped_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker("m", clock=clock, **SETTINGS)
+    _trip(breaker)
+    return breaker, clock
+
+
+def check_trips_and_short_circuits():
+    breaker, clock = _tripped_breaker()
+    assert breaker.allow() is None
+    clock.now += 29.0
+    assert breaker.allow() is None
+    assert breaker.stats()["short_circuited"] == 2
+
+
+def check_single_probe():
+    breaker, clock = _tripped_breaker()
+    clock.now += 30.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() == PROBE
+    assert breaker.allow() is None, "a second call got through while the probe is in flight"
+
+
+def check_late_call_does_not_resolve_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker("m", clock=clock, **SETTINGS)
+    # Six calls admitted while closed; four fail and trip the breaker
+    admissions = [breaker.allow() for _ in range(6)]
+    assert admissions == [CALL] * 6
+    for _ in range(4):
+        breaker.record(False, 0.1, CALL)
+    assert breaker.state == OPEN
+    clock.now += 30.0
+    assert breaker.allow() == PROBE
+
+    # The other two finish only now, one either way
+    breaker.record(True, 0.1, CALL)
+    assert breaker.state == HALF_OPEN, "a late ordinary success closed the breaker"
+    breaker.record(False, 0.1, CALL)
+    assert breaker.state == HALF_OPEN, "a late ordinary failure re-opened the breaker"
+    assert breaker.allow() is None, "a late call freed the probe slot"
+
+
+def check_probe_outcome_decides():
+    breaker, clock = _tripped_breaker()
+    clock.now += 30.0
+    assert breaker.allow() == PROBE
+    breaker.record(True, 0.1, PROBE)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["recent_calls"] == 0
+
+    breaker, clock = _tripped_breaker()
+    clock.now += 30.0
+    assert breaker.allow() == PROBE
+    breaker.record(False, 0.1, PROBE)
+    assert breaker.state == OPEN
+    clock.now += 30.0
+    assert breaker.allow() == PROBE
+
+
+def check_released_probe_frees_slot():
+    breaker, clock = _tripped_breaker()
+    clock.now += 30.0
+    assert breaker.allow() == PROBE
+    breaker.release(CALL)
+    assert breaker.allow() is None, "releasing an ordinary call freed the probe slot"
+    breaker.release(PROBE)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() == PROBE
+
+
+def check_cancelled_probe_call_is_released():
+    async def run():
+        clock = FakeClock()
+        gateway = LLMGateway(backend=FakeBackend(latency_s=1.0), breakers=BreakerRegistry(clock=clock, **SETTINGS))
+        breaker = gateway.breakers.get("m")
+        _trip(breaker)
+        clock.now += 30.0
+        call = asyncio.ensure_future(gateway.generate_text(model="m", contents="probe", config=None))
+        await asyncio.sleep(0.01)
+        assert breaker.allow() is None
+        call.cancel()
+        try:
+            await call
+        except asyncio.CancelledError:
+            pass
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow() == PROBE, "a cancelled probe kept the slot"
+        assert gateway.stats()["models"]["m"]["errors"] == 0
+
+    asyncio.run(run())
+
+
+CHECKS = [
+    check_trips_and_short_circuits,
+    check_single_probe,
+    check_late_call_does_not_resolve_half_open,
+    check_probe_outcome_decides,
+    check_released_probe_frees_slot,
+    check_cancelled_probe_call_is_released,
+]
+
+
+def main():
+    for check in CHECKS:
+        check()
+        print(f"ok  {check.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Invariant checks for local-first dream classification (assert-based, fake LLM).
+
+classify_dream answers from the local model without any LLM call when it is
+confident, calls the LLM exactly once when it is not, and falls back to the
+keyword matcher when the LLM is missing or answers with an unknown key. On the
+held-out seed corpus, the answers it keeps local must stay accurate.
+cheap_classify (the no-LLM guess behind speculative and fast roadmaps) only
+trusts a weak local guess with no keyword support when it clearly leads.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.check_dream_classifier
+"""
+
+import asyncio
+import math
+
+from core.llm_gateway import FakeBackend, LLMGateway, set_gateway
+from tools.cost_engine import (
+    KEYWORD_MATCHER,
+    LOCAL_CLASSIFIER,
+    LOCAL_CONFIDENCE_THRESHOLD,
+    LOCAL_GUESS_FLOOR,
+    LOCAL_GUESS_MARGIN,
+    TEMPLATES,
+    cheap_classify,
+    classify_dream,
+)
+from tools.dream_classifier import NaiveBayesDreamClassifier, load_seed_corpus, training_samples
+
+HOLDOUT_EVERY = 4
+MIN_SKIP_SHARE = 0.5
+MIN_SKIPPED_ACCURACY = 0.9
+
+CONFIDENT_TEXT = "a trip to Bali"
+UNSURE_TEXT = "something nice for myself"
+
+
+def _classify(text: str, responder=None, backend: bool = True):
+    fake = FakeBackend(responder=responder) if backend else None
+    set_gateway(LLMGateway(backend=fake))
+    key, template = asyncio.run(classify_dream(text))
+    assert template is TEMPLATES[key]
+    return key, fake.calls if fake else 0
+
+
+def check_probabilities():
+    for text in (CONFIDENT_TEXT, UNSURE_TEXT, "", "!!!"):
+        proba = LOCAL_CLASSIFIER.predict_proba(text)
+        assert set(proba) <= set(TEMPLATES)
+        assert math.isclose(sum(proba.values()), 1.0)
+        label, confidence = LOCAL_CLASSIFIER.predict(text)
+        assert confidence == max(proba.values()) and proba[label] == confidence
+
+
+def check_confident_answer_skips_llm():
+    assert LOCAL_CLASSIFIER.predict(CONFIDENT_TEXT)[1] >= LOCAL_CONFIDENCE_THRESHOLD
+    key, calls = _classify(CONFIDENT_TEXT, responder=lambda *a: "purchase_car")
+    assert (key, calls) == ("world_tour", 0)
+
+
+def check_unsure_answer_asks_llm_once():
+    assert LOCAL_CLASSIFIER.predict(UNSURE_TEXT)[1] < LOCAL_CONFIDENCE_THRESHOLD
+    assert _classify(UNSURE_TEXT, responder=lambda *a: " Purchase_Car\n") == ("purchase_car", 1)
+
+
+def check_keyword_fallback():
+    text = "buy a car, something nice"
+    assert LOCAL_CLASSIFIER.predict(text)[1] < LOCAL_CONFIDENCE_THRESHOLD
+    assert _classify(text, responder=lambda *a: "no idea") == ("purchase_car", 1)
+
+    def fail(*_):
+        raise RuntimeError("quota")
+
+    assert _classify(text, responder=fail) == ("purchase_car", 1)
+    assert _classify(text, backend=False) == ("purchase_car", 0)
+
+
+def check_cheap_classify_guards():
+    assert cheap_classify(CONFIDENT_TEXT) == "world_tour"
+    assert cheap_classify("buy a car, something nice") == "purchase_car"
+    # No keyword, and the local model's best guess (home_renovation, ~0.46) is weak
+    assert cheap_classify("scar removal") == "other"
+    # Any sub-threshold guess without keyword support must clear the floor and margin
+    for text in ("", "something nice", "I want to be happy", "scar removal", "a new hobby", "buy a house"):
+        ranked = sorted(LOCAL_CLASSIFIER.predict_proba(text).values(), reverse=True)
+        key = cheap_classify(text)
+        if ranked[0] < LOCAL_CONFIDENCE_THRESHOLD and KEYWORD_MATCHER.classify(text) == "other" and key != "other":
+            assert ranked[0] >= LOCAL_GUESS_FLOOR and ranked[0] - ranked[1] >= LOCAL_GUESS_MARGIN, text
+
+
+def check_held_out_accuracy():
+    corpus = load_seed_corpus()
+    train = {label: [t for i, t in enumerate(texts) if i % HOLDOUT_EVERY] for label, texts in corpus.items()}
+    held_out = [(t, label) for label, texts in corpus.items() for i, t in enumerate(texts) if not i % HOLDOUT_EVERY]
+    clf = NaiveBayesDreamClassifier().fit(training_samples(TEMPLATES, train))
+
+    kept = [(clf.predict(text)[0], label) for text, label in held_out if clf.predict(text)[1] >= LOCAL_CONFIDENCE_THRESHOLD]
+    skip_share = len(kept) / len(held_out)
+    accuracy = sum(p == l for p, l in kept) / len(kept)
+    assert skip_share >= MIN_SKIP_SHARE, f"only {skip_share:.0%} of held-out dreams skip the LLM"
+    assert accuracy >= MIN_SKIPPED_ACCURACY, f"local answers are {accuracy:.0%} accurate"
+
+
+CHECKS = [
+    check_probabilities,
+    check_confident_answer_skips_llm,
+    check_unsure_answer_asks_llm_once,
+    check_keyword_fallback,
+    check_cheap_classify_guards,
+    check_held_out_accuracy,
+]
+
+
+def main():
+    for check in CHECKS:
+        check()
+        print(f"ok  {check.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Invariant checks for the shared financial kernel (assert-based).
+
+Known values for each formula, the edge cases the agents rely on (no savings,
+full depreciation, zero wage), scalar in -> Python scalar out, and broadcast
+results equal to element-by-element calls.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.check_finance_math
+"""
+
+import math
+
+import numpy as np
+
+from tools.finance_math import (
+    FV_HORIZONS_YEARS,
+    NEVER_MONTHS,
+    depreciated_value,
+    future_value,
+    future_values,
+    months_to_save,
+    time_cost_hours,
+)
+
+
+def check_future_value():
+    assert math.isclose(future_value(100_000, 0.10, 1), 110_000)
+    assert math.isclose(future_value(100_000, 0.10, 2), 121_000)
+    assert future_value(50_000, 0.12, 0) == 50_000
+    assert future_value(50_000, 0.0, 10) == 50_000
+    assert isinstance(future_value(1, 0.1, 1), float)
+
+    table = future_values([1_000, 2_000], 0.10)
+    assert table.shape == (2, len(FV_HORIZONS_YEARS))
+    expected = [[1_000 * 1.1 ** y for y in FV_HORIZONS_YEARS], [2_000 * 1.1 ** y for y in FV_HORIZONS_YEARS]]
+    assert np.allclose(table, expected)
+    assert future_values(1_000, 0.10, horizons=(3,)).shape == (1,)
+
+
+def check_depreciated_value():
+    assert math.isclose(depreciated_value(100_000, 1, 0.15), 85_000)
+    assert math.isclose(depreciated_value(100_000, 2, 0.5), 25_000)
+    assert depreciated_value(100_000, 5, 0.0) == 100_000
+    assert depreciated_value(100_000, 3, 1.0) == 0.0
+    assert depreciated_value(100_000, 3, 1.5) == 0.0, "a rate over 100% must not flip the sign"
+    assert depreciated_value(100_000, 0, 0.3) == 100_000
+
+
+def check_months_to_save():
+    assert months_to_save(300, 100) == 3
+    assert months_to_save(301, 100) == 4
+    assert months_to_save(100.5, 100) == 2
+    assert months_to_save(100, 0.5) == 200
+    assert months_to_save(0.3, 0.1) == 3, "float noise must not add a month"
+    assert months_to_save(0, 500) == 0
+    assert months_to_save(0, 0.5) == 0
+    assert months_to_save(1_000, 0) == NEVER_MONTHS
+    assert months_to_save(1_000, -50) == NEVER_MONTHS
+    assert isinstance(months_to_save(1_000, 10), int)
+
+
+def check_time_cost_hours():
+    assert time_cost_hours(4_000, 500) == 8.0
+    assert time_cost_hours(4_000, 0) == 0.0
+    assert time_cost_hours(4_000, -10) == 0.0
+
+
+def check_broadcast_matches_scalar():
+    rng = np.random.default_rng(3)
+    amount = rng.uniform(1, 2_000_000, 500)
+    rate = rng.uniform(0.0, 0.2, 500)
+    years = rng.integers(0, 31, 500).astype(np.float64)
+    monthly = rng.uniform(-1_000, 50_000, 500)
+    wage = rng.uniform(-100, 2_000, 500)
+
+    assert np.allclose(future_value(amount, rate, years), [future_value(*a) for a in zip(amount, rate, years)])
+    assert np.allclose(depreciated_value(amount, years, rate), [depreciated_value(*a) for a in zip(amount, years, rate)])
+    assert (months_to_save(amount, monthly) == [months_to_save(*a) for a in zip(amount, monthly)]).all()
+    assert np.allclose(time_cost_hours(amount, wage), [time_cost_hours(*a) for a in zip(amount, wage)])
+
+    expected = [NEVER_MONTHS if m <= 0 else math.ceil(a / m - 1e-9) for a, m in zip(amount, monthly)]
+    assert (months_to_save(amount, monthly) == expected).all()
+    # One rate for every amount broadcasts too
+    assert np.allclose(future_value(amount, 0.1, 5), amount * 1.1 ** 5)
+
+
+CHECKS = [
+    check_future_value,
+    check_depreciated_value,
+    check_months_to_save,
+    check_time_cost_hours,
+    check_broadcast_matches_scalar,
+]
+
+
+def main():
+    for check in CHECKS:
+        check()
+        print(f"ok  {check.__name__}")
+
+
+if __name__ == "__main__":
+    main()
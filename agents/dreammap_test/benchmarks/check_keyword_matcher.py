@@ -0,0 +1,77 @@
+"""
+Invariant checks for the compiled keyword matcher (assert-based, no LLM).
+
+Keywords match whole words only ("car" never inside "career" or "scar"), the
+longest phrase at a position wins ("gaming laptop" over "laptop"), simple
+plurals match, and the batch API agrees with one-at-a-time classification.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.check_keyword_matcher
+"""
+
+from tools.cost_engine import KEYWORD_MATCHER
+from tools.keyword_matcher import KeywordMatcher, tokenize
+
+
+def check_whole_words_only():
+    for text in ("grow my career", "scar treatment", "cartography course fees", "a scarf from Kashmir"):
+        assert "purchase_car" not in KEYWORD_MATCHER.scores(text), f"'car' matched inside a word in {text!r}"
+    assert KEYWORD_MATCHER.classify("buy a car") == "purchase_car"
+    assert KEYWORD_MATCHER.classify("Buy a CAR!") == "purchase_car"
+    assert KEYWORD_MATCHER.classify("scar removal") == "other"
+    # "ac" is a keyword; "academy" and "react" are not air conditioners
+    assert "home_appliance" not in KEYWORD_MATCHER.scores("join a react academy")
+
+
+def check_longest_phrase_wins():
+    assert [m[0] for m in KEYWORD_MATCHER.matches("a gaming laptop")] == ["gaming laptop"]
+    assert [m[0] for m in KEYWORD_MATCHER.matches("royal enfield bullet")] == ["royal enfield", "bullet"]
+    matcher = KeywordMatcher({"a": {"coffee": 1}, "b": {"coffee shop": 1}})
+    assert matcher.classify("open a coffee shop") == "b"
+    assert matcher.classify("coffee beans") == "a"
+
+
+def check_plurals():
+    assert KEYWORD_MATCHER.classify("two cars") == "purchase_car"
+    assert KEYWORD_MATCHER.classify("new watches") == "buy_luxury_item"
+    # A digit is not pluralised, and a word already ending in "s" is left alone
+    matcher = KeywordMatcher({"a": {"ms": 1, "iphone 15": 1}})
+    assert matcher.matches("ms") and not matcher.matches("mss")
+    assert not matcher.matches("iphone 15s")
+
+
+def check_scoring_and_ties():
+    matcher = KeywordMatcher({"a": {"trip": 1, "tour": 1}, "b": {"world tour": 1}})
+    # A phrase scores weight * words and consumes its words ("tour" is not counted again)
+    assert matcher.scores("trip and world tour") == {"a": 1.0, "b": 2.0}
+    # A tie (2.0 each) goes to the label with the longer match
+    assert matcher.scores("trip tour world tour") == {"a": 2.0, "b": 2.0}
+    assert matcher.classify("trip tour world tour") == "b"
+    assert matcher.classify("") == "other"
+    assert matcher.classify("nothing relevant here") == "other"
+    assert KeywordMatcher({}, default="none").classify("car") == "none"
+
+
+def check_batch_matches_single():
+    texts = ["buy a car", "grow my career", "a gaming laptop", "", "wedding in Goa", "learn guitar"]
+    assert KEYWORD_MATCHER.classify_many(texts) == [KEYWORD_MATCHER.classify(t) for t in texts]
+    assert tokenize("Don't-stop, 2 cars!") == ["don", "t", "stop", "2", "cars"]
+
+
+CHECKS = [
+    check_whole_words_only,
+    check_longest_phrase_wins,
+    check_plurals,
+    check_scoring_and_ties,
+    check_batch_matches_single,
+]
+
+
+def main():
+    for check in CHECKS:
+        check()
+        print(f"ok  {check.__name__}")
+
+
+if __name__ == "__main__":
+    main()
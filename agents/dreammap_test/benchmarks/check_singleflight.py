@@ -0,0 +1,138 @@
+"""
+Invariant checks for single-flight coalescing under per-request deadlines
+(assert-based, no LLM).
+
+Every caller waits for the shared call only as long as its own budget allows:
+a short-deadline follower gets its fallback on time, while the leader and the
+other waiters still get the real result from the one underlying call. A shared
+call whose waiters all gave up must not leave its exception unretrieved.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.check_singleflight
+"""
+
+import asyncio
+import time
+
+from core.deadline import DeadlineExceeded, request_budget
+from core.singleflight import SingleFlight
+
+WORK_S = 0.3
+
+
+class Work:
+    def __init__(self, result="real", error=None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(WORK_S)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def _caller(flight: SingleFlight, work: Work, budget_s, on_timeout=None):
+    """One request: its own budget, then the shared call. Returns (outcome, elapsed, budget)."""
+    with request_budget(budget_s) as budget:
+        start = time.monotonic()
+        try:
+            outcome = await flight.do("key", work, on_timeout=on_timeout)
+        except Exception as e:
+            outcome = e
+        return outcome, time.monotonic() - start, budget
+
+
+def check_short_follower_falls_back_on_time():
+    async def run():
+        flight, work = SingleFlight("check_short_follower"), Work()
+        leader = asyncio.ensure_future(_caller(flight, work, 5.0))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(_caller(flight, work, 0.1, on_timeout=lambda: "fallback"))
+        (lead, lead_s, lead_budget), (follow, follow_s, follow_budget) = await asyncio.gather(leader, follower)
+
+        assert work.calls == 1
+        assert lead == "real" and lead_s >= WORK_S * 0.9
+        assert lead_budget.degraded == []
+        assert follow == "fallback"
+        assert follow_s < WORK_S * 0.7, f"follower waited {follow_s * 1000:.0f} ms past its 100 ms budget"
+        assert follow_budget.degraded == ["deadline"]
+        assert flight.stats() == {"calls": 1, "coalesced": 1, "timed_out": 1, "in_flight": 0}
+
+    asyncio.run(run())
+
+
+def check_follower_without_fallback_raises_deadline():
+    async def run():
+        flight, work = SingleFlight("check_no_fallback"), Work()
+        leader = asyncio.ensure_future(_caller(flight, work, None))
+        await asyncio.sleep(0.01)
+        follow, _, budget = await _caller(flight, work, 0.05)
+        assert isinstance(follow, DeadlineExceeded)
+        assert budget.degraded == ["deadline"]
+        assert (await leader)[0] == "real"
+
+    asyncio.run(run())
+
+
+def check_short_leader_does_not_cut_off_followers():
+    async def run():
+        flight, work = SingleFlight("check_short_leader"), Work()
+        leader = asyncio.ensure_future(_caller(flight, work, 0.05, on_timeout=lambda: "fallback"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(_caller(flight, work, 5.0))
+        (lead, _, _), (follow, _, follow_budget) = await asyncio.gather(leader, follower)
+        assert lead == "fallback"
+        assert follow == "real", "the leader's deadline cancelled the shared call"
+        assert follow_budget.degraded == []
+        assert work.calls == 1
+
+    asyncio.run(run())
+
+
+def check_shared_timeout_error_is_not_a_deadline():
+    async def run():
+        flight, work = SingleFlight("check_shared_timeout"), Work(error=asyncio.TimeoutError())
+        outcome, _, budget = await _caller(flight, work, 5.0, on_timeout=lambda: "fallback")
+        assert isinstance(outcome, asyncio.TimeoutError) and not isinstance(outcome, DeadlineExceeded)
+        assert budget.degraded == []
+        assert flight.timed_out == 0
+
+    asyncio.run(run())
+
+
+def check_abandoned_failure_is_retrieved():
+    unretrieved = []
+
+    async def run():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: unretrieved.append(ctx))
+        flight, work = SingleFlight("check_abandoned"), Work(error=RuntimeError("boom"))
+        outcomes = await asyncio.gather(*(_caller(flight, work, 0.05, on_timeout=lambda: "fallback") for _ in range(3)))
+        assert [o for o, _, _ in outcomes] == ["fallback"] * 3
+        await asyncio.sleep(WORK_S)
+        assert work.calls == 1
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(run())
+    assert not unretrieved, f"unretrieved exception: {unretrieved[0].get('message')}"
+
+
+CHECKS = [
+    check_short_follower_falls_back_on_time,
+    check_follower_without_fallback_raises_deadline,
+    check_short_leader_does_not_cut_off_followers,
+    check_shared_timeout_error_is_not_a_deadline,
+    check_abandoned_failure_is_retrieved,
+]
+
+
+def main():
+    for check in CHECKS:
+        check()
+        print(f"ok  {check.__name__}")
+
+
+if __name__ == "__main__":
+    main()
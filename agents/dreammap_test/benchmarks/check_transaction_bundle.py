@@ -0,0 +1,106 @@
+"""
+Invariant checks for the binary columnar transaction bundle (assert-based).
+
+A bundle must decode to the same columns and summary as the CSV it was built
+from, whether it arrives as bytes, a file on disk (memory-mapped) or an
+in-memory upload, and the upload must still close cleanly afterwards. Damaged
+bundles are rejected with ValueError.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.check_transaction_bundle
+"""
+
+import io
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from tools.transaction_bundle import decode_bundle, encode_bundle, read_transaction_table
+from tools.transaction_stream import parse_csv_table
+
+SAMPLE_CSV = (
+    "date,category,amount\n"
+    "2024-01-03,Food,250.50\n"
+    "2024-01-15,Café,1200\n"
+    "2024-02-09,Travel,oops\n"
+    ",Rent,15000\n"
+)
+
+
+def _table():
+    return parse_csv_table(io.StringIO(SAMPLE_CSV))
+
+
+def _same_table(a, b):
+    assert a.categories == b.categories
+    assert np.array_equal(a.amounts, b.amounts, equal_nan=True)
+    assert np.array_equal(a.category_codes, b.category_codes)
+    assert np.array_equal(a.dates, b.dates, equal_nan=True)
+    assert a.summary() == b.summary()
+
+
+def check_round_trip():
+    table = _table()
+    data = encode_bundle(table)
+    assert len(data) % 8 == 0
+    _same_table(decode_bundle(data), table)
+    empty = parse_csv_table(io.StringIO("date,category,amount\n"))
+    assert len(decode_bundle(encode_bundle(empty))) == 0
+
+
+def check_every_source():
+    table = _table()
+    data = encode_bundle(table)
+
+    _same_table(read_transaction_table(io.BytesIO(data)), table)
+    _same_table(read_transaction_table(io.BytesIO(SAMPLE_CSV.encode("utf-8"))), table)
+
+    upload = tempfile.SpooledTemporaryFile(max_size=1 << 20)
+    upload.write(data)
+    upload.seek(0)
+    loaded = read_transaction_table(upload)
+    upload.close()  # must not fail while `loaded` still views the upload's bytes
+    _same_table(loaded, table)
+
+    fd, path = tempfile.mkstemp(suffix=".gatx")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        with open(path, "rb") as f:
+            _same_table(read_transaction_table(f), table)
+    finally:
+        os.remove(path)
+
+
+def check_damaged_bundles_rejected():
+    data = encode_bundle(_table())
+    codes_offset = len(data) - 4 * len(_table())
+    bad_code = bytearray(data)
+    struct.pack_into("<i", bad_code, codes_offset, 99)
+    bad_version = bytearray(data)
+    struct.pack_into("<H", bad_version, 4, 2)
+    for damaged in (data[:10], data[:-1], b"XXXX" + data[4:], bytes(bad_code), bytes(bad_version)):
+        try:
+            decode_bundle(damaged)
+        except ValueError:
+            continue
+        raise AssertionError("a damaged bundle was accepted")
+
+
+CHECKS = [
+    check_round_trip,
+    check_every_source,
+    check_damaged_bundles_rejected,
+]
+
+
+def main():
+    for check in CHECKS:
+        check()
+        print(f"ok  {check.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Invariant checks for the persistent per-user transaction store (assert-based).
+
+Appending a history in deltas must give the same summary as aggregating it in
+one go; re-sending a batch is a no-op; users are kept apart; the database is
+owner-only; and the store endpoints refuse callers without the store key.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.check_transaction_store
+"""
+
+import math
+import os
+import stat
+import tempfile
+
+import numpy as np
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from tools.transaction_engine import TransactionTableBuilder
+from tools.transaction_store import TransactionStore
+
+ROWS = 5_000
+DELTAS = 7
+
+
+def _history(seed: int):
+    rng = np.random.default_rng(seed)
+    categories = np.array(["Food", "Rent", "Travel", "Shopping", "Health"])
+    days = rng.integers(0, 400, ROWS)
+    amounts = np.round(rng.uniform(10, 5_000, ROWS), 2).astype(str)
+    amounts[rng.integers(0, ROWS, 20)] = "n/a"
+    dates = (np.datetime64("2024-01-01") + days).astype(str)
+    dates[rng.integers(0, ROWS, 20)] = ""
+    return list(zip(categories[rng.integers(0, len(categories), ROWS)], amounts, dates))
+
+
+def _table(rows):
+    builder = TransactionTableBuilder()
+    for category, amount, date in rows:
+        builder.add_row(category, amount, date)
+    return builder.build()
+
+
+def _same(a: dict, b: dict):
+    assert a["transaction_count"] == b["transaction_count"]
+    assert a["category_counts"] == b["category_counts"]
+    assert math.isclose(a["total_spent"], b["total_spent"], rel_tol=1e-9)
+    for key in ("categories", "monthly_totals"):
+        assert a[key].keys() == b[key].keys(), key
+        assert all(math.isclose(a[key][k], b[key][k], rel_tol=1e-9) for k in a[key]), key
+
+
+def check_deltas_match_full_history(store: TransactionStore):
+    rows = _history(1)
+    bounds = np.linspace(0, ROWS, DELTAS + 1).astype(int)
+    for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+        watermark = store.append("alice", _table(rows[lo:hi]), batch_id=f"b{i}")
+    assert watermark["revision"] == DELTAS
+    assert watermark["transaction_count"] == ROWS
+    assert watermark["last_date"] == max(d for _, _, d in rows if d)
+    _same(store.summary("alice"), _table(rows).summary())
+
+
+def check_resent_batch_is_noop(store: TransactionStore):
+    before = store.summary("alice")
+    revision = store.watermark("alice")["revision"]
+    store.append("alice", _table(_history(2)[:100]), batch_id=f"b{DELTAS - 1}")
+    assert store.watermark("alice")["revision"] == revision
+    _same(store.summary("alice"), before)
+
+
+def check_users_are_separate(store: TransactionStore):
+    rows = _history(3)
+    store.append("bob", _table(rows))
+    _same(store.summary("bob"), _table(rows).summary())
+    assert store.summary("carol") is None
+    store.reset("bob")
+    assert store.summary("bob") is None and store.summary("alice") is not None
+
+
+def check_owner_only(store: TransactionStore):
+    assert stat.S_IMODE(os.stat(store.path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(os.path.dirname(store.path)).st_mode) == 0o700
+
+
+def check_endpoints_require_store_key(store: TransactionStore):
+    from app.main import _check_store_access
+
+    def status(key, header):
+        if key is None:
+            os.environ.pop("TRANSACTION_STORE_API_KEY", None)
+        else:
+            os.environ["TRANSACTION_STORE_API_KEY"] = key
+        headers = [] if header is None else [(b"x-store-key", header.encode())]
+        try:
+            _check_store_access(Request({"type": "http", "headers": headers}))
+        except HTTPException as e:
+            return e.status_code
+        return 200
+
+    saved = os.environ.get("TRANSACTION_STORE_API_KEY")
+    try:
+        assert status(None, "anything") == 503, "with no key configured the store must be off"
+        assert status("s3cret", None) == 403
+        assert status("s3cret", "wrong") == 403
+        assert status("s3cret", "s3cret") == 200
+    finally:
+        if saved is None:
+            os.environ.pop("TRANSACTION_STORE_API_KEY", None)
+        else:
+            os.environ["TRANSACTION_STORE_API_KEY"] = saved
+
+
+CHECKS = [
+    check_deltas_match_full_history,
+    check_resent_batch_is_noop,
+    check_users_are_separate,
+    check_owner_only,
+    check_endpoints_require_store_key,
+]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TransactionStore(os.path.join(tmp, "private", "transactions.db"))
+        for check in CHECKS:
+            check(store)
+            print(f"ok  {check.__name__}")
+
+
+if __name__ == "__main__":
+    main()
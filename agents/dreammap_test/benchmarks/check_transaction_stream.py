@@ -0,0 +1,105 @@
+"""
+Invariant checks for streamed transaction CSV parsing (assert-based).
+
+However the upload is split into reads (down to one byte at a time), plain and
+gzip input must give the same summary as parsing the whole text at once,
+including quoted fields with newlines, a UTF-8 BOM and a missing final newline.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.check_transaction_stream
+"""
+
+import gzip
+import io
+import math
+
+from tools.transaction_stream import CSVStreamParser, parse_csv_table, read_csv_table
+
+SAMPLE_CSV = (
+    "﻿Date,Category,Amount,Note\n"
+    "2024-01-03,Food,250.50,lunch\n"
+    '2024-01-15,Shopping,1200,"shoes, two pairs"\n'
+    '2024-02-01,Food,300,"dinner\nwith friends"\n'
+    "2024-02-09,Travel,not-a-number,refund pending\n"
+    ",Rent,15000,no date\n"
+    "2024-03-30,Food,99.5,last row"
+)
+CHUNK_SIZES = (1, 2, 3, 7, 64, 64 * 1024)
+
+
+def _same(a: dict, b: dict) -> bool:
+    if a.keys() != b.keys():
+        return False
+    for key in a:
+        x, y = a[key], b[key]
+        if isinstance(x, dict):
+            if x.keys() != y.keys() or not all(math.isclose(x[k], y[k]) for k in x):
+                return False
+        elif x != y and not math.isclose(x, y):
+            return False
+    return True
+
+
+def _feed(data: bytes, chunk: int) -> dict:
+    parser = CSVStreamParser()
+    for i in range(0, len(data), chunk):
+        parser.feed(data[i:i + chunk])
+    return parser.result()
+
+
+def check_reference_summary():
+    summary = parse_csv_table(io.StringIO(SAMPLE_CSV.lstrip("﻿"), newline="")).summary()
+    assert summary["transaction_count"] == 6
+    assert math.isclose(summary["total_spent"], 250.5 + 1200 + 300 + 15000 + 99.5)
+    assert summary["category_counts"] == {"Food": 3, "Shopping": 1, "Travel": 1, "Rent": 1}
+    assert "Travel" not in summary["categories"], "an unparsable amount must be counted but not summed"
+    assert set(summary["monthly_totals"]) == {"2024-01", "2024-02", "2024-03"}
+
+
+def check_any_split_plain_and_gzip():
+    reference = parse_csv_table(io.StringIO(SAMPLE_CSV.lstrip("﻿"), newline="")).summary()
+    raw = SAMPLE_CSV.encode("utf-8")
+    packed = gzip.compress(raw)
+    for chunk in CHUNK_SIZES:
+        assert _same(_feed(raw, chunk), reference), f"plain input split every {chunk} bytes"
+        assert _same(_feed(packed, chunk), reference), f"gzip input split every {chunk} bytes"
+        assert _same(read_csv_table(io.BytesIO(packed), chunk).summary(), reference)
+
+
+def check_tiny_and_empty_inputs():
+    assert _feed(b"", 1)["transaction_count"] == 0
+    # A one-byte upload never reaches the two bytes the gzip sniff waits for
+    assert _feed(b"x", 1)["transaction_count"] == 0
+    assert _feed(gzip.compress(b""), 1)["transaction_count"] == 0
+    header_only = b"category,amount,date\n"
+    assert _feed(gzip.compress(header_only), 1)["transaction_count"] == 0
+
+
+def check_malformed_is_value_error():
+    # Binary data and oversized fields are client errors, not server errors
+    for data in (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", b"category,amount\nFood," + b"9" * 200_000 + b"\n"):
+        parser = CSVStreamParser()
+        try:
+            parser.feed(data)
+            parser.result()
+        except ValueError:
+            continue
+        raise AssertionError(f"{data[:12]!r}... should be a ValueError")
+
+
+CHECKS = [
+    check_reference_summary,
+    check_any_split_plain_and_gzip,
+    check_tiny_and_empty_inputs,
+    check_malformed_is_value_error,
+]
+
+
+def main():
+    for check in CHECKS:
+        check()
+        print(f"ok  {check.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Held-out evaluation of the local dream classifier.
+
+Every 4th seed-corpus sentence per label is held out; the model is trained on
+the template definitions plus the rest. For a range of confidence thresholds it
+reports how many requests would skip the LLM and how accurate those local
+answers are.
+
+Run from agents/dreammap_test:
+    python -m benchmarks.eval_dream_classifier
+"""
+
+import time
+
+from tools.cost_engine import TEMPLATES
+from tools.dream_classifier import NaiveBayesDreamClassifier, load_seed_corpus, training_samples
+
+HOLDOUT_EVERY = 4
+
+
+def main():
+    corpus = load_seed_corpus()
+    train = {label: [t for i, t in enumerate(texts) if i % HOLDOUT_EVERY] for label, texts in corpus.items()}
+    held_out = [(t, label) for label, texts in corpus.items() for i, t in enumerate(texts) if not i % HOLDOUT_EVERY]
+
+    clf = NaiveBayesDreamClassifier().fit(training_samples(TEMPLATES, train))
+
+    start = time.perf_counter()
+    predictions = [(clf.predict(text), label) for text, label in held_out]
+    per_call_us = (time.perf_counter() - start) / len(held_out) * 1e6
+
+    overall = sum(pred == label for (pred, _), label in predictions) / len(predictions)
+    print(f"held-out samples: {len(held_out)}, overall accuracy: {overall:.1%}, {per_call_us:.0f} us/prediction")
+    print(f"{'threshold':>10} {'skip LLM':>10} {'accuracy when skipped':>22}")
+    for threshold in (0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9):
+        confident = [(pred, label) for (pred, conf), label in predictions if conf >= threshold]
+        skip = len(confident) / len(predictions)
+        acc = sum(p == l for p, l in confident) / len(confident) if confident else float("nan")
+        print(f"{threshold:>10.1f} {skip:>10.1%} {acc:>22.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
 import os
 import json
-import re
-from typing import Dict
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Sequence, Tuple, Union
 
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
 
+from core.deadline import current_budget
+from core.json_stream import FIELD, ITEM, JsonFieldStream
+from core.model_router import TASK_NARRATIVE, TASK_STRUCTURED_REPORT, generate_for_task, stream_for_task
 from core.models import DreamRoadmap
+from core.singleflight import SingleFlight, normalize_key_text
+from tools.goal_optimizer import optimize_goal_allocation
+from tools.goal_simulator import simulate_goals
 from tools.financial_tools import get_real_world_cost, parse_price_inr,calculate_opportunity_cost
 
 load_dotenv()
@@ -30,100 +35,38 @@ get_real_world_cost_tool = types.Tool(
     ]
 )
 
-# Initialize client (safe guard in case key missing)
-try:
-    client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-except Exception as e:
-    client = None
-    print(f"Warning: Gemini client init failed: {e}")
+# at top of core/agent.py add:
+from tools.cost_engine import classify_dream, cheap_classify
 
-def _safe_generate_content(*, model: str, contents, config):
-    """
-    Wrap model call to provide clearer errors when client is not initialized.
-    """
-    if client is None:
-        raise RuntimeError("GenAI client not initialized. Set GEMINI_API_KEY in env.")
-    return client.models.generate_content(model=model, contents=contents, config=config)
+_roadmap_flight = SingleFlight("generate_dynamic_roadmap")
 
-# at top of core/agent.py add:
-from tools.cost_engine import classify_dream, estimate_total_cost_with_ai, build_breakdown_from_template
+# Start the roadmap generation from the zero-latency local category while the
+# full classification runs; the speculative result is discarded if they disagree.
+SPECULATIVE_ROADMAP = os.environ.get("SPECULATIVE_ROADMAP", "1") == "1"
 
-def generate_dynamic_roadmap(
-    dream_text: str, 
-    estimated_budget: float,
-    user_income: float, 
-    target_months: int
-) -> DreamRoadmap:
-    """
-    Enhanced AI processing: Brutally honest, realistic roadmap with detailed action plans.
-    Handles unrealistic dreams and provides proper guidance.
-    
-    Args:
-        dream_text: User's goal description
-        estimated_budget: User's budget estimate in INR
-        user_income: Monthly income in INR
-        target_months: Timeline to achieve the dream
-    
-    Returns:
-        DreamRoadmap with honest assessment and actionable steps
-    """
-    model_name = "gemini-2.0-flash-exp"
+# Roadmaps generated at once for a single /api/dream-map/batch request
+BATCH_CONCURRENCY = int(os.environ.get("DREAM_BATCH_CONCURRENCY", "4"))
+_speculation_stats = {"speculated": 0, "accepted": 0, "discarded": 0}
 
-    if not os.environ.get("GEMINI_API_KEY"):
-        return DreamRoadmap(
-            dreamType="unknown",
-            isRealistic=False,
-            realityCheck="AI unavailable - cannot assess feasibility",
-            estimatedCost=estimated_budget,
-            userBudget=estimated_budget,
-            budgetGap=0,
-            months=target_months,
-            monthlySaving=estimated_budget / target_months,
-            savingPercentage=0.0,
-            feasibilityScore=5,
-            actionPlan=["AI unavailable — fallback activated"],
-            challenges=["Cannot assess without AI"],
-            proTips=["Configure API key to get detailed guidance"]
-        )
 
-    # --- STEP 1: Get real-world cost estimate ---
-    dream_type, _ = classify_dream(dream_text)
-    cost_response = get_real_world_cost(dream_text, "Mumbai, India")
-    estimated_cost = parse_price_inr(cost_response)
-    if estimated_cost <= 0:
-        estimated_cost = estimated_budget * 1.2  # Assume 20% higher than budget
+def speculation_stats() -> Dict[str, int]:
+    return dict(_speculation_stats)
 
-    # Calculate financial metrics
-    budget_gap = estimated_cost - estimated_budget
-    monthly_saving = round(estimated_cost / target_months, 2)
-    saving_percentage = round((monthly_saving / user_income) * 100, 2) if user_income > 0 else 0.0
-    
-    # Determine if realistic
-    is_realistic = (
-        estimated_budget >= estimated_cost * 0.8 and  # Budget is at least 80% of cost
-        saving_percentage <= 50 and  # Not requiring more than 50% of income
-        target_months >= 1
-    )
-    
-    # Calculate feasibility score (1-10)
-    feasibility_score = 10
-    if budget_gap > estimated_cost * 0.5:
-        feasibility_score -= 4
-    elif budget_gap > estimated_cost * 0.2:
-        feasibility_score -= 2
-    
-    if saving_percentage > 50:
-        feasibility_score -= 3
-    elif saving_percentage > 30:
-        feasibility_score -= 1
-    
-    if target_months < 3:
-        feasibility_score -= 2
-    
-    feasibility_score = max(1, min(10, feasibility_score))
 
-    # --- STEP 2: Generate brutally honest, detailed roadmap with AI ---
-    prompt = f"""
+def _build_roadmap_prompt(
+    dream_text: str,
+    dream_type: str,
+    estimated_budget: float,
+    estimated_cost: float,
+    budget_gap: float,
+    user_income: float,
+    target_months: int,
+    monthly_saving: float,
+    saving_percentage: float,
+    is_realistic: bool
+) -> str:
+    """Prompt for the brutally honest, detailed roadmap generation."""
+    return f"""
 You are a brutally honest financial advisor. Analyze this dream and provide REALISTIC, ACTIONABLE guidance.
 
 **User's Dream:** {dream_text}
@@ -196,104 +139,428 @@ Return a JSON object with:
 - Consider Indian market context (Mumbai/India)
 """
 
-    try:
-        # **CRITICAL FIX:** Use positional argument for types.Part.from_text
-        response = _safe_generate_content(
-            model=model_name,
-            contents=[types.Content(role="user", parts=[types.Part.from_text(text=prompt)])],
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=0.8
-            ),
+
+async def _request_roadmap_sections(prompt: str) -> Dict:
+    """One LLM round-trip returning the parsed realityCheck/actionPlan/... JSON."""
+    # **CRITICAL FIX:** Use positional argument for types.Part.from_text
+    response_text = await generate_for_task(
+        TASK_STRUCTURED_REPORT,
+        contents=[types.Content(role="user", parts=[types.Part.from_text(text=prompt)])],
+        config=types.GenerateContentConfig(response_mime_type="application/json", temperature=0.8),
+    )
+    return json.loads(response_text)
+
+
+async def generate_dynamic_roadmap(
+    dream_text: str, 
+    estimated_budget: float,
+    user_income: float, 
+    target_months: int
+) -> DreamRoadmap:
+    """
+    Coalescing entry point: identical in-flight requests (same dream text, budget,
+    income and timeline) share a single roadmap generation.
+    """
+    key = (normalize_key_text(dream_text), estimated_budget, user_income, target_months)
+    return await _roadmap_flight.do(
+        key,
+        lambda: _generate_dynamic_roadmap(dream_text, estimated_budget, user_income, target_months),
+        on_timeout=lambda: fast_dynamic_roadmap(dream_text, estimated_budget, user_income, target_months),
+    )
+
+
+async def generate_dynamic_roadmaps(
+    dreams: Sequence[Tuple[str, float, float, int]],
+    max_concurrency: int = BATCH_CONCURRENCY
+) -> Tuple[List[Union[DreamRoadmap, Exception]], int]:
+    """
+    Generate roadmaps for (dream_text, estimated_budget, user_income, target_months)
+    tuples. Identical dreams (same normalized text and numbers) are generated once,
+    at most `max_concurrency` generations run at a time, and results come back in
+    input order - an Exception in place of a roadmap for items that failed.
+
+    Returns (results, number_of_unique_generations).
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    unique: Dict[Tuple, "asyncio.Future"] = {}
+
+    async def run(dream_text, estimated_budget, user_income, target_months):
+        async with semaphore:
+            return await generate_dynamic_roadmap(dream_text, estimated_budget, user_income, target_months)
+
+    keys = []
+    for dream_text, estimated_budget, user_income, target_months in dreams:
+        key = (normalize_key_text(dream_text), estimated_budget, user_income, target_months)
+        if key not in unique:
+            unique[key] = asyncio.ensure_future(run(dream_text, estimated_budget, user_income, target_months))
+        keys.append(key)
+
+    await asyncio.gather(*unique.values(), return_exceptions=True)
+    results = []
+    for key in keys:
+        task = unique[key]
+        # exception()/result() would raise on a cancelled task, so report it in its slot
+        if task.cancelled():
+            results.append(asyncio.CancelledError("roadmap generation was cancelled"))
+        elif task.exception() is not None:
+            results.append(task.exception())
+        else:
+            results.append(task.result())
+    return results, len(unique)
+
+
+def simulate_dream_goal_impact(
+    roadmap: DreamRoadmap,
+    existing_goals: List[Dict[str, Any]],
+    monthly_savings: float,
+    strategy: str = "priority"
+) -> List[Dict[str, Any]]:
+    """
+    Simulate the dream alongside the user's existing goals, all drawing on the
+    same monthly savings. The dream is funded last under priority allocation.
+    """
+    dream_goal = {
+        "name": roadmap.dreamType,
+        "target_amount": roadmap.estimatedCost,
+        "deadline_months": roadmap.months,
+        "priority": max([g.get("priority") or 0 for g in existing_goals] + [len(existing_goals)]) + 1,
+    }
+    horizon = max([roadmap.months] + [int(g.get("deadline_months", 0)) for g in existing_goals]) * 2
+    return simulate_goals(list(existing_goals) + [dream_goal], monthly_savings, horizon, strategy)
+
+
+def plan_goal_allocation(
+    goals: List[Dict[str, Any]],
+    user_income: float,
+    fixed_expenses: float,
+    objective: str = "max_on_time"
+) -> Dict[str, Any]:
+    """
+    Fit several dreams into one income: each goal gets its standalone roadmap
+    feasibility (compute_roadmap_metrics), then the optimizer orders and
+    schedules them against income minus fixed expenses.
+    """
+    plan = optimize_goal_allocation(goals, user_income, fixed_expenses, objective)
+    combined = 0.0
+    for goal in plan["goals"]:
+        remaining = goal["target_amount"] - goal["saved_amount"]
+        metrics = compute_roadmap_metrics(remaining, remaining, user_income, max(1, goal["deadline_months"]))
+        goal["standalone"] = {
+            "monthlySaving": metrics["monthlySaving"],
+            "savingPercentage": metrics["savingPercentage"],
+            "feasibilityScore": metrics["feasibilityScore"],
+            "isRealistic": metrics["isRealistic"],
+        }
+        combined += metrics["monthlySaving"]
+    plan["combined_monthly_saving"] = round(combined, 2)
+    plan["fits_together"] = combined <= plan["monthly_capacity"]
+    return plan
+
+
+def compute_roadmap_metrics(
+    estimated_cost: float,
+    estimated_budget: float,
+    user_income: float,
+    target_months: int
+) -> Dict:
+    """
+    Local feasibility math for a dream (no LLM). Keys match DreamRoadmap fields.
+    """
+    # Calculate financial metrics
+    budget_gap = estimated_cost - estimated_budget
+    monthly_saving = round(estimated_cost / target_months, 2)
+    saving_percentage = round((monthly_saving / user_income) * 100, 2) if user_income > 0 else 0.0
+    
+    # Determine if realistic
+    is_realistic = (
+        estimated_budget >= estimated_cost * 0.8 and  # Budget is at least 80% of cost
+        saving_percentage <= 50 and  # Not requiring more than 50% of income
+        target_months >= 1
+    )
+    
+    # Calculate feasibility score (1-10)
+    feasibility_score = 10
+    if budget_gap > estimated_cost * 0.5:
+        feasibility_score -= 4
+    elif budget_gap > estimated_cost * 0.2:
+        feasibility_score -= 2
+    
+    if saving_percentage > 50:
+        feasibility_score -= 3
+    elif saving_percentage > 30:
+        feasibility_score -= 1
+    
+    if target_months < 3:
+        feasibility_score -= 2
+    
+    feasibility_score = max(1, min(10, feasibility_score))
+
+    return {
+        "isRealistic": is_realistic,
+        "estimatedCost": estimated_cost,
+        "userBudget": estimated_budget,
+        "budgetGap": budget_gap,
+        "months": target_months,
+        "monthlySaving": monthly_saving,
+        "savingPercentage": saving_percentage,
+        "feasibilityScore": feasibility_score,
+    }
+
+
+def estimate_dream_cost(dream_text: str, estimated_budget: float) -> float:
+    """Real-world cost estimate for the dream, or budget + 20% when none is found."""
+    cost_response = get_real_world_cost(dream_text, "Mumbai, India")
+    estimated_cost = parse_price_inr(cost_response)
+    if estimated_cost <= 0:
+        estimated_cost = estimated_budget * 1.2  # Assume 20% higher than budget
+    return estimated_cost
+
+
+def _unavailable_roadmap(estimated_budget: float, target_months: int) -> DreamRoadmap:
+    return DreamRoadmap(
+        dreamType="unknown",
+        isRealistic=False,
+        realityCheck="AI unavailable - cannot assess feasibility",
+        estimatedCost=estimated_budget,
+        userBudget=estimated_budget,
+        budgetGap=0,
+        months=target_months,
+        monthlySaving=estimated_budget / target_months,
+        savingPercentage=0.0,
+        feasibilityScore=5,
+        actionPlan=["AI unavailable — fallback activated"],
+        challenges=["Cannot assess without AI"],
+        proTips=["Configure API key to get detailed guidance"]
+    )
+
+
+def _prompt_for(dream_text: str, dream_type: str, metrics: Dict, user_income: float) -> str:
+    return _build_roadmap_prompt(
+        dream_text, dream_type, metrics["userBudget"], metrics["estimatedCost"], metrics["budgetGap"],
+        user_income, metrics["months"], metrics["monthlySaving"], metrics["savingPercentage"],
+        metrics["isRealistic"]
+    )
+
+
+def _roadmap_from_sections(dream_type: str, metrics: Dict, ai_response: Dict) -> DreamRoadmap:
+    return DreamRoadmap(
+        dreamType=dream_type,
+        realityCheck=ai_response.get("realityCheck", "Assessment completed"),
+        actionPlan=ai_response.get("actionPlan", ["Plan generation failed"]),
+        challenges=ai_response.get("challenges", ["Assessment needed"]),
+        alternatives=ai_response.get("alternatives") if not metrics["isRealistic"] else None,
+        proTips=ai_response.get("proTips", ["Tips unavailable"]),
+        **metrics
+    )
+
+
+def _fallback_roadmap(dream_type: str, metrics: Dict) -> DreamRoadmap:
+    """Non-LLM roadmap built purely from the calculated insights."""
+    estimated_budget = metrics["userBudget"]
+    estimated_cost = metrics["estimatedCost"]
+    budget_gap = metrics["budgetGap"]
+    target_months = metrics["months"]
+    monthly_saving = metrics["monthlySaving"]
+    saving_percentage = metrics["savingPercentage"]
+    is_realistic = metrics["isRealistic"]
+
+    # Generate fallback with calculated insights
+    reality_check = ""
+    if budget_gap > estimated_cost * 0.3:
+        reality_check = f"REALITY CHECK: Your budget of ₹{estimated_budget:,.0f} is ₹{budget_gap:,.0f} short. Real cost is ₹{estimated_cost:,.0f}. This needs serious reconsideration."
+    elif saving_percentage > 40:
+        reality_check = f"CHALLENGING: Saving ₹{monthly_saving:,.0f}/month ({saving_percentage:.1f}% of income) is very aggressive. Most experts recommend max 30-40%."
+    else:
+        reality_check = f"ACHIEVABLE: Budget is close to real cost. Saving {saving_percentage:.1f}% of income is manageable with discipline."
+    
+    action_plan = [
+        f"Month 1: Research {dream_type} options. Set target: ₹{estimated_cost:,.0f}. Create dedicated savings account.",
+        f"Month 1-2: Analyze current spending. Identify ₹{monthly_saving:,.0f}/month to cut. Set up auto-transfer.",
+        f"Month 2-{target_months//2}: Save consistently. Track weekly. Adjust if needed. Target: ₹{estimated_cost/2:,.0f}.",
+        f"Month {target_months//2}: Review progress. Research current market prices. Adjust plan if prices changed.",
+        f"Month {target_months//2+1}-{target_months-1}: Continue saving. Start comparing specific options and deals.",
+        f"Month {target_months-1}: Finalize choice. Negotiate price. Ensure all costs included (taxes, fees, etc.).",
+        f"Month {target_months}: Complete purchase. Keep emergency buffer of ₹{monthly_saving*2:,.0f} for unexpected costs."
+    ]
+    
+    challenges = [
+        f"Maintaining ₹{monthly_saving:,.0f}/month savings discipline for {target_months} months",
+        f"Budget gap of ₹{abs(budget_gap):,.0f} between estimate and reality" if budget_gap > 0 else "Staying within budget despite market fluctuations",
+        "Unexpected expenses disrupting savings plan",
+        "Temptation to compromise on quality to meet budget",
+        f"Price increases during {target_months}-month timeline"
+    ]
+    
+    alternatives = None
+    if not is_realistic:
+        alternatives = [
+            f"Extend timeline to {int(target_months * 1.5)} months to reduce monthly saving to ₹{estimated_cost/(target_months*1.5):,.0f}",
+            f"Increase budget to ₹{estimated_cost:,.0f} (real market cost)",
+            f"Consider used/refurbished options to save 20-30%",
+            "Start with basic version, upgrade later"
+        ]
+    
+    pro_tips = [
+        f"Research {dream_type} prices across 5+ sources before committing",
+        "Negotiate - most sellers have 5-10% flexibility",
+        "Buy during sale seasons (festival periods, year-end) for discounts",
+        "Check total cost including taxes, registration, insurance, etc.",
+        "Keep 10-15% buffer for unexpected costs"
+    ]
+    
+    return DreamRoadmap(
+        dreamType=dream_type,
+        realityCheck=reality_check,
+        actionPlan=action_plan,
+        challenges=challenges[:6],
+        alternatives=alternatives,
+        proTips=pro_tips,
+        **metrics
+    )
+
+
+async def _generate_dynamic_roadmap(
+    dream_text: str, 
+    estimated_budget: float,
+    user_income: float, 
+    target_months: int
+) -> DreamRoadmap:
+    """
+    Enhanced AI processing: Brutally honest, realistic roadmap with detailed action plans.
+    Handles unrealistic dreams and provides proper guidance.
+    
+    Args:
+        dream_text: User's goal description
+        estimated_budget: User's budget estimate in INR
+        user_income: Monthly income in INR
+        target_months: Timeline to achieve the dream
+    
+    Returns:
+        DreamRoadmap with honest assessment and actionable steps
+    """
+    if not os.environ.get("GEMINI_API_KEY"):
+        return _unavailable_roadmap(estimated_budget, target_months)
+
+    # --- STEP 1: Classify (LLM only if the local model is unsure) and get real-world cost estimate ---
+    speculative_type = cheap_classify(dream_text) if SPECULATIVE_ROADMAP else None
+    classify_task = asyncio.ensure_future(classify_dream(dream_text))
+    if speculative_type is None:
+        dream_type, _ = await classify_task
+    estimated_cost = estimate_dream_cost(dream_text, estimated_budget)
+    metrics = compute_roadmap_metrics(estimated_cost, estimated_budget, user_income, target_months)
+
+    # --- STEP 2: Generate brutally honest, detailed roadmap with AI ---
+    roadmap_task = None
+    if speculative_type is not None:
+        _speculation_stats["speculated"] += 1
+        roadmap_task = asyncio.ensure_future(
+            _request_roadmap_sections(_prompt_for(dream_text, speculative_type, metrics, user_income))
         )
+        # A discarded speculation may still fail later; don't let that go unretrieved
+        roadmap_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        dream_type, _ = await classify_task
+
+    try:
+        if roadmap_task is not None and dream_type == speculative_type:
+            _speculation_stats["accepted"] += 1
+            ai_response = await roadmap_task
+        else:
+            if roadmap_task is not None:
+                _speculation_stats["discarded"] += 1
+                roadmap_task.cancel()
+            ai_response = await _request_roadmap_sections(
+                _prompt_for(dream_text, dream_type, metrics, user_income)
+            )
         
-        ai_response = json.loads(response.text)
-        
-        return DreamRoadmap(
-            dreamType=dream_type,
-            isRealistic=is_realistic,
-            realityCheck=ai_response.get("realityCheck", "Assessment completed"),
-            estimatedCost=estimated_cost,
-            userBudget=estimated_budget,
-            budgetGap=budget_gap,
-            months=target_months,
-            monthlySaving=monthly_saving,
-            savingPercentage=saving_percentage,
-            feasibilityScore=feasibility_score,
-            actionPlan=ai_response.get("actionPlan", ["Plan generation failed"]),
-            challenges=ai_response.get("challenges", ["Assessment needed"]),
-            alternatives=ai_response.get("alternatives") if not is_realistic else None,
-            proTips=ai_response.get("proTips", ["Tips unavailable"])
-        )
+        return _roadmap_from_sections(dream_type, metrics, ai_response)
         
     except Exception as e:
         print(f"Roadmap generation failed: {e}")
-        
-        # Generate fallback with calculated insights
-        reality_check = ""
-        if budget_gap > estimated_cost * 0.3:
-            reality_check = f"REALITY CHECK: Your budget of ₹{estimated_budget:,.0f} is ₹{budget_gap:,.0f} short. Real cost is ₹{estimated_cost:,.0f}. This needs serious reconsideration."
-        elif saving_percentage > 40:
-            reality_check = f"CHALLENGING: Saving ₹{monthly_saving:,.0f}/month ({saving_percentage:.1f}% of income) is very aggressive. Most experts recommend max 30-40%."
-        else:
-            reality_check = f"ACHIEVABLE: Budget is close to real cost. Saving {saving_percentage:.1f}% of income is manageable with discipline."
-        
-        action_plan = [
-            f"Month 1: Research {dream_type} options. Set target: ₹{estimated_cost:,.0f}. Create dedicated savings account.",
-            f"Month 1-2: Analyze current spending. Identify ₹{monthly_saving:,.0f}/month to cut. Set up auto-transfer.",
-            f"Month 2-{target_months//2}: Save consistently. Track weekly. Adjust if needed. Target: ₹{estimated_cost/2:,.0f}.",
-            f"Month {target_months//2}: Review progress. Research current market prices. Adjust plan if prices changed.",
-            f"Month {target_months//2+1}-{target_months-1}: Continue saving. Start comparing specific options and deals.",
-            f"Month {target_months-1}: Finalize choice. Negotiate price. Ensure all costs included (taxes, fees, etc.).",
-            f"Month {target_months}: Complete purchase. Keep emergency buffer of ₹{monthly_saving*2:,.0f} for unexpected costs."
-        ]
-        
-        challenges = [
-            f"Maintaining ₹{monthly_saving:,.0f}/month savings discipline for {target_months} months",
-            f"Budget gap of ₹{abs(budget_gap):,.0f} between estimate and reality" if budget_gap > 0 else "Staying within budget despite market fluctuations",
-            "Unexpected expenses disrupting savings plan",
-            "Temptation to compromise on quality to meet budget",
-            f"Price increases during {target_months}-month timeline"
-        ]
-        
-        alternatives = None
-        if not is_realistic:
-            alternatives = [
-                f"Extend timeline to {int(target_months * 1.5)} months to reduce monthly saving to ₹{estimated_cost/(target_months*1.5):,.0f}",
-                f"Increase budget to ₹{estimated_cost:,.0f} (real market cost)",
-                f"Consider used/refurbished options to save 20-30%",
-                "Start with basic version, upgrade later"
-            ]
-        
-        pro_tips = [
-            f"Research {dream_type} prices across 5+ sources before committing",
-            "Negotiate - most sellers have 5-10% flexibility",
-            "Buy during sale seasons (festival periods, year-end) for discounts",
-            "Check total cost including taxes, registration, insurance, etc.",
-            "Keep 10-15% buffer for unexpected costs"
-        ]
-        
-        return DreamRoadmap(
-            dreamType=dream_type,
-            isRealistic=is_realistic,
-            realityCheck=reality_check,
-            estimatedCost=estimated_cost,
-            userBudget=estimated_budget,
-            budgetGap=budget_gap,
-            months=target_months,
-            monthlySaving=monthly_saving,
-            savingPercentage=saving_percentage,
-            feasibilityScore=feasibility_score,
-            actionPlan=action_plan,
-            challenges=challenges[:6],
-            alternatives=alternatives,
-            proTips=pro_tips
-        )
+        return _fallback_roadmap(dream_type, metrics)
+
+
+def fast_dynamic_roadmap(
+    dream_text: str,
+    estimated_budget: float,
+    user_income: float,
+    target_months: int
+) -> DreamRoadmap:
+    """
+    Deterministic roadmap (mode=fast): local classification, the feasibility
+    math and the templated fallback narrative. No LLM call, no API key needed.
+    """
+    estimated_cost = estimate_dream_cost(dream_text, estimated_budget)
+    metrics = compute_roadmap_metrics(estimated_cost, estimated_budget, user_income, target_months)
+    return _fallback_roadmap(cheap_classify(dream_text), metrics)
+
+
+# Roadmap sections streamed element by element, in the order the prompt asks for them
+STREAMED_LIST_FIELDS = ("actionPlan", "challenges", "alternatives", "proTips")
+
+
+async def stream_dynamic_roadmap(
+    dream_text: str,
+    estimated_budget: float,
+    user_income: float,
+    target_months: int
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of generate_dynamic_roadmap.
+
+    Yields {"event": ..., "data": ...} dicts: "metrics" first (computed locally,
+    before any LLM call), then "dreamType", then "realityCheck" and one event per
+    actionPlan/challenges/alternatives/proTips element as they are parsed from the
+    streamed generation, and finally "roadmap" with the complete DreamRoadmap.
+    If the generation fails part-way, the final roadmap is the calculated fallback;
+    when that happens because the request deadline ran out, a "degraded" event
+    precedes it.
+    """
+    if not os.environ.get("GEMINI_API_KEY"):
+        yield {"event": "roadmap", "data": _unavailable_roadmap(estimated_budget, target_months).model_dump()}
+        return
+
+    estimated_cost = estimate_dream_cost(dream_text, estimated_budget)
+    metrics = compute_roadmap_metrics(estimated_cost, estimated_budget, user_income, target_months)
+    yield {"event": "metrics", "data": metrics}
+
+    dream_type, _ = await classify_dream(dream_text)
+    yield {"event": "dreamType", "data": dream_type}
+
+    sections: Dict[str, Any] = {}
+    parser = JsonFieldStream()
+    try:
+        async for chunk in stream_for_task(
+            TASK_STRUCTURED_REPORT,
+            contents=[types.Content(role="user", parts=[types.Part.from_text(
+                text=_prompt_for(dream_text, dream_type, metrics, user_income)
+            )])],
+            config=types.GenerateContentConfig(response_mime_type="application/json", temperature=0.8),
+        ):
+            for kind, key, value in parser.feed(chunk):
+                if kind == FIELD:
+                    sections[key] = value
+                    if key == "realityCheck":
+                        yield {"event": "realityCheck", "data": value}
+                elif kind == ITEM and key in STREAMED_LIST_FIELDS:
+                    if key == "alternatives" and metrics["isRealistic"]:
+                        continue
+                    yield {"event": key, "data": value}
+        roadmap = _roadmap_from_sections(dream_type, metrics, sections)
+    except Exception as e:
+        print(f"Streamed roadmap generation failed: {e}")
+        roadmap = _fallback_roadmap(dream_type, metrics)
+        budget = current_budget()
+        if budget is not None and budget.degraded:
+            yield {"event": "degraded", "data": budget.degraded}
+
+    yield {"event": "roadmap", "data": roadmap.model_dump()}
+
+
 
 
 
 
-def orchestrate_opportunity_cost(purchase_item: str,purchase_cost: float, user_hourly_wage: float) -> str:
+async def orchestrate_opportunity_cost(purchase_item: str,purchase_cost: float, user_hourly_wage: float) -> str:
     """
     Runs the Opportunity Cost Visualizer agent: calculates costs and generates the message.
     """
@@ -336,10 +603,10 @@ def orchestrate_opportunity_cost(purchase_item: str,purchase_cost: float, user_h
         "Conclude with a specific, actionable challenge (e.g., 'Wait 72 hours and move 50% of the cost into your GoalAura savings account for now')."
     )
     
-    response = client.models.generate_content(
-        model="gemini-2.5-pro", # Faster model for quick response
+    response_text = await generate_for_task(
+        TASK_NARRATIVE,
         contents=[types.Content(role="user", parts=[types.Part.from_text(text=prompt)])],
         config=types.GenerateContentConfig(system_instruction=system_instruction)
     )
     
-    return response.text
+    return response_text
@@ -0,0 +1,152 @@
+"""
+Per-model circuit breakers for the LLM gateway.
+
+Each breaker watches a rolling window of recent calls to one model. A call
+counts as a failure when it raises or takes longer than `slow_call_s`. When the
+failure rate over at least `min_calls` calls reaches `failure_threshold`, the
+breaker opens and the gateway sends that model's traffic to its fallback model.
+After `open_s` the breaker goes half-open and lets a single probe call through:
+success closes it (primary restored), failure re-opens it. allow() tells the
+caller whether its call is the probe, and only the probe's outcome can move the
+breaker out of half-open.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import httpx
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# What allow() admitted: an ordinary call, or the single half-open probe
+CALL = "call"
+PROBE = "probe"
+
+# HTTP codes that mean "this model is out of quota or struggling right now"
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """True for quota / overload / timeout errors worth retrying on another model."""
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TimeoutException, httpx.TransportError)):
+        return True
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if code is None:
+        response = getattr(exc, "response", None)
+        code = getattr(response, "status_code", None)
+    return code in RETRYABLE_STATUS_CODES
+
+
+class CircuitBreaker:
+    """Error-rate and latency breaker for one model."""
+
+    def __init__(
+        self,
+        model: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_threshold: float = 0.5,
+        slow_call_s: float = 30.0,
+        open_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.model = model
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.slow_call_s = slow_call_s
+        self.open_s = open_s
+        self._clock = clock
+        self._outcomes: deque = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._stats = {"opened": 0, "probes": 0, "slow_calls": 0, "short_circuited": 0}
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_s:
+            self._state = HALF_OPEN
+        return self._state
+
+    def allow(self) -> Optional[str]:
+        """
+        Whether a call may go to this model now: None if not, else CALL or PROBE
+        (in half-open, one probe at a time). Pass the result back to record()/release().
+        """
+        state = self.state
+        if state == CLOSED:
+            return CALL
+        if state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            self._stats["probes"] += 1
+            return PROBE
+        self._stats["short_circuited"] += 1
+        return None
+
+    def record(self, ok: bool, latency_s: float, admission: str = CALL):
+        """Report the outcome of a call that allow() admitted as `admission`."""
+        slow = latency_s > self.slow_call_s
+        if slow:
+            self._stats["slow_calls"] += 1
+        failed = not ok or slow
+
+        if admission == PROBE:
+            self._probe_in_flight = False
+            if failed:
+                self._trip()
+            else:
+                self._state = CLOSED
+                self._outcomes.clear()
+            return
+
+        # A call admitted while closed that finishes after the breaker opened says
+        # nothing about the probe; only the closed state keeps a window
+        if self._state != CLOSED:
+            return
+        self._outcomes.append(failed)
+        if len(self._outcomes) >= self.min_calls:
+            if sum(self._outcomes) / len(self._outcomes) >= self.failure_threshold:
+                self._trip()
+
+    def release(self, admission: str = CALL):
+        """Give back an admitted call without an outcome (e.g. the caller was cancelled)."""
+        if admission == PROBE:
+            self._probe_in_flight = False
+
+    def _trip(self):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self._stats["opened"] += 1
+
+    def stats(self) -> Dict[str, object]:
+        recent = len(self._outcomes)
+        return {
+            "state": self.state,
+            "recent_calls": recent,
+            "recent_failure_rate": round(sum(self._outcomes) / recent, 3) if recent else 0.0,
+            **self._stats,
+        }
+
+
+class BreakerRegistry:
+    """Creates one breaker per model on first use, with optional per-model settings."""
+
+    def __init__(self, overrides: Optional[Dict[str, Dict]] = None, **defaults):
+        self.overrides = overrides or {}
+        self.defaults = defaults
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, model: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = CircuitBreaker(model, **{**self.defaults, **self.overrides.get(model, {})})
+            self._breakers[model] = breaker
+        return breaker
+
+    def stats(self) -> Dict[str, Dict]:
+        return {m: b.stats() for m, b in self._breakers.items()}
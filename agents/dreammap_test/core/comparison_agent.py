@@ -5,28 +5,15 @@ from io import StringIO
 from typing import Dict, List, Tuple
 
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
 
+from core.model_router import TASK_STRUCTURED_REPORT, generate_for_task
 from core.models import UserComparisonInsights
+from tools.transaction_engine import TransactionTable
+from tools.transaction_stream import aggregate_csv_lines
 
 load_dotenv()
 
-# Initialize client
-try:
-    client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-except Exception as e:
-    client = None
-    print(f"Warning: Gemini client init failed: {e}")
-
-
-def _safe_generate_content(*, model: str, contents, config):
-    """Wrap model call to provide clearer errors when client is not initialized."""
-    if client is None:
-        raise RuntimeError("GenAI client not initialized. Set GEMINI_API_KEY in env.")
-    return client.models.generate_content(model=model, contents=contents, config=config)
-
-
 def parse_user_info(user_info: str) -> Dict[str, str]:
     """Parse user info string in format 'job_salary_savings'."""
     parts = user_info.split('_')
@@ -52,29 +39,25 @@ def parse_csv_transactions(csv_string: str) -> List[Dict]:
         return []
 
 
+def analyze_csv_transactions(csv_string: str) -> Dict:
+    """Aggregate a CSV string row by row, without building a list of row dicts."""
+    return aggregate_csv_lines(StringIO(csv_string))
+
+
 def analyze_transactions(transactions: List[Dict]) -> Dict:
-    """Analyze transaction patterns to extract spending categories and amounts."""
-    categories = {}
-    total_spent = 0.0
-    
-    for txn in transactions:
-        # Assuming CSV has 'category' and 'amount' fields
-        category = txn.get('category', 'Other')
-        try:
-            amount = float(txn.get('amount', 0))
-            total_spent += amount
-            categories[category] = categories.get(category, 0) + amount
-        except ValueError:
-            continue
-    
-    return {
-        "total_spent": total_spent,
-        "categories": categories,
-        "transaction_count": len(transactions)
-    }
+    """
+    Analyze transaction patterns: total and per-category spend, transaction count,
+    monthly totals and per-category counts/medians (columnar, see TransactionTable).
+    """
+    return TransactionTable.from_dicts(transactions).summary()
+
 
+def _latest_months(analysis: Dict, months: int = 12) -> Dict[str, float]:
+    monthly = analysis.get("monthly_totals") or {}
+    return {m: round(monthly[m], 2) for m in sorted(monthly)[-months:]}
 
-def generate_comparison_insights(
+
+async def generate_comparison_insights(
     current_user_info: str,
     other_user_info: str,
     current_user_transactions: str,
@@ -92,8 +75,24 @@ def generate_comparison_insights(
     Returns:
         UserComparisonInsights with detailed analysis and recommendations
     """
-    model_name = "gemini-2.0-flash-exp"
-    
+    return await generate_comparison_insights_from_analyses(
+        current_user_info,
+        other_user_info,
+        analyze_csv_transactions(current_user_transactions),
+        analyze_csv_transactions(other_user_transactions)
+    )
+
+
+async def generate_comparison_insights_from_analyses(
+    current_user_info: str,
+    other_user_info: str,
+    current_analysis: Dict,
+    other_analysis: Dict
+) -> UserComparisonInsights:
+    """
+    generate_comparison_insights for transactions that are already aggregated
+    (e.g. streamed uploads); each analysis is shaped like analyze_transactions().
+    """
     if not os.environ.get("GEMINI_API_KEY"):
         return UserComparisonInsights(
             summary="AI unavailable - fallback mode",
@@ -112,13 +111,6 @@ def generate_comparison_insights(
     except ValueError as e:
         raise ValueError(f"Invalid user info format: {e}")
     
-    # Parse and analyze transactions
-    current_txns = parse_csv_transactions(current_user_transactions)
-    other_txns = parse_csv_transactions(other_user_transactions)
-    
-    current_analysis = analyze_transactions(current_txns)
-    other_analysis = analyze_transactions(other_txns)
-    
     # Calculate detailed metrics for data-driven insights
     current_savings_rate = (float(current_user['savings']) / float(current_user['salary'])) * 100 if float(current_user['salary']) > 0 else 0
     other_savings_rate = (float(other_user['savings']) / float(other_user['salary'])) * 100 if float(other_user['salary']) > 0 else 0
@@ -138,6 +130,7 @@ You are a data-driven financial advisor analyzing two users with similar income
 - Total Spent (analyzed period): ₹{current_analysis['total_spent']}
 - Spending by Category: {json.dumps(current_analysis['categories'], indent=2)}
 - Number of Transactions: {current_analysis['transaction_count']}
+- Monthly Spend (latest 12 months): {json.dumps(_latest_months(current_analysis))}
 
 **Comparison User Profile:**
 - Job: {other_user['job']}
@@ -147,6 +140,7 @@ You are a data-driven financial advisor analyzing two users with similar income
 - Total Spent (analyzed period): ₹{other_analysis['total_spent']}
 - Spending by Category: {json.dumps(other_analysis['categories'], indent=2)}
 - Number of Transactions: {other_analysis['transaction_count']}
+- Monthly Spend (latest 12 months): {json.dumps(_latest_months(other_analysis))}
 
 **Key Metrics:**
 - Current user spends {spending_diff_pct:+.1f}% more/less than comparison user
@@ -191,16 +185,14 @@ CRITICAL: Every insight must include specific rupee amounts, percentages, or qua
 """
     
     try:
-        response = _safe_generate_content(
-            model=model_name,
+        response_text = await generate_for_task(
+            TASK_STRUCTURED_REPORT,
             contents=[types.Content(role="user", parts=[types.Part.from_text(text=prompt)])],
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=0.7
-            ),
+            config=types.GenerateContentConfig(response_mime_type="application/json", temperature=0.7),
+            cache=True,
         )
         
-        insights_data = json.loads(response.text)
+        insights_data = json.loads(response_text)
         
         # Validate and create response
         return UserComparisonInsights(
@@ -215,62 +207,107 @@ CRITICAL: Every insight must include specific rupee amounts, percentages, or qua
         
     except Exception as e:
         print(f"Error generating comparison insights: {e}")
-        
-        # Calculate metrics for fallback
-        current_savings_rate = (float(current_user['savings']) / float(current_user['salary'])) * 100
-        other_savings_rate = (float(other_user['savings']) / float(other_user['salary'])) * 100
-        spending_diff = current_analysis['total_spent'] - other_analysis['total_spent']
-        savings_gap = float(other_user['savings']) - float(current_user['savings'])
-        
-        # Generate data-driven fallback insights
-        spending_patterns = []
-        recommendations = []
-        unnecessary_expenses = []
-        
-        # Compare spending by category
-        for category, amount in current_analysis['categories'].items():
-            other_amount = other_analysis['categories'].get(category, 0)
-            if amount > other_amount:
-                diff = amount - other_amount
-                diff_pct = (diff / other_amount * 100) if other_amount > 0 else 0
-                spending_patterns.append(
-                    f"{category}: You spend ₹{amount:.0f} vs peer's ₹{other_amount:.0f} ({diff_pct:+.1f}% more)"
-                )
-                if diff > 500:  # Significant difference
-                    unnecessary_expenses.append(
-                        f"{category}: Reduce by ₹{diff:.0f} to match peer levels (save {diff_pct:.0f}% monthly)"
-                    )
-                    recommendations.append(
-                        f"Cut {category} spending from ₹{amount:.0f} to ₹{other_amount:.0f} to save ₹{diff:.0f}/month"
-                    )
-        
-        # Add general recommendations based on data
-        if spending_diff > 0:
-            recommendations.insert(0, f"Reduce total spending by ₹{spending_diff:.0f} to match peer's efficient spending pattern")
-        
-        if savings_gap > 0:
-            months_to_catch_up = savings_gap / spending_diff if spending_diff > 0 else 12
-            recommendations.append(
-                f"Save an additional ₹{spending_diff:.0f}/month to close the ₹{savings_gap:.0f} savings gap in {months_to_catch_up:.0f} months"
+        return deterministic_insights(current_user, other_user, current_analysis, other_analysis)
+
+
+def fast_comparison_insights(
+    current_user_info: str,
+    other_user_info: str,
+    current_user_transactions: str,
+    other_user_transactions: str
+) -> UserComparisonInsights:
+    """
+    Deterministic comparison (mode=fast): category diffs and savings-rate gaps
+    with templated insights. No LLM call, no API key needed.
+    """
+    return fast_comparison_insights_from_analyses(
+        current_user_info,
+        other_user_info,
+        analyze_csv_transactions(current_user_transactions),
+        analyze_csv_transactions(other_user_transactions)
+    )
+
+
+def fast_comparison_insights_from_analyses(
+    current_user_info: str,
+    other_user_info: str,
+    current_analysis: Dict,
+    other_analysis: Dict
+) -> UserComparisonInsights:
+    """fast_comparison_insights for transactions that are already aggregated."""
+    try:
+        current_user = parse_user_info(current_user_info)
+        other_user = parse_user_info(other_user_info)
+    except ValueError as e:
+        raise ValueError(f"Invalid user info format: {e}")
+
+    return deterministic_insights(current_user, other_user, current_analysis, other_analysis)
+
+
+def deterministic_insights(
+    current_user: Dict[str, str],
+    other_user: Dict[str, str],
+    current_analysis: Dict,
+    other_analysis: Dict
+) -> UserComparisonInsights:
+    """Templated, data-driven insights computed from the two transaction analyses."""
+    # Calculate metrics for fallback
+    current_savings_rate = (float(current_user['savings']) / float(current_user['salary'])) * 100 if float(current_user['salary']) > 0 else 0
+    other_savings_rate = (float(other_user['savings']) / float(other_user['salary'])) * 100 if float(other_user['salary']) > 0 else 0
+    spending_diff = current_analysis['total_spent'] - other_analysis['total_spent']
+    savings_gap = float(other_user['savings']) - float(current_user['savings'])
+    
+    # Generate data-driven fallback insights
+    spending_patterns = []
+    recommendations = []
+    unnecessary_expenses = []
+    
+    # Compare spending by category
+    for category, amount in current_analysis['categories'].items():
+        other_amount = other_analysis['categories'].get(category, 0)
+        if amount > other_amount:
+            diff = amount - other_amount
+            diff_pct = (diff / other_amount * 100) if other_amount > 0 else 0
+            spending_patterns.append(
+                f"{category}: You spend ₹{amount:.0f} vs peer's ₹{other_amount:.0f} ({diff_pct:+.1f}% more)"
             )
-        
+            if diff > 500:  # Significant difference
+                unnecessary_expenses.append(
+                    f"{category}: Reduce by ₹{diff:.0f} to match peer levels (save {diff_pct:.0f}% monthly)"
+                )
+                recommendations.append(
+                    f"Cut {category} spending from ₹{amount:.0f} to ₹{other_amount:.0f} to save ₹{diff:.0f}/month"
+                )
+    
+    # Add general recommendations based on data
+    if spending_diff > 0:
+        recommendations.insert(0, f"Reduce total spending by ₹{spending_diff:.0f} to match peer's efficient spending pattern")
+    
+    if savings_gap > 0:
+        months_to_catch_up = savings_gap / spending_diff if spending_diff > 0 else 12
         recommendations.append(
-            f"Increase savings rate from {current_savings_rate:.1f}% to {other_savings_rate:.1f}% (target: +{other_savings_rate - current_savings_rate:.1f} percentage points)"
-        )
-        
-        # Ensure we have at least some items
-        if not spending_patterns:
-            spending_patterns = [f"Total spending: ₹{current_analysis['total_spent']:.0f} vs peer's ₹{other_analysis['total_spent']:.0f}"]
-        
-        if not unnecessary_expenses:
-            unnecessary_expenses = [f"Review all discretionary spending to reduce by ₹{spending_diff:.0f}"]
-        
-        return UserComparisonInsights(
-            summary=f"You spend ₹{spending_diff:.0f} more than your peer ({spending_diff/other_analysis['total_spent']*100:+.1f}%). Savings rate: {current_savings_rate:.1f}% vs peer's {other_savings_rate:.1f}%.",
-            job_comparison=f"Both {current_user['job']} roles with ₹{current_user['salary']} and ₹{other_user['salary']} monthly income show different spending behaviors.",
-            savings_insights=f"Current savings: ₹{current_user['savings']} ({current_savings_rate:.1f}% rate) vs peer: ₹{other_user['savings']} ({other_savings_rate:.1f}% rate). Gap: ₹{savings_gap:.0f}. By matching peer's spending, you could save ₹{spending_diff:.0f} more per month.",
-            spending_patterns=spending_patterns[:5],
-            recommendations=recommendations[:7],
-            unnecessary_expenses=unnecessary_expenses[:5],
-            peer_benchmark=f"{other_user['job']}s with ₹{other_user['salary']} income achieve {other_savings_rate:.1f}% savings rate by spending ₹{other_analysis['total_spent']:.0f} less on discretionary expenses."
+            f"Save an additional ₹{spending_diff:.0f}/month to close the ₹{savings_gap:.0f} savings gap in {months_to_catch_up:.0f} months"
         )
+    
+    recommendations.append(
+        f"Increase savings rate from {current_savings_rate:.1f}% to {other_savings_rate:.1f}% (target: +{other_savings_rate - current_savings_rate:.1f} percentage points)"
+    )
+    
+    # Ensure we have at least some items
+    if not spending_patterns:
+        spending_patterns = [f"Total spending: ₹{current_analysis['total_spent']:.0f} vs peer's ₹{other_analysis['total_spent']:.0f}"]
+    
+    if not unnecessary_expenses:
+        unnecessary_expenses = [f"Review all discretionary spending to reduce by ₹{spending_diff:.0f}"]
+    
+    spending_diff_pct = spending_diff / other_analysis['total_spent'] * 100 if other_analysis['total_spent'] > 0 else 0
+
+    return UserComparisonInsights(
+        summary=f"You spend ₹{spending_diff:.0f} more than your peer ({spending_diff_pct:+.1f}%). Savings rate: {current_savings_rate:.1f}% vs peer's {other_savings_rate:.1f}%.",
+        job_comparison=f"Both {current_user['job']} roles with ₹{current_user['salary']} and ₹{other_user['salary']} monthly income show different spending behaviors.",
+        savings_insights=f"Current savings: ₹{current_user['savings']} ({current_savings_rate:.1f}% rate) vs peer: ₹{other_user['savings']} ({other_savings_rate:.1f}% rate). Gap: ₹{savings_gap:.0f}. By matching peer's spending, you could save ₹{spending_diff:.0f} more per month.",
+        spending_patterns=spending_patterns[:5],
+        recommendations=recommendations[:7],
+        unnecessary_expenses=unnecessary_expenses[:5],
+        peer_benchmark=f"{other_user['job']}s with ₹{other_user['salary']} income achieve {other_savings_rate:.1f}% savings rate by spending ₹{other_analysis['total_spent']:.0f} less on discretionary expenses."
+    )
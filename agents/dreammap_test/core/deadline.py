@@ -0,0 +1,78 @@
+"""
+Per-request deadlines for LLM calls.
+
+A request opens a budget with request_budget(seconds). The budget lives in a
+context variable, so every LLM call made while serving the request, including
+calls in tasks it spawns, sees the same deadline. The gateway caps each
+attempt at the time left and raises DeadlineExceeded once it is spent. The
+agents' existing except branches then return their deterministic fallback
+straight away, and the budget records that the response is degraded.
+"""
+
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """The request's time budget ran out before (or during) an LLM call."""
+
+
+class RequestBudget:
+    """Absolute deadline for one request, plus why its response was degraded (if it was)."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+        self.degraded: List[str] = []
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def mark_degraded(self, reason: str):
+        if reason not in self.degraded:
+            self.degraded.append(reason)
+
+
+_current_budget: contextvars.ContextVar[Optional[RequestBudget]] = contextvars.ContextVar(
+    "goalaura_request_budget", default=None
+)
+
+
+@contextmanager
+def request_budget(seconds: Optional[float]) -> Iterator[Optional[RequestBudget]]:
+    """Run the block under a `seconds` budget (None: no deadline)."""
+    budget = RequestBudget(seconds) if seconds is not None else None
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def current_budget() -> Optional[RequestBudget]:
+    return _current_budget.get()
+
+
+def time_left(timeout_s: Optional[float] = None) -> Optional[float]:
+    """
+    The timeout to use for the next LLM call: `timeout_s` capped at the time left
+    in the request budget. Raises DeadlineExceeded (and marks the request
+    degraded) if the budget is already spent.
+    """
+    budget = _current_budget.get()
+    if budget is None:
+        return timeout_s
+    raise_if_expired()
+    remaining = budget.remaining()
+    return remaining if timeout_s is None else min(timeout_s, remaining)
+
+
+def raise_if_expired():
+    """Raise DeadlineExceeded (and mark the request degraded) if the budget is spent."""
+    budget = _current_budget.get()
+    if budget is not None and budget.remaining() <= 0:
+        budget.mark_degraded("deadline")
+        raise DeadlineExceeded(f"Request deadline of {budget.seconds:.1f}s exceeded")
@@ -3,105 +3,124 @@ Income Growth Agent - Analyzes current income and profession to suggest structur
 """
 
 import os
+import re
+import copy
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
 
+from core.llm_cache import TTLCache
+from core.model_router import TASK_STRUCTURED_REPORT, generate_for_task
+from core.singleflight import SingleFlight
+
 load_dotenv()
 
-# Initialize client
-try:
-    client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-except Exception as e:
-    client = None
-    print(f"Warning: Gemini client init failed: {e}")
 
+# --- Bucketed analysis cache ---
+# Users with the same (normalized) profession, income band and skill set get the
+# same growth analysis, so one LLM generation is shared by everyone in the bucket.
+PROFESSION_SYNONYMS = {
+    "sde": "software engineer",
+    "swe": "software engineer",
+    "software developer": "software engineer",
+    "software development engineer": "software engineer",
+    "softwareengineer": "software engineer",
+    "programmer": "software engineer",
+    "developer": "software engineer",
+    "sr software engineer": "senior software engineer",
+    "senior sde": "senior software engineer",
+    "sde 2": "senior software engineer",
+    "sde ii": "senior software engineer",
+    "ds": "data scientist",
+    "ml engineer": "machine learning engineer",
+    "mle": "machine learning engineer",
+    "da": "data analyst",
+    "pm": "product manager",
+    "ca": "chartered accountant",
+    "ux designer": "designer",
+    "ui designer": "designer",
+    "graphic designer": "designer",
+    "teacher": "teacher",
+    "tutor": "teacher",
+    "nurse": "nurse",
+    "doctor": "doctor",
+    "physician": "doctor",
+}
+
+# Monthly income band edges in INR; a band is [edge_i, edge_i+1)
+INCOME_BAND_EDGES = [0, 15000, 25000, 40000, 60000, 85000, 120000, 175000, 250000, 400000, 600000]
+
+INCOME_GROWTH_CACHE_TTL_S = float(os.environ.get("INCOME_GROWTH_CACHE_TTL_S", str(6 * 3600)))
+_analysis_cache = TTLCache(max_entries=1024, ttl_s=INCOME_GROWTH_CACHE_TTL_S)
+_income_flight = SingleFlight("analyze_income_growth_paths")
+
+
+def normalize_profession(profession: str) -> str:
+    """Lowercase, strip punctuation and map known synonyms ("SDE" -> "software engineer")."""
+    text = re.sub(r"[^a-z0-9]+", " ", (profession or "").lower()).strip()
+    return PROFESSION_SYNONYMS.get(text, text)
+
+
+def income_band(current_income: float) -> str:
+    """Return the band label the monthly income falls into, e.g. '40000-60000'."""
+    lower = INCOME_BAND_EDGES[0]
+    for edge in INCOME_BAND_EDGES[1:]:
+        if current_income < edge:
+            return f"{lower}-{edge}"
+        lower = edge
+    return f"{lower}+"
 
-def _safe_generate_content(*, model: str, contents, config):
-    """Wrap model call to provide clearer errors when client is not initialized."""
-    if client is None:
-        raise RuntimeError("GenAI client not initialized. Set GEMINI_API_KEY in env.")
-    return client.models.generate_content(model=model, contents=contents, config=config)
 
+def format_income_band(band: str) -> str:
+    """Readable form of a band label: '40000-60000' -> '₹40k–₹60k/month'."""
+    edges = [f"₹{int(edge) // 1000}k" for edge in band.rstrip("+").split("-")]
+    if band.endswith("+"):
+        return f"{edges[0]}+/month"
+    return f"{edges[0]}–{edges[1]}/month"
 
-def analyze_income_growth_paths(
+
+def income_growth_cache_key(
     current_income: float,
     profession: str,
-    current_skills: List[str] = None
-) -> Dict:
+    current_skills: Optional[List[str]] = None
+) -> Tuple[str, str, Tuple[str, ...]]:
+    skills = tuple(sorted({s.strip().lower() for s in (current_skills or []) if s and s.strip()}))
+    return normalize_profession(profession), income_band(current_income), skills
+
+
+def _with_user_profile(analysis: Dict, profession: str, current_income: float, current_skills: List[str]) -> Dict:
+    """Copy a bucket-level analysis and stamp the requesting user's own profile onto it."""
+    result = copy.deepcopy(analysis)
+    result["user_profile"] = {
+        "profession": profession,
+        "monthly_income": current_income,
+        "annual_income": current_income * 12,
+        "skills": current_skills
+    }
+    return result
+
+
+def _bucket_prompt(cache_key: Tuple[str, str, Tuple[str, ...]]) -> str:
     """
-    Analyzes user's current income and profession to suggest structured paths for income growth.
-    
-    Args:
-        current_income: Current monthly income in INR
-        profession: Current job profession/role
-        current_skills: List of current skills (optional)
-    
-    Returns:
-        Dictionary with structured income growth paths and recommendations
+    The analysis prompt for a whole bucket. Its answer is shared by every user in
+    the bucket, so it is built only from the key, never from one user's exact
+    title or income.
     """
+    profession, band, skills = cache_key
+    skills_context = f"Current skills: {', '.join(skills)}" if skills else "No specific skills mentioned"
     
-    if current_skills is None:
-        current_skills = []
-    
-    # Calculate income benchmarks
-    annual_income = current_income * 12
-    
-    # If AI is unavailable, return basic fallback
-    if not os.environ.get("GEMINI_API_KEY"):
-        return {
-            "current_analysis": {
-                "monthly_income": current_income,
-                "annual_income": annual_income,
-                "profession": profession
-            },
-            "growth_paths": [
-                {
-                    "path_name": "Skill Upgrade Path",
-                    "potential_income_increase": "20-40%",
-                    "timeline": "6-12 months",
-                    "steps": [
-                        "Identify high-demand skills in your field",
-                        "Enroll in online courses or certifications",
-                        "Build portfolio projects",
-                        "Apply for higher-paying positions"
-                    ]
-                },
-                {
-                    "path_name": "Side Income Path",
-                    "potential_income_increase": "15-30%",
-                    "timeline": "3-6 months",
-                    "steps": [
-                        "Identify freelance opportunities",
-                        "Set up profiles on freelancing platforms",
-                        "Start with small projects",
-                        "Scale up gradually"
-                    ]
-                }
-            ],
-            "recommendations": [
-                "AI unavailable - configure GEMINI_API_KEY for detailed analysis"
-            ]
-        }
-    
-    # Use AI to generate comprehensive income growth analysis
-    model_name = "gemini-2.0-flash-exp"
-    
-    skills_context = f"Current skills: {', '.join(current_skills)}" if current_skills else "No specific skills mentioned"
-    
-    prompt = f"""
+    return f"""
 You are an expert career and income growth advisor specializing in the Indian job market.
 
 **User Profile:**
 - Current Profession: {profession}
-- Monthly Income: ₹{current_income:,.0f} (Annual: ₹{annual_income:,.0f})
+- Monthly Income: {format_income_band(band)}
 - {skills_context}
 - Location: India
 
 **Your Task:**
-Analyze this profile and provide SPECIFIC, ACTIONABLE paths to increase income. Be realistic about timelines and potential gains.
+Analyze this profile (it describes everyone in this profession and income range, so do not invent an exact salary) and provide SPECIFIC, ACTIONABLE paths to increase income. Be realistic about timelines and potential gains.
 
 Return a JSON object with the following structure:
 
@@ -180,211 +199,304 @@ Return a JSON object with the following structure:
 - Provide 3-4 realistic side income opportunities
 """
 
-    try:
-        response = _safe_generate_content(
-            model=model_name,
-            contents=[types.Content(role="user", parts=[types.Part.from_text(text=prompt)])],
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=0.8
-            ),
-        )
-        
-        result = json.loads(response.text)
-        
-        # Add calculated fields
-        result["user_profile"] = {
-            "profession": profession,
-            "monthly_income": current_income,
-            "annual_income": annual_income,
-            "skills": current_skills
-        }
-        
-        return result
-        
-    except Exception as e:
-        print(f"Income growth analysis failed: {e}")
-        
-        # Return enhanced fallback
+
+async def _generate_bucket_analysis(cache_key: Tuple) -> Dict:
+    """One LLM generation for a whole (profession, band, skills) bucket."""
+    prompt = _bucket_prompt(cache_key)
+    response_text = await generate_for_task(
+        TASK_STRUCTURED_REPORT,
+        contents=[types.Content(role="user", parts=[types.Part.from_text(text=prompt)])],
+        config=types.GenerateContentConfig(response_mime_type="application/json", temperature=0.8),
+    )
+    
+    result = json.loads(response_text)
+    
+    # Only successful generations are shared with the bucket; fallbacks are not cached
+    _analysis_cache.set(cache_key, result)
+    return result
+
+
+async def analyze_income_growth_paths(
+    current_income: float,
+    profession: str,
+    current_skills: List[str] = None
+) -> Dict:
+    """
+    Analyzes user's current income and profession to suggest structured paths for income growth.
+    
+    Args:
+        current_income: Current monthly income in INR
+        profession: Current job profession/role
+        current_skills: List of current skills (optional)
+    
+    Returns:
+        Dictionary with structured income growth paths and recommendations
+    """
+    
+    if current_skills is None:
+        current_skills = []
+    
+    cache_key = income_growth_cache_key(current_income, profession, current_skills)
+    cached = _analysis_cache.get(cache_key)
+    if cached is not None:
+        return _with_user_profile(cached, profession, current_income, current_skills)
+    
+    # Calculate income benchmarks
+    annual_income = current_income * 12
+    
+    # If AI is unavailable, return basic fallback
+    if not os.environ.get("GEMINI_API_KEY"):
         return {
-            "user_profile": {
-                "profession": profession,
+            "current_analysis": {
                 "monthly_income": current_income,
                 "annual_income": annual_income,
-                "skills": current_skills
-            },
-            "current_analysis": {
-                "income_percentile": f"Analysis unavailable - configure AI for detailed insights",
-                "market_position": f"Current income: ₹{current_income:,.0f}/month as {profession}",
-                "immediate_opportunities": [
-                    "Update LinkedIn profile with recent achievements",
-                    "Research salary benchmarks for your role",
-                    "Network with professionals in your field"
-                ]
+                "profession": profession
             },
             "growth_paths": [
                 {
-                    "path_name": "Career Advancement Path",
-                    "path_type": "career_advancement",
-                    "potential_income_increase": "25-40% in 12-18 months",
-                    "difficulty_level": "Moderate",
-                    "timeline": "12-18 months",
-                    "investment_required": "Time: 5-10 hours/week, Money: ₹10,000-30,000 for courses",
-                    "steps": [
-                        "Identify senior roles in your field and required qualifications",
-                        "Assess skill gaps between current and target role",
-                        "Enroll in relevant certifications or courses",
-                        "Take on leadership responsibilities in current role",
-                        "Build a portfolio of achievements and projects",
-                        "Network with senior professionals and hiring managers",
-                        "Apply for senior positions or request promotion",
-                        "Negotiate salary based on market research"
-                    ],
-                    "skills_to_learn": ["Leadership", "Project Management", "Strategic Planning"],
-                    "resources": ["Coursera", "LinkedIn Learning", "Industry-specific certifications"],
-                    "success_metrics": ["Completed certifications", "Leadership projects delivered", "Interview calls received"],
-                    "potential_roadblocks": ["Limited senior positions", "Competition", "Skill gaps"],
-                    "pro_tips": ["Document all achievements", "Build visibility in your organization"]
-                },
-                {
-                    "path_name": "High-Value Skill Acquisition",
-                    "path_type": "skill_upgrade",
-                    "potential_income_increase": "30-60% in 6-12 months",
-                    "difficulty_level": "Challenging",
+                    "path_name": "Skill Upgrade Path",
+                    "potential_income_increase": "20-40%",
                     "timeline": "6-12 months",
-                    "investment_required": "Time: 10-15 hours/week, Money: ₹20,000-50,000",
                     "steps": [
-                        "Research high-demand skills in your industry",
-                        "Choose 2-3 complementary skills to master",
-                        "Enroll in structured learning programs",
-                        "Build real-world projects to demonstrate skills",
-                        "Create online portfolio showcasing your work",
-                        "Contribute to open-source or community projects",
-                        "Apply for roles requiring these new skills",
-                        "Leverage new skills for freelance opportunities"
-                    ],
-                    "skills_to_learn": ["Data Analysis", "Cloud Computing", "AI/ML", "Digital Marketing"],
-                    "resources": ["Udemy", "Coursera", "edX", "YouTube tutorials"],
-                    "success_metrics": ["Skills certified", "Portfolio projects completed", "Freelance gigs secured"],
-                    "potential_roadblocks": ["Learning curve", "Time management", "Staying motivated"],
-                    "pro_tips": ["Focus on in-demand skills", "Build public portfolio", "Join skill-specific communities"]
+                        "Identify high-demand skills in your field",
+                        "Enroll in online courses or certifications",
+                        "Build portfolio projects",
+                        "Apply for higher-paying positions"
+                    ]
                 },
                 {
-                    "path_name": "Side Income Stream",
-                    "path_type": "side_income",
-                    "potential_income_increase": "15-35% additional income",
-                    "difficulty_level": "Easy to Moderate",
+                    "path_name": "Side Income Path",
+                    "potential_income_increase": "15-30%",
                     "timeline": "3-6 months",
-                    "investment_required": "Time: 5-10 hours/week, Money: ₹5,000-15,000",
                     "steps": [
-                        "Identify marketable skills you already have",
-                        "Research freelance platforms and opportunities",
-                        "Create professional profiles on 2-3 platforms",
-                        "Start with small projects to build reputation",
-                        "Deliver quality work to get positive reviews",
-                        "Gradually increase rates as reputation grows",
-                        "Diversify income streams across multiple clients",
-                        "Consider productizing your services"
-                    ],
-                    "skills_to_learn": ["Freelancing", "Client Management", "Time Management"],
-                    "resources": ["Upwork", "Fiverr", "Freelancer.in", "Toptal"],
-                    "success_metrics": ["Profile created", "First client secured", "Positive reviews received"],
-                    "potential_roadblocks": ["Finding first clients", "Pricing services", "Time management"],
-                    "pro_tips": ["Start with competitive pricing", "Over-deliver initially", "Build long-term client relationships"]
-                }
-            ],
-            "high_paying_skills": [
-                {
-                    "skill_name": "Data Analysis & Visualization",
-                    "average_salary_increase": "+₹15,000-35,000/month",
-                    "learning_time": "4-6 months",
-                    "demand_level": "Very High",
-                    "learning_resources": ["Google Data Analytics Certificate", "Tableau courses", "Python for Data Analysis"]
-                },
-                {
-                    "skill_name": "Cloud Computing (AWS/Azure/GCP)",
-                    "average_salary_increase": "+₹20,000-50,000/month",
-                    "learning_time": "6-9 months",
-                    "demand_level": "Very High",
-                    "learning_resources": ["AWS Certified Solutions Architect", "Azure Fundamentals", "Cloud Academy"]
-                },
-                {
-                    "skill_name": "Digital Marketing & SEO",
-                    "average_salary_increase": "+₹10,000-30,000/month",
-                    "learning_time": "3-5 months",
-                    "demand_level": "High",
-                    "learning_resources": ["Google Digital Marketing Certificate", "HubSpot Academy", "SEMrush Academy"]
-                }
-            ],
-            "side_income_opportunities": [
-                {
-                    "opportunity_name": "Freelance Consulting",
-                    "potential_monthly_income": "₹15,000-50,000/month",
-                    "time_commitment": "5-10 hours/week",
-                    "startup_cost": "₹5,000-10,000 (website, tools)",
-                    "steps_to_start": [
-                        "Define your consulting niche",
-                        "Create LinkedIn and freelance profiles",
-                        "Reach out to potential clients",
-                        "Deliver first project successfully"
-                    ]
-                },
-                {
-                    "opportunity_name": "Online Teaching/Tutoring",
-                    "potential_monthly_income": "₹10,000-40,000/month",
-                    "time_commitment": "6-12 hours/week",
-                    "startup_cost": "₹3,000-8,000 (equipment, platform fees)",
-                    "steps_to_start": [
-                        "Choose subject/skill to teach",
-                        "Join platforms like Unacademy, Vedantu, or Udemy",
-                        "Create course content or offer live sessions",
-                        "Market your courses"
-                    ]
-                },
-                {
-                    "opportunity_name": "Content Creation",
-                    "potential_monthly_income": "₹8,000-30,000/month",
-                    "time_commitment": "8-15 hours/week",
-                    "startup_cost": "₹5,000-15,000 (equipment, software)",
-                    "steps_to_start": [
-                        "Choose platform (YouTube, Blog, Instagram)",
-                        "Create content in your expertise area",
-                        "Build audience consistently",
-                        "Monetize through ads, sponsorships, or products"
+                        "Identify freelance opportunities",
+                        "Set up profiles on freelancing platforms",
+                        "Start with small projects",
+                        "Scale up gradually"
                     ]
                 }
             ],
-            "immediate_action_plan": {
-                "week_1": [
-                    "Research salary benchmarks for your role",
-                    "Update resume and LinkedIn profile",
-                    "List your marketable skills"
+            "recommendations": [
+                "AI unavailable - configure GEMINI_API_KEY for detailed analysis"
+            ]
+        }
+    
+    try:
+        # Concurrent requests for the same bucket await a single generation
+        result = await _income_flight.do(
+            cache_key,
+            lambda: _generate_bucket_analysis(cache_key)
+        )
+        
+        # Add calculated fields
+        return _with_user_profile(result, profession, current_income, current_skills)
+        
+    except Exception as e:
+        print(f"Income growth analysis failed: {e}")
+        
+        # Return enhanced fallback
+        return _fallback_income_analysis(current_income, profession, current_skills)
+
+
+def fast_income_growth_paths(
+    current_income: float,
+    profession: str,
+    current_skills: List[str] = None
+) -> Dict:
+    """
+    Deterministic analysis (mode=fast): the cached analysis for this profession /
+    income band / skills bucket if one exists, otherwise the templated plan.
+    Never calls the LLM.
+    """
+    current_skills = current_skills or []
+    cached = _analysis_cache.get(income_growth_cache_key(current_income, profession, current_skills))
+    if cached is not None:
+        return _with_user_profile(cached, profession, current_income, current_skills)
+    return _fallback_income_analysis(current_income, profession, current_skills)
+
+
+def _fallback_income_analysis(current_income: float, profession: str, current_skills: List[str]) -> Dict:
+    """Templated growth plan built only from the user's own numbers."""
+    annual_income = current_income * 12
+    return {
+        "user_profile": {
+            "profession": profession,
+            "monthly_income": current_income,
+            "annual_income": annual_income,
+            "skills": current_skills
+        },
+        "current_analysis": {
+            "income_percentile": f"Analysis unavailable - configure AI for detailed insights",
+            "market_position": f"Current income: ₹{current_income:,.0f}/month as {profession}",
+            "immediate_opportunities": [
+                "Update LinkedIn profile with recent achievements",
+                "Research salary benchmarks for your role",
+                "Network with professionals in your field"
+            ]
+        },
+        "growth_paths": [
+            {
+                "path_name": "Career Advancement Path",
+                "path_type": "career_advancement",
+                "potential_income_increase": "25-40% in 12-18 months",
+                "difficulty_level": "Moderate",
+                "timeline": "12-18 months",
+                "investment_required": "Time: 5-10 hours/week, Money: ₹10,000-30,000 for courses",
+                "steps": [
+                    "Identify senior roles in your field and required qualifications",
+                    "Assess skill gaps between current and target role",
+                    "Enroll in relevant certifications or courses",
+                    "Take on leadership responsibilities in current role",
+                    "Build a portfolio of achievements and projects",
+                    "Network with senior professionals and hiring managers",
+                    "Apply for senior positions or request promotion",
+                    "Negotiate salary based on market research"
                 ],
-                "month_1": [
-                    "Identify 2-3 high-value skills to learn",
-                    "Enroll in one online course",
-                    "Set up profiles on freelance platforms"
+                "skills_to_learn": ["Leadership", "Project Management", "Strategic Planning"],
+                "resources": ["Coursera", "LinkedIn Learning", "Industry-specific certifications"],
+                "success_metrics": ["Completed certifications", "Leadership projects delivered", "Interview calls received"],
+                "potential_roadblocks": ["Limited senior positions", "Competition", "Skill gaps"],
+                "pro_tips": ["Document all achievements", "Build visibility in your organization"]
+            },
+            {
+                "path_name": "High-Value Skill Acquisition",
+                "path_type": "skill_upgrade",
+                "potential_income_increase": "30-60% in 6-12 months",
+                "difficulty_level": "Challenging",
+                "timeline": "6-12 months",
+                "investment_required": "Time: 10-15 hours/week, Money: ₹20,000-50,000",
+                "steps": [
+                    "Research high-demand skills in your industry",
+                    "Choose 2-3 complementary skills to master",
+                    "Enroll in structured learning programs",
+                    "Build real-world projects to demonstrate skills",
+                    "Create online portfolio showcasing your work",
+                    "Contribute to open-source or community projects",
+                    "Apply for roles requiring these new skills",
+                    "Leverage new skills for freelance opportunities"
                 ],
-                "month_3": [
-                    "Complete first certification",
-                    "Build 1-2 portfolio projects",
-                    "Secure first freelance client or side project"
+                "skills_to_learn": ["Data Analysis", "Cloud Computing", "AI/ML", "Digital Marketing"],
+                "resources": ["Udemy", "Coursera", "edX", "YouTube tutorials"],
+                "success_metrics": ["Skills certified", "Portfolio projects completed", "Freelance gigs secured"],
+                "potential_roadblocks": ["Learning curve", "Time management", "Staying motivated"],
+                "pro_tips": ["Focus on in-demand skills", "Build public portfolio", "Join skill-specific communities"]
+            },
+            {
+                "path_name": "Side Income Stream",
+                "path_type": "side_income",
+                "potential_income_increase": "15-35% additional income",
+                "difficulty_level": "Easy to Moderate",
+                "timeline": "3-6 months",
+                "investment_required": "Time: 5-10 hours/week, Money: ₹5,000-15,000",
+                "steps": [
+                    "Identify marketable skills you already have",
+                    "Research freelance platforms and opportunities",
+                    "Create professional profiles on 2-3 platforms",
+                    "Start with small projects to build reputation",
+                    "Deliver quality work to get positive reviews",
+                    "Gradually increase rates as reputation grows",
+                    "Diversify income streams across multiple clients",
+                    "Consider productizing your services"
                 ],
-                "month_6": [
-                    "Apply for higher-paying positions",
-                    "Have consistent side income stream",
-                    "Network with industry professionals"
+                "skills_to_learn": ["Freelancing", "Client Management", "Time Management"],
+                "resources": ["Upwork", "Fiverr", "Freelancer.in", "Toptal"],
+                "success_metrics": ["Profile created", "First client secured", "Positive reviews received"],
+                "potential_roadblocks": ["Finding first clients", "Pricing services", "Time management"],
+                "pro_tips": ["Start with competitive pricing", "Over-deliver initially", "Build long-term client relationships"]
+            }
+        ],
+        "high_paying_skills": [
+            {
+                "skill_name": "Data Analysis & Visualization",
+                "average_salary_increase": "+₹15,000-35,000/month",
+                "learning_time": "4-6 months",
+                "demand_level": "Very High",
+                "learning_resources": ["Google Data Analytics Certificate", "Tableau courses", "Python for Data Analysis"]
+            },
+            {
+                "skill_name": "Cloud Computing (AWS/Azure/GCP)",
+                "average_salary_increase": "+₹20,000-50,000/month",
+                "learning_time": "6-9 months",
+                "demand_level": "Very High",
+                "learning_resources": ["AWS Certified Solutions Architect", "Azure Fundamentals", "Cloud Academy"]
+            },
+            {
+                "skill_name": "Digital Marketing & SEO",
+                "average_salary_increase": "+₹10,000-30,000/month",
+                "learning_time": "3-5 months",
+                "demand_level": "High",
+                "learning_resources": ["Google Digital Marketing Certificate", "HubSpot Academy", "SEMrush Academy"]
+            }
+        ],
+        "side_income_opportunities": [
+            {
+                "opportunity_name": "Freelance Consulting",
+                "potential_monthly_income": "₹15,000-50,000/month",
+                "time_commitment": "5-10 hours/week",
+                "startup_cost": "₹5,000-10,000 (website, tools)",
+                "steps_to_start": [
+                    "Define your consulting niche",
+                    "Create LinkedIn and freelance profiles",
+                    "Reach out to potential clients",
+                    "Deliver first project successfully"
                 ]
             },
-            "recommendations": [
-                "Focus on skill upgrades - add high-demand skills to multiply your market value",
-                "Start a side income stream immediately - even ₹10,000/month extra adds up to ₹1.2L annually",
-                "Network actively - 70% of jobs are filled through networking, not job boards",
-                "Document your achievements - build a portfolio that showcases your value",
-                "Research market rates - you might be underpaid without knowing it",
-                "Consider career coaching - professional guidance can accelerate your growth"
+            {
+                "opportunity_name": "Online Teaching/Tutoring",
+                "potential_monthly_income": "₹10,000-40,000/month",
+                "time_commitment": "6-12 hours/week",
+                "startup_cost": "₹3,000-8,000 (equipment, platform fees)",
+                "steps_to_start": [
+                    "Choose subject/skill to teach",
+                    "Join platforms like Unacademy, Vedantu, or Udemy",
+                    "Create course content or offer live sessions",
+                    "Market your courses"
+                ]
+            },
+            {
+                "opportunity_name": "Content Creation",
+                "potential_monthly_income": "₹8,000-30,000/month",
+                "time_commitment": "8-15 hours/week",
+                "startup_cost": "₹5,000-15,000 (equipment, software)",
+                "steps_to_start": [
+                    "Choose platform (YouTube, Blog, Instagram)",
+                    "Create content in your expertise area",
+                    "Build audience consistently",
+                    "Monetize through ads, sponsorships, or products"
+                ]
+            }
+        ],
+        "immediate_action_plan": {
+            "week_1": [
+                "Research salary benchmarks for your role",
+                "Update resume and LinkedIn profile",
+                "List your marketable skills"
+            ],
+            "month_1": [
+                "Identify 2-3 high-value skills to learn",
+                "Enroll in one online course",
+                "Set up profiles on freelance platforms"
+            ],
+            "month_3": [
+                "Complete first certification",
+                "Build 1-2 portfolio projects",
+                "Secure first freelance client or side project"
+            ],
+            "month_6": [
+                "Apply for higher-paying positions",
+                "Have consistent side income stream",
+                "Network with industry professionals"
             ]
-        }
+        },
+        "recommendations": [
+            "Focus on skill upgrades - add high-demand skills to multiply your market value",
+            "Start a side income stream immediately - even ₹10,000/month extra adds up to ₹1.2L annually",
+            "Network actively - 70% of jobs are filled through networking, not job boards",
+            "Document your achievements - build a portfolio that showcases your value",
+            "Research market rates - you might be underpaid without knowing it",
+            "Consider career coaching - professional guidance can accelerate your growth"
+        ]
+    }
 
 
 def format_income_growth_report(analysis_result: Dict) -> str:
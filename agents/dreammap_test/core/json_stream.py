@@ -0,0 +1,108 @@
+"""
+Incremental parser for a streamed top-level JSON object.
+
+Feed it text chunks as they arrive from the model; it reports each top-level
+field as soon as its value is complete, and for array-valued fields each element
+as soon as that element is complete. Nothing is re-parsed from the start.
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+# Event kinds returned by JsonFieldStream.feed
+FIELD = "field"   # (FIELD, key, value) - a top-level value finished
+ITEM = "item"     # (ITEM, key, element) - one element of a top-level array finished
+
+
+class JsonFieldStream:
+    """Scans a single JSON object chunk by chunk and emits completed fields/elements."""
+
+    def __init__(self):
+        self._pos = 0                  # absolute index of the next char to scan
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._expect_key = False
+        self._value_start: Optional[int] = None
+        self._value_is_array = False
+        self._item_start: Optional[int] = None
+        self._text = ""
+
+    def _emit_value(self, end: int, events: List[Tuple[str, str, Any]]):
+        raw = self._text[self._value_start:end].strip()
+        if raw and self._key is not None:
+            try:
+                events.append((FIELD, self._key, json.loads(raw)))
+            except ValueError:
+                pass
+        self._key = None
+        self._value_start = None
+        self._value_is_array = False
+
+    def _emit_item(self, end: int, events: List[Tuple[str, str, Any]]):
+        raw = self._text[self._item_start:end].strip()
+        if raw:
+            try:
+                events.append((ITEM, self._key, json.loads(raw)))
+            except ValueError:
+                pass
+        self._item_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, Any]]:
+        events: List[Tuple[str, str, Any]] = []
+        self._text += chunk
+        text = self._text
+        i = self._pos
+        while i < len(text):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key and self._key_start is not None:
+                        self._key = json.loads(text[self._key_start:i + 1])
+                        self._key_start = None
+                i += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_start = i
+                elif self._depth == 2 and self._value_is_array and self._item_start is None:
+                    self._item_start = i
+            elif ch in "{[":
+                if self._depth == 0:
+                    self._expect_key = True
+                elif self._depth == 2 and self._value_is_array and self._item_start is None:
+                    self._item_start = i
+                elif self._depth == 1 and self._value_start is not None and ch == "[":
+                    self._value_is_array = True
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 2 and self._value_is_array and ch == "]" and self._item_start is not None:
+                    self._emit_item(i, events)
+                self._depth -= 1
+                if self._depth == 0 and self._value_start is not None:
+                    self._emit_value(i, events)
+            elif ch == ":" and self._depth == 1:
+                self._expect_key = False
+                self._value_start = i + 1
+            elif ch == ",":
+                if self._depth == 1:
+                    if self._value_start is not None:
+                        self._emit_value(i, events)
+                    self._expect_key = True
+                elif self._depth == 2 and self._value_is_array and self._item_start is not None:
+                    self._emit_item(i, events)
+            elif not ch.isspace() and self._depth == 2 and self._value_is_array and self._item_start is None:
+                # number / true / false / null element
+                self._item_start = i
+            i += 1
+        self._pos = i
+        return events
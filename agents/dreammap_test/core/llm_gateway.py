@@ -0,0 +1,400 @@
+"""
+LLM Gateway - the single choke point every Gemini call goes through.
+
+Owns one pooled async HTTP client (keep-alive connections shared by all agents)
+and a concurrency semaphore per model, so a burst of gemini-2.5-pro calls cannot
+starve the cheaper flash calls.
+
+Every model also has a circuit breaker. While a model's breaker is open (quota
+errors, overload or slow responses), its calls go to the next model in
+MODEL_FALLBACKS; a quota error on the primary is retried once on the fallback.
+
+Each attempt is also capped at the time left in the request's deadline budget
+(core.deadline); once it is spent the call raises DeadlineExceeded.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+from google import genai
+from google.genai import types
+
+from core.circuit_breaker import BreakerRegistry, is_retryable_error
+from core.deadline import DeadlineExceeded, raise_if_expired, time_left
+from core.llm_cache import LLMResponseCache, SQLiteCacheTier, TTLCache, make_cache_key
+
+load_dotenv()
+
+# --- Pool / concurrency defaults ---
+MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "32"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("LLM_MAX_KEEPALIVE_CONNECTIONS", "16"))
+KEEPALIVE_EXPIRY_S = 60.0
+REQUEST_TIMEOUT_S = 120.0
+
+DEFAULT_MODEL_CONCURRENCY = int(os.environ.get("LLM_DEFAULT_MODEL_CONCURRENCY", "8"))
+MODEL_CONCURRENCY = {
+    "gemini-2.5-pro": 4,
+}
+
+# --- Model fallback / circuit breaker defaults ---
+# Where a model's traffic goes while its breaker is open (followed transitively)
+MODEL_FALLBACKS = {
+    "gemini-2.5-pro": "gemini-2.5-flash",
+    "gemini-2.5-flash": "gemini-2.0-flash",
+    "gemini-2.0-flash-exp": "gemini-2.0-flash",
+    "gemini-1.5-flash": "gemini-2.0-flash",
+}
+BREAKER_DEFAULTS = {
+    "window": int(os.environ.get("LLM_BREAKER_WINDOW", "20")),
+    "min_calls": int(os.environ.get("LLM_BREAKER_MIN_CALLS", "5")),
+    "failure_threshold": float(os.environ.get("LLM_BREAKER_FAILURE_THRESHOLD", "0.5")),
+    "slow_call_s": float(os.environ.get("LLM_BREAKER_SLOW_CALL_S", "30")),
+    "open_s": float(os.environ.get("LLM_BREAKER_OPEN_S", "30")),
+}
+
+# --- Response cache defaults (set LLM_CACHE_DB to enable the SQLite tier) ---
+CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "2048"))
+CACHE_TTL_S = float(os.environ.get("LLM_CACHE_TTL_S", "3600"))
+CACHE_DISK_TTL_S = float(os.environ.get("LLM_CACHE_DISK_TTL_S", "86400"))
+CACHE_DB_PATH = os.environ.get("LLM_CACHE_DB")
+# -----------------------------------
+
+
+class GenAIBackend:
+    """Talks to Gemini through a single keep-alive httpx pool."""
+
+    def __init__(self, api_key: str):
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_S,
+            ),
+            timeout=REQUEST_TIMEOUT_S,
+        )
+        self._client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(httpx_async_client=self._http),
+        )
+
+    async def generate(self, *, model: str, contents, config) -> str:
+        response = await self._client.aio.models.generate_content(
+            model=model, contents=contents, config=config
+        )
+        return response.text
+
+    async def stream(self, *, model: str, contents, config) -> AsyncIterator[str]:
+        stream = await self._client.aio.models.generate_content_stream(
+            model=model, contents=contents, config=config
+        )
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+
+    async def aclose(self):
+        await self._http.aclose()
+
+
+class FakeBackend:
+    """
+    In-process backend for benchmarks and local experiments (no network).
+
+    `responder(model, contents, config)` returns the response text; by default JSON
+    requests get "{}" and plain-text requests get "other".
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Callable[..., str]] = None,
+        latency_s: float = 0.0,
+        stream_chunk_chars: int = 64,
+        stream_chunk_delay_s: float = 0.0,
+    ):
+        self.responder = responder or _default_fake_response
+        self.latency_s = latency_s
+        self.model_latency_s: Dict[str, float] = {}
+        self.stream_chunk_chars = stream_chunk_chars
+        self.stream_chunk_delay_s = stream_chunk_delay_s
+        self.calls = 0
+        self.calls_by_model: Dict[str, int] = {}
+
+    async def generate(self, *, model: str, contents, config) -> str:
+        """`model_latency_s` overrides the latency per model; the responder may raise to simulate errors."""
+        self.calls += 1
+        self.calls_by_model[model] = self.calls_by_model.get(model, 0) + 1
+        latency = self.model_latency_s.get(model, self.latency_s)
+        if latency:
+            await asyncio.sleep(latency)
+        return self.responder(model, contents, config)
+
+    async def stream(self, *, model: str, contents, config) -> AsyncIterator[str]:
+        """Time to first chunk is `latency_s`; the text then arrives in fixed-size chunks."""
+        text = await self.generate(model=model, contents=contents, config=config)
+        for i in range(0, len(text), self.stream_chunk_chars):
+            if i and self.stream_chunk_delay_s:
+                await asyncio.sleep(self.stream_chunk_delay_s)
+            yield text[i:i + self.stream_chunk_chars]
+
+    async def aclose(self):
+        pass
+
+
+def _default_fake_response(model, contents, config) -> str:
+    if getattr(config, "response_mime_type", None) == "application/json":
+        return "{}"
+    return "other"
+
+
+class ModelUnavailableError(RuntimeError):
+    """Every model in the fallback chain has an open breaker."""
+
+
+class LLMGateway:
+    """Routes every generate call through one backend with per-model limits and breakers."""
+
+    def __init__(
+        self,
+        backend=None,
+        model_concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = DEFAULT_MODEL_CONCURRENCY,
+        cache: Optional[LLMResponseCache] = None,
+        fallbacks: Optional[Dict[str, str]] = None,
+        breakers: Optional[BreakerRegistry] = None,
+    ):
+        self.backend = backend
+        self.cache = cache
+        self.model_concurrency = dict(MODEL_CONCURRENCY if model_concurrency is None else model_concurrency)
+        self.default_concurrency = default_concurrency
+        self.fallbacks = dict(MODEL_FALLBACKS if fallbacks is None else fallbacks)
+        self.breakers = breakers or BreakerRegistry(**BREAKER_DEFAULTS)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def available(self) -> bool:
+        return self.backend is not None
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(model)
+        if sem is None:
+            sem = asyncio.Semaphore(self.model_concurrency.get(model, self.default_concurrency))
+            self._semaphores[model] = sem
+        return sem
+
+    def _count(self, model: str, field: str):
+        counters = self._counters.setdefault(model, {"calls": 0, "errors": 0, "cancelled": 0, "in_flight": 0, "rerouted": 0})
+        counters[field] += 1
+
+    def _route(self, model: str, skip=()) -> Tuple[str, str]:
+        """First model in `model`'s fallback chain whose breaker admits a call, with the admission."""
+        candidate, seen = model, set()
+        while candidate is not None and candidate not in seen:
+            seen.add(candidate)
+            admission = self.breakers.get(candidate).allow() if candidate not in skip else None
+            if admission is not None:
+                if candidate != model:
+                    self._count(model, "rerouted")
+                return candidate, admission
+            candidate = self.fallbacks.get(candidate)
+        raise ModelUnavailableError(f"No available model for {model}: circuit open on every fallback.")
+
+    async def _generate_on(
+        self, model: str, admission: str, contents, config, timeout_s: Optional[float] = None
+    ) -> str:
+        breaker = self.breakers.get(model)
+        self._count(model, "calls")
+        try:
+            async with self._semaphore(model):
+                self._counters[model]["in_flight"] += 1
+                start = time.monotonic()
+                try:
+                    timeout = time_left(timeout_s)
+                    text = await asyncio.wait_for(
+                        self.backend.generate(model=model, contents=contents, config=config), timeout
+                    )
+                except Exception as e:
+                    self._count(model, "errors")
+                    if isinstance(e, asyncio.TimeoutError):
+                        try:
+                            raise_if_expired()
+                        except DeadlineExceeded:
+                            # The request ran out of time, which says nothing about the model
+                            breaker.release(admission)
+                            raise
+                    breaker.record(not is_retryable_error(e), time.monotonic() - start, admission)
+                    raise
+                finally:
+                    self._counters[model]["in_flight"] -= 1
+        except asyncio.CancelledError:
+            # Cancelled while queued for the semaphore or during the call (e.g. a
+            # lost hedge race): counted apart from errors
+            self._count(model, "cancelled")
+            breaker.release(admission)
+            raise
+        breaker.record(True, time.monotonic() - start, admission)
+        return text
+
+    async def cached_text(self, *, model: str, contents, config) -> Optional[str]:
+        """The cached response for this generate call, if there is one (never calls the backend)."""
+        if self.cache is None:
+            return None
+        return await self.cache.aget(make_cache_key(model, contents, config))
+
+    async def generate_text(
+        self,
+        *,
+        model: str,
+        contents,
+        config,
+        cache: bool = False,
+        timeout_s: Optional[float] = None,
+        cache_lookup: bool = True,
+    ) -> str:
+        """
+        Run one generate call and return the response text.
+
+        With cache=True, identical (model, config, prompt) calls are served from
+        the response cache instead of hitting the backend; only answers from the
+        requested model itself are stored (cache_lookup=False: store only, for a
+        caller that already checked cached_text()). `timeout_s` bounds each
+        attempt; a timeout counts against the model's breaker like a quota error.
+        """
+        if self.backend is None:
+            raise RuntimeError("GenAI client not initialized. Set GEMINI_API_KEY in env.")
+
+        cache_key = None
+        if cache and self.cache is not None:
+            cache_key = make_cache_key(model, contents, config)
+            cached = await self.cache.aget(cache_key) if cache_lookup else None
+            if cached is not None:
+                return cached
+
+        target, admission = self._route(model)
+        try:
+            text = await self._generate_on(target, admission, contents, config, timeout_s)
+        except Exception as e:
+            if isinstance(e, DeadlineExceeded) or not is_retryable_error(e):
+                raise
+            # Quota / overload on this model: retry once on the next available fallback
+            try:
+                target, admission = self._route(model, skip={target})
+            except ModelUnavailableError:
+                raise e
+            text = await self._generate_on(target, admission, contents, config, timeout_s)
+
+        # A fallback model's answer is not cached under the requested model's key,
+        # or later calls would keep getting it after the primary recovers
+        if cache_key is not None and text and target == model:
+            await self.cache.aset(cache_key, text)
+        return text
+
+    async def stream_text(self, *, model: str, contents, config) -> AsyncIterator[str]:
+        """
+        Stream response text chunks as the model produces them (never cached).
+        The breaker judges a stream by its time to first chunk; every chunk must
+        arrive within the request's deadline budget.
+        """
+        if self.backend is None:
+            raise RuntimeError("GenAI client not initialized. Set GEMINI_API_KEY in env.")
+
+        model, admission = self._route(model)
+        breaker = self.breakers.get(model)
+        self._count(model, "calls")
+        async with self._semaphore(model):
+            self._counters[model]["in_flight"] += 1
+            start = time.monotonic()
+            recorded = False
+            chunks = self.backend.stream(model=model, contents=contents, config=config).__aiter__()
+            try:
+                while True:
+                    timeout = time_left()
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        raise_if_expired()
+                        raise
+                    if not recorded:
+                        breaker.record(True, time.monotonic() - start, admission)
+                        recorded = True
+                    yield chunk
+            except Exception as e:
+                self._count(model, "errors")
+                if not recorded and not isinstance(e, DeadlineExceeded):
+                    breaker.record(not is_retryable_error(e), time.monotonic() - start, admission)
+                    recorded = True
+                raise
+            finally:
+                if not recorded:
+                    breaker.release(admission)
+                self._counters[model]["in_flight"] -= 1
+                if hasattr(chunks, "aclose"):
+                    await chunks.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "models": {m: dict(c) for m, c in self._counters.items()},
+            "breakers": self.breakers.stats(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+    async def aclose(self):
+        if self.backend is not None:
+            await self.backend.aclose()
+        if self.cache is not None:
+            self.cache.close()
+
+
+# --- Process-wide gateway ---
+_gateway: Optional[LLMGateway] = None
+
+
+def build_response_cache() -> LLMResponseCache:
+    disk = None
+    if CACHE_DB_PATH:
+        try:
+            disk = SQLiteCacheTier(CACHE_DB_PATH, ttl_s=CACHE_DISK_TTL_S)
+        except Exception as e:
+            print(f"Warning: LLM disk cache disabled: {e}")
+    return LLMResponseCache(memory=TTLCache(CACHE_MAX_ENTRIES, CACHE_TTL_S), disk=disk)
+
+
+def _build_default_gateway() -> LLMGateway:
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        return LLMGateway(backend=None)
+    try:
+        return LLMGateway(backend=GenAIBackend(api_key), cache=build_response_cache())
+    except Exception as e:
+        print(f"Warning: Gemini client init failed: {e}")
+        return LLMGateway(backend=None)
+
+
+def get_gateway() -> LLMGateway:
+    global _gateway
+    if _gateway is None:
+        _gateway = _build_default_gateway()
+    return _gateway
+
+
+def set_gateway(gateway: Optional[LLMGateway]):
+    """Replace the process-wide gateway (e.g. with a FakeBackend for benchmarks)."""
+    global _gateway
+    _gateway = gateway
+
+
+async def generate_text(*, model: str, contents, config, cache: bool = False, timeout_s: Optional[float] = None) -> str:
+    """Shortcut for get_gateway().generate_text(...)."""
+    return await get_gateway().generate_text(
+        model=model, contents=contents, config=config, cache=cache, timeout_s=timeout_s
+    )
+
+
+def stream_text(*, model: str, contents, config) -> AsyncIterator[str]:
+    """Shortcut for get_gateway().stream_text(...)."""
+    return get_gateway().stream_text(model=model, contents=contents, config=config)
@@ -0,0 +1,376 @@
+"""
+Task-based model routing.
+
+Call sites name the kind of work (classify, numeric estimate, narrative, long
+structured report, multi-path reasoning) instead of a model. Each task maps to
+a tier, and each tier fixes the model, latency budget and price used for cost
+reporting, plus a default temperature and output cap that apply only where the
+call site leaves them unset (max_output_tokens None = no cap).
+
+Tasks listed in the hedging table are hedged: if the call has not returned by
+the given percentile of the task's observed latency, a second request goes to
+the same (or a named faster) model and the first one to finish wins; the other
+is cancelled.
+
+The table is configurable: set LLM_ROUTING_FILE to a JSON file like
+    {"tiers": {"lite": {"model": "gemini-2.0-flash-lite"}}, "tasks": {"narrative": "lite"},
+     "hedging": {"narrative": {"percentile": 0.9}}}
+which is merged over the defaults below, or call configure_routing() at runtime.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Optional
+
+from google.genai import types
+
+from core.llm_gateway import get_gateway
+
+TASK_CLASSIFY = "classify"
+TASK_NUMERIC_ESTIMATE = "numeric_estimate"
+TASK_NARRATIVE = "narrative"
+TASK_STRUCTURED_REPORT = "structured_report"
+TASK_REASONING = "reasoning"
+
+# Prices are USD per 1M tokens and only feed the cost estimate in stats()
+DEFAULT_TIERS: Dict[str, Dict[str, Any]] = {
+    "lite": {
+        "model": "gemini-2.0-flash", "latency_budget_s": 8.0, "max_output_tokens": 64,
+        "temperature": 0.0, "input_usd_per_m": 0.10, "output_usd_per_m": 0.40,
+    },
+    "fast": {
+        "model": "gemini-2.0-flash-exp", "latency_budget_s": 30.0, "max_output_tokens": None,
+        "temperature": 0.8, "input_usd_per_m": 0.10, "output_usd_per_m": 0.40,
+    },
+    "pro": {
+        "model": "gemini-2.5-pro", "latency_budget_s": 90.0, "max_output_tokens": None,
+        "temperature": 0.7, "input_usd_per_m": 1.25, "output_usd_per_m": 10.0,
+    },
+}
+DEFAULT_TASK_TIERS: Dict[str, str] = {
+    TASK_CLASSIFY: "lite",
+    TASK_NUMERIC_ESTIMATE: "lite",
+    TASK_NARRATIVE: "fast",
+    TASK_STRUCTURED_REPORT: "fast",
+    TASK_REASONING: "pro",
+}
+# Hedged tasks: fire a second request once the call is slower than `percentile`
+# of recent latencies for the task (`model`: hedge model, None = same model)
+DEFAULT_HEDGING: Dict[str, Dict[str, Any]] = {
+    TASK_STRUCTURED_REPORT: {"percentile": 0.95, "model": None},
+}
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY_S = 0.05
+ROUTING_FILE = os.environ.get("LLM_ROUTING_FILE")
+
+LATENCY_SAMPLES = 256
+CHARS_PER_TOKEN = 4
+
+
+def _text_chars(value) -> int:
+    """Approximate prompt size in characters (str, Content, Part or lists of them)."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_text_chars(v) for v in value)
+    parts = getattr(value, "parts", None)
+    if parts is not None:
+        return _text_chars(parts)
+    text = getattr(value, "text", None)
+    if text is not None:
+        return len(text)
+    return len(str(value))
+
+
+class TaskStats:
+    """
+    Call count, latency samples and estimated tokens/cost for one task. The
+    hedge delay uses its own samples: successful calls that reached the model,
+    so cache hits and fast failures do not pull it down. A call cancelled by its
+    caller is counted apart from errors, as is the losing leg of a hedge race.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.cancelled = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost_usd = 0.0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.hedges_cancelled = 0
+        self.latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+        self.model_latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        """Model latency (seconds) at quantile `q` of recent successful calls, or None with too few samples."""
+        if len(self.model_latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.model_latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def record_cache_hit(self, latency_s: float):
+        """A call answered from the response cache: no tokens spent, no model latency sample."""
+        self.calls += 1
+        self.cache_hits += 1
+        self.latencies.append(latency_s)
+
+    def record_cancelled(self):
+        """A call its caller stopped waiting for: neither an error nor a latency sample."""
+        self.calls += 1
+        self.cancelled += 1
+
+    def record(self, tier: Dict[str, Any], latency_s: float, prompt_chars: int, output_chars: int, ok: bool):
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        self.latencies.append(latency_s)
+        if ok:
+            self.model_latencies.append(latency_s)
+        tokens_in = prompt_chars // CHARS_PER_TOKEN
+        tokens_out = output_chars // CHARS_PER_TOKEN
+        self.input_tokens += tokens_in
+        self.output_tokens += tokens_out
+        self.cost_usd += (tokens_in * tier["input_usd_per_m"] + tokens_out * tier["output_usd_per_m"]) / 1e6
+
+    def as_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+
+        def pct(q: float) -> Optional[float]:
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1) if ordered else None
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "cancelled": self.cancelled,
+            "latency_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0)},
+            "est_input_tokens": self.input_tokens,
+            "est_output_tokens": self.output_tokens,
+            "est_cost_usd": round(self.cost_usd, 6),
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+            "hedges_cancelled": self.hedges_cancelled,
+        }
+
+
+class ModelRouter:
+    """Maps tasks to tiers and runs gateway calls with the tier's settings."""
+
+    def __init__(
+        self,
+        tiers: Optional[Dict[str, Dict]] = None,
+        tasks: Optional[Dict[str, str]] = None,
+        hedging: Optional[Dict[str, Optional[Dict]]] = None,
+    ):
+        self.tiers = {name: dict(tier) for name, tier in DEFAULT_TIERS.items()}
+        self.tasks = dict(DEFAULT_TASK_TIERS)
+        self.hedging = {task: dict(h) for task, h in DEFAULT_HEDGING.items()}
+        self._stats: Dict[str, TaskStats] = {}
+        self.configure(tiers, tasks, hedging)
+
+    def configure(
+        self,
+        tiers: Optional[Dict[str, Dict]] = None,
+        tasks: Optional[Dict[str, str]] = None,
+        hedging: Optional[Dict[str, Optional[Dict]]] = None,
+    ):
+        """
+        Merge tier settings, task->tier assignments and per-task hedging over the
+        current table. A hedging entry of None turns hedging off for that task.
+        """
+        for name, settings in (tiers or {}).items():
+            self.tiers[name] = {**self.tiers.get(name, DEFAULT_TIERS["fast"]), **settings}
+        for task, tier in (tasks or {}).items():
+            if tier not in self.tiers:
+                raise ValueError(f"Unknown model tier '{tier}' for task '{task}'")
+            self.tasks[task] = tier
+        for task, settings in (hedging or {}).items():
+            if settings is None:
+                self.hedging.pop(task, None)
+            else:
+                self.hedging[task] = {"percentile": 0.95, "model": None, **settings}
+
+    def tier_for(self, task: str) -> Dict[str, Any]:
+        if task not in self.tasks:
+            raise ValueError(f"No model tier configured for task '{task}'")
+        return self.tiers[self.tasks[task]]
+
+    def _config_for(self, tier: Dict[str, Any], config: Optional[types.GenerateContentConfig]):
+        """The call's config with the tier's defaults filled in where the caller set nothing."""
+        config = config or types.GenerateContentConfig()
+        defaults = {key: tier[key] for key in ("temperature", "max_output_tokens") if getattr(config, key) is None}
+        return config.model_copy(update=defaults) if defaults else config
+
+    def _task_stats(self, task: str) -> TaskStats:
+        return self._stats.setdefault(task, TaskStats())
+
+    async def generate(
+        self,
+        task: str,
+        *,
+        contents,
+        config: Optional[types.GenerateContentConfig] = None,
+        cache: bool = False,
+        model: Optional[str] = None,
+    ) -> str:
+        """
+        Run one generate call for `task` on its tier's model (or `model`, if given),
+        bounded by the tier's latency budget.
+        """
+        tier = self.tier_for(task)
+        config = self._config_for(tier, config)
+        prompt_chars = _text_chars(contents) + _text_chars(config.system_instruction)
+        stats = self._task_stats(task)
+        model = model or tier["model"]
+
+        start = time.monotonic()
+        if cache:
+            # Checked here so a hit is not mistaken for a (very fast) model call
+            cached = await get_gateway().cached_text(model=model, contents=contents, config=config)
+            if cached is not None:
+                stats.record_cache_hit(time.monotonic() - start)
+                return cached
+
+        def call(on_model: str):
+            return get_gateway().generate_text(
+                model=on_model, contents=contents, config=config, cache=cache,
+                timeout_s=tier["latency_budget_s"], cache_lookup=False,
+            )
+
+        hedge = self.hedging.get(task)
+        hedge_delay = stats.latency_percentile(hedge["percentile"]) if hedge else None
+        start = time.monotonic()
+        text = ""
+        ok = False
+        cancelled = False
+        try:
+            if hedge_delay is None:
+                text = await call(model)
+            else:
+                text = await self._hedged(stats, call, model, hedge["model"] or model, max(hedge_delay, HEDGE_MIN_DELAY_S))
+            ok = True
+            return text
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            if cancelled:
+                stats.record_cancelled()
+            else:
+                stats.record(tier, time.monotonic() - start, prompt_chars, len(text or ""), ok)
+
+    async def _hedged(self, stats: TaskStats, call, model: str, hedge_model: str, delay_s: float) -> str:
+        """Run call(model); if it is still pending after `delay_s`, race it against call(hedge_model)."""
+        primary = asyncio.ensure_future(call(model))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay_s)
+            if done:
+                return primary.result()
+
+            stats.hedges_fired += 1
+            hedge = asyncio.ensure_future(call(hedge_model))
+            pending = {primary, hedge}
+            try:
+                while True:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    # Take the first success; an error only counts once both have finished
+                    winner = next((t for t in done if not t.exception()), None)
+                    if winner is not None:
+                        if winner is hedge:
+                            stats.hedges_won += 1
+                        # The loser is cancelled below; it is not a failed call
+                        if not (primary if winner is hedge else hedge).done():
+                            stats.hedges_cancelled += 1
+                        return winner.result()
+                    if not pending:
+                        return primary.result()
+            finally:
+                hedge.cancel()
+        finally:
+            primary.cancel()
+
+    async def stream(
+        self,
+        task: str,
+        *,
+        contents,
+        config: Optional[types.GenerateContentConfig] = None,
+    ) -> AsyncIterator[str]:
+        """Streaming variant of generate(); latency is the time to the full response."""
+        tier = self.tier_for(task)
+        config = self._config_for(tier, config)
+        prompt_chars = _text_chars(contents) + _text_chars(config.system_instruction)
+        start = time.monotonic()
+        output_chars = 0
+        ok = False
+        cancelled = False
+        try:
+            async for chunk in get_gateway().stream_text(model=tier["model"], contents=contents, config=config):
+                output_chars += len(chunk)
+                yield chunk
+            ok = True
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            if cancelled:
+                self._task_stats(task).record_cancelled()
+            else:
+                self._task_stats(task).record(tier, time.monotonic() - start, prompt_chars, output_chars, ok)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "routes": {
+                task: {"tier": tier, "model": self.tiers[tier]["model"], "hedging": self.hedging.get(task)}
+                for task, tier in self.tasks.items()
+            },
+            "tasks": {task: s.as_dict() for task, s in self._stats.items()},
+        }
+
+
+# --- Process-wide router ---
+_router: Optional[ModelRouter] = None
+
+
+def _load_routing_file(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Warning: could not load LLM routing file {path}: {e}")
+        return {}
+
+
+def get_router() -> ModelRouter:
+    global _router
+    if _router is None:
+        overrides = _load_routing_file(ROUTING_FILE) if ROUTING_FILE else {}
+        _router = ModelRouter(overrides.get("tiers"), overrides.get("tasks"), overrides.get("hedging"))
+    return _router
+
+
+def configure_routing(
+    tiers: Optional[Dict[str, Dict]] = None,
+    tasks: Optional[Dict[str, str]] = None,
+    hedging: Optional[Dict[str, Optional[Dict]]] = None,
+):
+    """Adjust the process-wide routing table (tier settings, task->tier, hedging)."""
+    get_router().configure(tiers, tasks, hedging)
+
+
+async def generate_for_task(task: str, *, contents, config=None, cache: bool = False, model: Optional[str] = None) -> str:
+    """Shortcut for get_router().generate(...)."""
+    return await get_router().generate(task, contents=contents, config=config, cache=cache, model=model)
+
+
+def stream_for_task(task: str, *, contents, config=None) -> AsyncIterator[str]:
+    """Shortcut for get_router().stream(...)."""
+    return get_router().stream(task, contents=contents, config=config)
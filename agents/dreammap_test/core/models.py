@@ -1,7 +1,7 @@
 # GoalAura_AI/core/models.py (Snippet)
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 # Final Output Schema
 class DreamRoadmap(BaseModel):
@@ -20,6 +20,17 @@ class DreamRoadmap(BaseModel):
     challenges: List[str] = Field(description="Real-world challenges and obstacles to expect.")
     alternatives: Optional[List[str]] = Field(default=None, description="Alternative approaches if dream is unrealistic.")
     proTips: List[str] = Field(description="Practical tips and insider knowledge for achieving this goal.")
+    goalImpact: Optional[List[Dict[str, Any]]] = Field(default=None, description="Month-by-month simulation of this dream competing with the user's existing goals.")
+
+
+class ExistingGoal(BaseModel):
+    """A savings goal the user is already working towards."""
+    name: str = Field(description="Goal name.")
+    target_amount: float = Field(gt=0, description="Target amount in INR.")
+    deadline_months: int = Field(gt=0, description="Months until the goal is due.")
+    saved_amount: float = Field(default=0, ge=0, description="Amount already saved for this goal.")
+    priority: Optional[int] = Field(default=None, description="Lower is funded first (priority allocation).")
+    weight: Optional[float] = Field(default=None, gt=0, description="Share weight (proportional allocation).")
 
 
 class UserComparisonInsights(BaseModel):
@@ -3,78 +3,91 @@ Opportunity Cost Agent - Visualizes time vs investment trade-offs
 """
 
 import os
+from typing import AsyncIterator
+
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
 
-load_dotenv()
-
-# Initialize client
-try:
-    client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-except Exception as e:
-    client = None
-    print(f"Warning: Gemini client init failed: {e}")
+from core.model_router import TASK_NARRATIVE, generate_for_task, stream_for_task
+from core.singleflight import SingleFlight, normalize_key_text
+from tools.finance_math import EQUITY_ANNUAL_RETURN_RATE, WORK_HOURS_PER_DAY, future_values, time_cost_hours
 
+load_dotenv()
 
-def _safe_generate_content(*, model: str, contents, config):
-    """Wrap model call to provide clearer errors when client is not initialized."""
-    if client is None:
-        raise RuntimeError("GenAI client not initialized. Set GEMINI_API_KEY in env.")
-    return client.models.generate_content(model=model, contents=contents, config=config)
+_opportunity_flight = SingleFlight("orchestrate_opportunity_cost")
 
 
-def orchestrate_opportunity_cost(
+async def orchestrate_opportunity_cost(
     purchase_item: str,
     purchase_cost: float,
     user_hourly_wage: float
 ) -> str:
     """
-    Calculate and visualize opportunity cost of a purchase.
-    
-    Args:
-        purchase_item: Name of the item being considered
-        purchase_cost: Cost in INR
-        user_hourly_wage: User's hourly wage in INR
-    
-    Returns:
-        Human-friendly visualization message
+    Coalescing entry point: identical in-flight purchases share one generation.
     """
-    
+    key = (normalize_key_text(purchase_item), purchase_cost, user_hourly_wage)
+    return await _opportunity_flight.do(
+        key,
+        lambda: _orchestrate_opportunity_cost(purchase_item, purchase_cost, user_hourly_wage),
+        on_timeout=lambda: fast_opportunity_cost(purchase_item, purchase_cost, user_hourly_wage),
+    )
+
+
+def _opportunity_metrics(purchase_cost: float, user_hourly_wage: float) -> dict:
     # Calculate work hours needed
-    hours_to_work = purchase_cost / user_hourly_wage if user_hourly_wage > 0 else 0
-    days_to_work = hours_to_work / 8  # Assuming 8-hour workday
-    
-    # Calculate investment opportunity cost (assuming 12% annual return)
-    annual_return_rate = 0.12
-    
-    # Future value if invested for different periods
-    fv_1_year = purchase_cost * (1 + annual_return_rate)
-    fv_5_years = purchase_cost * ((1 + annual_return_rate) ** 5)
-    fv_10_years = purchase_cost * ((1 + annual_return_rate) ** 10)
-    
-    # If AI is unavailable, return calculated fallback
-    if not os.environ.get("GEMINI_API_KEY"):
-        return f"""
+    hours_to_work = time_cost_hours(purchase_cost, user_hourly_wage)
+    days_to_work = hours_to_work / WORK_HOURS_PER_DAY
+
+    # Future value if invested for 1, 5 and 10 years (assuming 12% annual return)
+    fv_1_year, fv_5_years, fv_10_years = future_values(purchase_cost, EQUITY_ANNUAL_RETURN_RATE).tolist()
+    return {
+        "hours_to_work": hours_to_work,
+        "days_to_work": days_to_work,
+        "fv_1_year": fv_1_year,
+        "fv_5_years": fv_5_years,
+        "fv_10_years": fv_10_years,
+    }
+
+
+def _cost_lines(purchase_item: str, purchase_cost: float, m: dict) -> str:
+    """Locally computed time-cost and future-value lines."""
+    return f"""
 ⏰ TIME COST ANALYSIS:
 To afford {purchase_item} (₹{purchase_cost:,.0f}), you need to work:
-• {hours_to_work:.1f} hours ({days_to_work:.1f} working days)
-• That's {days_to_work/5:.1f} weeks of your life
+• {m['hours_to_work']:.1f} hours ({m['days_to_work']:.1f} working days)
+• That's {m['days_to_work']/5:.1f} weeks of your life
 
 💰 INVESTMENT OPPORTUNITY COST:
 If you invested ₹{purchase_cost:,.0f} instead:
-• After 1 year: ₹{fv_1_year:,.0f} (gain: ₹{fv_1_year - purchase_cost:,.0f})
-• After 5 years: ₹{fv_5_years:,.0f} (gain: ₹{fv_5_years - purchase_cost:,.0f})
-• After 10 years: ₹{fv_10_years:,.0f} (gain: ₹{fv_10_years - purchase_cost:,.0f})
+• After 1 year: ₹{m['fv_1_year']:,.0f} (gain: ₹{m['fv_1_year'] - purchase_cost:,.0f})
+• After 5 years: ₹{m['fv_5_years']:,.0f} (gain: ₹{m['fv_5_years'] - purchase_cost:,.0f})
+• After 10 years: ₹{m['fv_10_years']:,.0f} (gain: ₹{m['fv_10_years'] - purchase_cost:,.0f})
+"""
+
 
+def _perspective_lines(purchase_item: str, m: dict) -> str:
+    return f"""
 🤔 PERSPECTIVE:
-Is {purchase_item} worth {days_to_work:.1f} days of your work?
-Or would you prefer ₹{fv_5_years:,.0f} in 5 years?
+Is {purchase_item} worth {m['days_to_work']:.1f} days of your work?
+Or would you prefer ₹{m['fv_5_years']:,.0f} in 5 years?
 """
-    
-    # Use AI to generate engaging visualization
-    model_name = "gemini-2.0-flash-exp"
-    prompt = f"""
+
+
+def _alternative_lines(purchase_cost: float) -> str:
+    return f"""
+💡 ALTERNATIVE:
+With ₹{purchase_cost:,.0f}, you could:
+• Build an emergency fund
+• Invest for long-term wealth
+• Save for a bigger goal
+• Experience something memorable
+
+The choice is yours, but now you know the TRUE cost.
+"""
+
+
+def _opportunity_prompt(purchase_item: str, purchase_cost: float, user_hourly_wage: float, m: dict) -> str:
+    return f"""
 You are a financial advisor helping someone understand the TRUE COST of a purchase.
 
 **Purchase Details:**
@@ -83,14 +96,14 @@ You are a financial advisor helping someone understand the TRUE COST of a purcha
 - User's Hourly Wage: ₹{user_hourly_wage:,.0f}
 
 **Calculated Metrics:**
-- Hours of work needed: {hours_to_work:.1f} hours
-- Working days needed: {days_to_work:.1f} days
-- Weeks of work: {days_to_work/5:.1f} weeks
+- Hours of work needed: {m['hours_to_work']:.1f} hours
+- Working days needed: {m['days_to_work']:.1f} days
+- Weeks of work: {m['days_to_work']/5:.1f} weeks
 
 **Investment Opportunity Cost (12% annual return):**
-- Value after 1 year: ₹{fv_1_year:,.0f}
-- Value after 5 years: ₹{fv_5_years:,.0f}
-- Value after 10 years: ₹{fv_10_years:,.0f}
+- Value after 1 year: ₹{m['fv_1_year']:,.0f}
+- Value after 5 years: ₹{m['fv_5_years']:,.0f}
+- Value after 10 years: ₹{m['fv_10_years']:,.0f}
 
 **Task:**
 Create a compelling, human-friendly message that helps the user visualize the opportunity cost.
@@ -104,42 +117,106 @@ Include:
 Be conversational, use emojis, and make it relatable. Keep it under 200 words.
 Focus on making them FEEL the opportunity cost, not just see numbers.
 """
+
+
+# Appended to the prompt in streaming mode, where the numbers are already on screen
+STREAMING_PROMPT_SUFFIX = """
+The user has ALREADY been shown the exact time-cost and investment numbers above.
+Do not list them again - reference them briefly and go straight to the
+thought-provoking question and the alternative perspective.
+"""
+
+
+async def _orchestrate_opportunity_cost(
+    purchase_item: str,
+    purchase_cost: float,
+    user_hourly_wage: float
+) -> str:
+    """
+    Calculate and visualize opportunity cost of a purchase.
+    
+    Args:
+        purchase_item: Name of the item being considered
+        purchase_cost: Cost in INR
+        user_hourly_wage: User's hourly wage in INR
+    
+    Returns:
+        Human-friendly visualization message
+    """
+    
+    m = _opportunity_metrics(purchase_cost, user_hourly_wage)
+    
+    # If AI is unavailable, return calculated fallback
+    if not os.environ.get("GEMINI_API_KEY"):
+        return _cost_lines(purchase_item, purchase_cost, m) + _perspective_lines(purchase_item, m)
+    
+    # Use AI to generate engaging visualization
+    prompt = _opportunity_prompt(purchase_item, purchase_cost, user_hourly_wage, m)
     
     try:
-        response = _safe_generate_content(
-            model=model_name,
+        response_text = await generate_for_task(
+            TASK_NARRATIVE,
             contents=[types.Content(role="user", parts=[types.Part.from_text(text=prompt)])],
             config=types.GenerateContentConfig(temperature=0.8),
         )
         
-        return response.text
+        return response_text
         
     except Exception as e:
         print(f"Opportunity cost AI generation failed: {e}")
         
         # Return fallback with calculations
-        return f"""
-⏰ TIME COST ANALYSIS:
-To afford {purchase_item} (₹{purchase_cost:,.0f}), you need to work:
-• {hours_to_work:.1f} hours ({days_to_work:.1f} working days)
-• That's {days_to_work/5:.1f} weeks of your life
+        return fast_opportunity_cost(purchase_item, purchase_cost, user_hourly_wage)
 
-💰 INVESTMENT OPPORTUNITY COST:
-If you invested ₹{purchase_cost:,.0f} instead:
-• After 1 year: ₹{fv_1_year:,.0f} (gain: ₹{fv_1_year - purchase_cost:,.0f})
-• After 5 years: ₹{fv_5_years:,.0f} (gain: ₹{fv_5_years - purchase_cost:,.0f})
-• After 10 years: ₹{fv_10_years:,.0f} (gain: ₹{fv_10_years - purchase_cost:,.0f})
 
-🤔 PERSPECTIVE:
-Is {purchase_item} worth {days_to_work:.1f} days of your work?
-Or would you prefer ₹{fv_5_years:,.0f} in 5 years?
+def fast_opportunity_cost(
+    purchase_item: str,
+    purchase_cost: float,
+    user_hourly_wage: float
+) -> str:
+    """Deterministic visualization (mode=fast): the calculated message, no LLM call."""
+    m = _opportunity_metrics(purchase_cost, user_hourly_wage)
+    return (
+        _cost_lines(purchase_item, purchase_cost, m)
+        + _perspective_lines(purchase_item, m)
+        + _alternative_lines(purchase_cost)
+    )
 
-💡 ALTERNATIVE:
-With ₹{purchase_cost:,.0f}, you could:
-• Build an emergency fund
-• Invest for long-term wealth
-• Save for a bigger goal
-• Experience something memorable
 
-The choice is yours, but now you know the TRUE cost.
-"""
\ No newline at end of file
+async def stream_opportunity_cost(
+    purchase_item: str,
+    purchase_cost: float,
+    user_hourly_wage: float
+) -> AsyncIterator[str]:
+    """
+    Streaming variant of orchestrate_opportunity_cost.
+
+    Yields the locally computed time-cost and future-value lines first, then the
+    model's narrative chunk by chunk as it is generated. If the model is
+    unavailable or fails part-way, the calculated perspective/alternative text
+    completes the message instead.
+    """
+    m = _opportunity_metrics(purchase_cost, user_hourly_wage)
+    yield _cost_lines(purchase_item, purchase_cost, m)
+
+    if not os.environ.get("GEMINI_API_KEY"):
+        yield _perspective_lines(purchase_item, m)
+        return
+
+    prompt = _opportunity_prompt(purchase_item, purchase_cost, user_hourly_wage, m) + STREAMING_PROMPT_SUFFIX
+    streamed_any = False
+    try:
+        async for chunk in stream_for_task(
+            TASK_NARRATIVE,
+            contents=[types.Content(role="user", parts=[types.Part.from_text(text=prompt)])],
+            config=types.GenerateContentConfig(temperature=0.8),
+        ):
+            if not streamed_any:
+                chunk = "\n" + chunk
+                streamed_any = True
+            yield chunk
+    except Exception as e:
+        print(f"Streamed opportunity cost generation failed: {e}")
+        if not streamed_any:
+            yield _perspective_lines(purchase_item, m)
+        yield _alternative_lines(purchase_cost)
@@ -1,99 +1,100 @@
 # core/quantum_tree.py
+import asyncio
 import os
-import time
 import json
 from typing import Dict, Any, List, Optional
 
+import numpy as np
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
 
-# Use existing _safe_generate_content from your code or import if it's in a shared module.
-# If it's in core.agent you can import; otherwise paste _safe_generate_content here.
-# For safety, we replicate a tiny wrapper that uses the global `client` if available.
+from core.model_router import TASK_REASONING, generate_for_task
+from core.rate_limiter import RateLimitExceeded, TokenBucketLimiter
+from tools.cost_engine import TEMPLATES, cheap_classify
+from tools.finance_math import (
+    DEFAULT_ANNUAL_RETURN_RATE,
+    FV_HORIZONS_YEARS,
+    NEVER_MONTHS,
+    depreciated_value,
+    future_value,
+    future_values,
+    months_to_save,
+)
+from tools.financial_tools import parse_price_inr
+from tools.goal_simulator import DEFAULT_HORIZON_MONTHS, simulate_goals
+from tools.monte_carlo import MC_DEFAULT_PATHS, MC_DEFAULT_SEED, simulate_purchase_scenarios
 
 load_dotenv()
 
-# Initialize Gemini client similarly to your other files (safe guard)
-try:
-    client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-except Exception as e:
-    client = None
-    print(f"Warning: Gemini client init failed in quantum_tree: {e}")
-
-def _safe_generate_content(*, model: str, contents, config):
-    if client is None:
-        raise RuntimeError("GenAI client not initialized. Set GEMINI_API_KEY in env.")
-    return client.models.generate_content(model=model, contents=contents, config=config)
-
-# Simple in-process rate limiter (per-process). Keeps up to 2 calls per 60s.
-_rate_limit_state = {"timestamps": []}
-_RATE_LIMIT_MAX = 2
-_RATE_LIMIT_WINDOW = 60  # seconds
-
-def _check_rate_limit():
-    now = time.time()
-    ts = _rate_limit_state["timestamps"]
-    # filter to last window
-    ts[:] = [t for t in ts if now - t < _RATE_LIMIT_WINDOW]
-    if len(ts) >= _RATE_LIMIT_MAX:
-        # Too many requests in window
-        return False, _RATE_LIMIT_WINDOW - (now - ts[0])
-    ts.append(now)
-    return True, 0.0
+# Token buckets shared by all workers on the host: 2 calls per 60s per user,
+# 20 per 60s overall. Set QDT_RATE_LIMIT_MAX_WAIT_S to queue instead of failing.
+QDT_RATE_LIMIT_PER_USER = float(os.environ.get("QDT_RATE_LIMIT_PER_USER", "2"))
+QDT_RATE_LIMIT_GLOBAL = float(os.environ.get("QDT_RATE_LIMIT_GLOBAL", "20"))
+QDT_RATE_LIMIT_PERIOD_S = 60.0
+QDT_RATE_LIMIT_MAX_WAIT_S = float(os.environ.get("QDT_RATE_LIMIT_MAX_WAIT_S", "0"))
+
+qdt_rate_limiter = TokenBucketLimiter(
+    "quantum_decision_tree",
+    per_user=QDT_RATE_LIMIT_PER_USER,
+    global_limit=QDT_RATE_LIMIT_GLOBAL,
+    period_s=QDT_RATE_LIMIT_PERIOD_S,
+    max_waiters=int(os.environ.get("QDT_RATE_LIMIT_MAX_WAITERS", "16")),
+)
 
 # -------------------------
 # Local numeric helper funcs
 # -------------------------
-def future_value(amount: float, annual_rate: float, years: float) -> float:
-    return amount * ((1 + annual_rate) ** years)
-
-def months_to_save(amount: float, monthly_saved: float) -> int:
-    if monthly_saved <= 0:
-        return 9999
-    return int((amount + monthly_saved - 1) // monthly_saved)
-
 def percent_of(value: float, base: float) -> float:
     if base <= 0:
         return 0.0
     return round((value / base) * 100, 2)
 
-def simulate_goal_impact(existing_goals: List[Dict[str, Any]], delay_months: int, purchase_cost: float, monthly_savings: float) -> List[Dict[str, Any]]:
+def simulate_goal_impact(
+    existing_goals: List[Dict[str, Any]],
+    delay_months: int,
+    purchase_cost: float,
+    monthly_savings: float,
+    strategy: str = "priority",
+    horizon_months: int = DEFAULT_HORIZON_MONTHS
+) -> List[Dict[str, Any]]:
     """
-    Very simple simulation: reduce monthly savings for `delay_months` and see new completion months.
-    existing_goals: [{"name":..,"target_amount":..,"deadline_months":..}]
+    Month-by-month simulation of the goals competing for the same monthly savings,
+    with and without the purchase. Buying now diverts purchase_cost / delay_months
+    from savings for `delay_months` months (anything not covered is paid back from
+    later months before goals receive money again).
+    existing_goals: [{"name":..,"target_amount":..,"deadline_months":.., optional "priority","weight","saved_amount"}]
     """
+    if not existing_goals:
+        return []
+    delay_months = max(1, delay_months)
+    savings_now = np.full(horizon_months, float(monthly_savings))
+    savings_after = savings_now.copy()
+    savings_after[:delay_months] -= purchase_cost / delay_months
+
+    now = simulate_goals(existing_goals, savings_now, horizon_months, strategy)
+    after = simulate_goals(existing_goals, savings_after, horizon_months, strategy)
+
     out = []
-    for g in existing_goals:
-        target = float(g.get("target_amount", 0))
-        deadline = int(g.get("deadline_months", 12))
-        # naive current monthly contribution
-        if monthly_savings <= 0:
-            months_now = 9999
-        else:
-            months_now = max(1, int((target + monthly_savings - 1) // monthly_savings))
-        # after spending purchase_cost, assume user's monthly savings reduces proportionally for one period:
-        if monthly_savings <= 0:
-            months_after = 9999
-        else:
-            # assume the user diverts the monthly saving equivalent to amortize purchase over delay_months
-            diverted = purchase_cost / max(1, delay_months)
-            effective_monthly = max(0.0, monthly_savings - diverted)
-            months_after = int((target + effective_monthly - 1) // effective_monthly) if effective_monthly > 0 else 9999
+    for g_now, g_after in zip(now, after):
+        months_now = max(1, g_now["completion_month"])
+        months_after = max(1, g_after["completion_month"])
         out.append({
-            "name": g.get("name", "Unnamed Goal"),
-            "target_amount": target,
-            "deadline_months": deadline,
+            "name": g_now["name"],
+            "target_amount": g_now["target_amount"],
+            "deadline_months": g_now["deadline_months"],
             "months_to_complete_now": months_now,
             "months_to_complete_if_purchase_now": months_after,
-            "delay_months_estimated": max(0, months_after - months_now) if months_now < 9999 else None
+            "delay_months_estimated": max(0, months_after - months_now) if months_now < NEVER_MONTHS else None,
+            "meets_deadline_now": g_now["meets_deadline"],
+            "meets_deadline_if_purchase_now": g_after["meets_deadline"],
+            "shortfall_at_deadline_if_purchase_now": g_after["shortfall_at_deadline"],
         })
     return out
 
 # -------------------------
 # Orchestrator function
 # -------------------------
-def orchestrate_quantum_decision_tree(
+async def orchestrate_quantum_decision_tree(
     purchase_item: str,
     purchase_cost: float,
     user_monthly_income: float,
@@ -104,21 +105,27 @@ def orchestrate_quantum_decision_tree(
     emotional_state: Optional[str] = "neutral",
     time_sensitivity: Optional[str] = "normal",  # "urgent","normal","flexible"
     depreciation_rate_ann=0.25,                  # default for electronics (25%/yr)
-    investment_return_rate=0.10,                 # default 10% p.a.
+    investment_return_rate=DEFAULT_ANNUAL_RETURN_RATE,  # default 10% p.a.
     delay_days_options: Optional[List[int]] = None,
-    model_name: str = "gemini-2.5-pro"
+    model_name: Optional[str] = None,
+    mc_paths: int = MC_DEFAULT_PATHS,
+    mc_seed: Optional[int] = MC_DEFAULT_SEED,
+    user_id: str = "anonymous",
+    rate_limit_wait_s: float = QDT_RATE_LIMIT_MAX_WAIT_S
 ) -> Dict[str, Any]:
     """
     Build professional Q-FDT output with minimal Gemini calls:
-    1) perform numeric simulations locally (affordability, future values, goal impact)
+    1) perform numeric simulations locally (affordability, future values, goal impact,
+       and a Monte Carlo of returns/depreciation giving p10/p50/p90 per scenario)
     2) call Gemini once to produce human-friendly executive summary, probability estimates, and final recommendation
     """
 
-    # Rate limiter check
-    ok, retry_after = _check_rate_limit()
-    if not ok:
+    # Rate limiter check (waits in a bounded queue if rate_limit_wait_s > 0)
+    try:
+        await qdt_rate_limiter.acquire(user_id, max_wait_s=rate_limit_wait_s)
+    except RateLimitExceeded as e:
         return {
-            "error": "Rate limit exceeded. Try again in {:.0f} seconds.".format(retry_after)
+            "error": "Rate limit exceeded. Try again in {:.0f} seconds.".format(e.retry_after)
         }
 
     existing_goals = existing_goals or []
@@ -130,21 +137,21 @@ def orchestrate_quantum_decision_tree(
     months_savings_impact = months_to_save(purchase_cost, user_monthly_savings)
 
     # Future value if invested instead of spent
-    fv_1yr = future_value(purchase_cost, investment_return_rate, 1)
-    fv_5yr = future_value(purchase_cost, investment_return_rate, 5)
-    fv_10yr = future_value(purchase_cost, investment_return_rate, 10)
+    fv_1yr, fv_5yr, fv_10yr = future_values(purchase_cost, investment_return_rate).tolist()
 
     # Depreciation projections (naive) for buy-now scenario
-    def depreciated_value(initial, year, rate):
-        return initial * ((1 - rate) ** year) if rate < 1 else 0.0
-
-    dep_1yr = depreciated_value(purchase_cost, 1, depreciation_rate_ann)
-    dep_5yr = depreciated_value(purchase_cost, 5, depreciation_rate_ann)
-    dep_10yr = depreciated_value(purchase_cost, 10, depreciation_rate_ann)
+    dep_1yr, dep_5yr, dep_10yr = depreciated_value(purchase_cost, FV_HORIZONS_YEARS, depreciation_rate_ann).tolist()
 
     # Goal impact simulation using helper
     goals_impact = simulate_goal_impact(existing_goals, max(1, int(delay_days_options[0] / 30)), purchase_cost, user_monthly_savings)
 
+    # Monte Carlo over return and depreciation paths; only the summary reaches the model.
+    # ~85 ms of NumPy at the default path count, so it runs off the event loop
+    monte_carlo = await asyncio.to_thread(
+        simulate_purchase_scenarios,
+        purchase_cost, investment_return_rate, depreciation_rate_ann, n_paths=mc_paths, seed=mc_seed
+    )
+
     # Build the context / facts block to feed Gemini
     facts = {
         "purchase_item": purchase_item,
@@ -155,6 +162,7 @@ def orchestrate_quantum_decision_tree(
         "fv": {"1y": fv_1yr, "5y": fv_5yr, "10y": fv_10yr},
         "depreciation": {"1y": dep_1yr, "5y": dep_5yr, "10y": dep_10yr},
         "goals_impact_summary": goals_impact,
+        "monte_carlo": monte_carlo,
         "behavior": {"impulse_score": impulse_score, "emotional_state": emotional_state, "time_sensitivity": time_sensitivity},
         "assumptions": {"investment_return_rate": investment_return_rate, "depreciation_rate_ann": depreciation_rate_ann}
     }
@@ -173,30 +181,33 @@ def orchestrate_quantum_decision_tree(
         "1) executive_summary: short string (one sentence) recommendation: 'Approved'|'Approved with Conditions'|'Not Recommended'\n"
         "2) affordability_analysis: { disposable_income, purchase_pct_of_disposable, months_savings_impact }\n"
         "3) goal_impact: copy/expand the goals_impact_summary and for each goal provide a short impact_note\n"
-        "4) behavioral_risk: { regret_probability (0-1), rationale }\n"
+        "4) behavioral_risk: { regret_probability (0-1, copy monte_carlo.regret_probability), rationale }\n"
         "5) scenarios: an array with exactly three named scenarios ('Buy Now','Delay 30 days','Do Not Buy'). For each scenario provide:\n"
-        "   - name, net_cost_over_1yr, net_cost_over_5yr, expected_emotional_outcome, probability (0-1), recommendation (short)\n"
+        "   - name, net_cost_over_1yr, net_cost_over_5yr (the p50 of net_cost_1yr / net_cost_5yr from monte_carlo),\n"
+        "     net_cost_range_5yr (its p10 and p90), expected_emotional_outcome,\n"
+        "     probability (0-1, copy prob_best_5yr from monte_carlo), recommendation (short)\n"
         "6) final_recommendation: which scenario and 2 actionable next steps (short list)\n"
         "\nImportant constraints:\n"
-        "- Use the numerical results from the FACTS block for calculations and reasoning. Do NOT invent new numeric values unless noted. If you cannot compute a probability, estimate reasonably and mark as 'estimated'.\n"
+        "- Use the numerical results from the FACTS block for calculations and reasoning. Do NOT invent new numeric values. All probabilities and net costs come from the monte_carlo block.\n"
         "- Keep all numeric fields as numbers (no commas). Return valid JSON ONLY.\n"
         "\nReturn the JSON only, no extra text."
     )
 
     # Make a single Gemini call (one LLM call) to synthesize language, probabilities & summary
     try:
-        response = _safe_generate_content(
-            model=model_name,
-            contents=[types.Content(role="user", parts=[types.Part.from_text(user_prompt)])],
-            config=types.GenerateContentConfig(system_instruction=system_instruction, response_mime_type="application/json")
+        response_text = await generate_for_task(
+            TASK_REASONING,
+            contents=[types.Content(role="user", parts=[types.Part.from_text(text=user_prompt)])],
+            config=types.GenerateContentConfig(system_instruction=system_instruction, response_mime_type="application/json"),
+            model=model_name
         )
-        # response.text is expected to be JSON
+        # response_text is expected to be JSON
         result_json = None
         try:
-            result_json = json.loads(response.text)
+            result_json = json.loads(response_text)
         except Exception:
             # fallback: attempt to extract JSON substring
-            text = response.text
+            text = response_text
             start = text.find("{")
             end = text.rfind("}")
             if start != -1 and end != -1:
@@ -205,7 +216,7 @@ def orchestrate_quantum_decision_tree(
                 except Exception:
                     result_json = {"error": "Failed to parse model JSON output", "raw": text}
             else:
-                result_json = {"error": "No JSON found in model output", "raw": response.text}
+                result_json = {"error": "No JSON found in model output", "raw": response_text}
 
     except Exception as e:
         print(f"Quantum tree model call failed: {e}")
@@ -213,6 +224,7 @@ def orchestrate_quantum_decision_tree(
 
     # Augment result with deterministic numeric fields for transparency
     result_json = result_json or {}
+    result_json["monte_carlo"] = monte_carlo
     result_json.setdefault("debug_facts", {})  # ensure present
     result_json["debug_facts"].update({
         "computed": facts,
@@ -220,3 +232,91 @@ def orchestrate_quantum_decision_tree(
     })
 
     return result_json
+
+
+# -------------------------
+# Deterministic fast path
+# -------------------------
+# Share of savings a purchase may take before it is "Risky", per risk profile
+RISK_SAVINGS_SHARE = {"low": 0.15, "medium": 0.30, "high": 0.50}
+# Share of income assumed to go back into savings after the purchase
+REBUILD_SAVING_RATE = 0.20
+# Rule-based weights for the four QDT paths (Immediate, Delayed, Conservative, Strategic)
+PATH_WEIGHTS = {
+    "Smart": (40, 25, 10, 25),
+    "Neutral": (20, 35, 15, 30),
+    "Risky": (5, 30, 30, 35),
+}
+RECOMMENDED_CHOICE = {
+    "Smart": "Buy Now",
+    "Neutral": "Delay 30 days, then buy only if you still need it",
+    "Risky": "Do Not Buy now - save for it first",
+}
+
+
+def fast_quantum_decision(
+    situation: str,
+    user_monthly_income: float,
+    user_savings_inr: float,
+    risk_profile: str
+) -> Dict[str, Any]:
+    """
+    Deterministic QDT answer (mode=fast) in the same shape as the LLM endpoint.
+
+    The price is read from the situation text, or taken from the dream template
+    the text classifies to. Affordability against savings and the risk profile
+    decides the rating; the narrative is templated. No LLM call.
+    """
+    price = parse_price_inr(situation)
+    price_estimated = price <= 0
+    if price_estimated:
+        price = float(TEMPLATES.get(cheap_classify(situation), TEMPLATES["other"])["base_estimate_inr"])
+
+    share_of_savings = price / user_savings_inr if user_savings_inr > 0 else float("inf")
+    months_of_income = price / user_monthly_income
+    limit = RISK_SAVINGS_SHARE.get((risk_profile or "").strip().lower(), RISK_SAVINGS_SHARE["medium"])
+    if share_of_savings <= limit / 2:
+        rating = "Smart"
+    elif share_of_savings <= limit:
+        rating = "Neutral"
+    else:
+        rating = "Risky"
+
+    fv_5yr = future_value(price, DEFAULT_ANNUAL_RETURN_RATE, 5)
+    rebuild_months = months_to_save(price, user_monthly_income * REBUILD_SAVING_RATE)
+    confidence = 60 if price_estimated else 80
+    pct_text = "all of" if share_of_savings == float("inf") else f"{share_of_savings * 100:.0f}% of"
+    price_text = f"₹{price:,.0f}" + (" (estimated)" if price_estimated else "")
+
+    weights = PATH_WEIGHTS[rating]
+    paths = [
+        ("Immediate Gratification", f"Spend {price_text} now; savings drop to ₹{max(0.0, user_savings_inr - price):,.0f}."),
+        ("Delayed Gratification", "Wait 30 days; if still wanted, buy with a clearer head and a possible better price."),
+        ("Conservative Path", f"Keep the money invested: about ₹{fv_5yr:,.0f} in 5 years at {DEFAULT_ANNUAL_RETURN_RATE:.0%}."),
+        ("Strategic Path", f"Save {REBUILD_SAVING_RATE:.0%} of income for {rebuild_months} months and buy without touching existing savings."),
+    ]
+
+    return {
+        "decision_rating": rating,
+        "recommended_choice": RECOMMENDED_CHOICE[rating],
+        "confidence_score": confidence,
+        "reasoning": {
+            "financial_factors": f"{price_text} is {pct_text} your savings and {months_of_income:.1f} months of income.",
+            "psychological_factors": "Waiting 30 days separates wants from needs and reduces impulse regret.",
+            "opportunity_cost_view": f"Invested instead, {price_text} could grow to about ₹{fv_5yr:,.0f} in 5 years.",
+            "risk_analysis": f"Your {risk_profile} risk profile allows up to {limit:.0%} of savings on one purchase.",
+        },
+        "quantum_paths": [
+            {"path_name": name, "outcome": outcome, "probability": f"{w}%"}
+            for (name, outcome), w in zip(paths, weights)
+        ],
+        "final_advice": f"{RECOMMENDED_CHOICE[rating]}. Rebuilding this amount at {REBUILD_SAVING_RATE:.0%} of income takes {rebuild_months} months.",
+        "computed": {
+            "price": price,
+            "price_estimated": price_estimated,
+            "share_of_savings": None if share_of_savings == float("inf") else round(share_of_savings, 4),
+            "months_of_income": round(months_of_income, 2),
+            "future_value_5yr": round(fv_5yr, 2),
+            "months_to_rebuild": rebuild_months,
+        },
+    }
@@ -0,0 +1,178 @@
+"""
+Token-bucket rate limiting shared across threads and worker processes.
+
+Bucket state (tokens, last refill time) lives in a small SQLite file, and every
+acquire is one BEGIN IMMEDIATE transaction, so N uvicorn workers on a host
+share one limit instead of each getting their own. A request takes a token from
+its user's bucket AND from the global bucket, or from neither.
+
+Callers can either fail fast (acquire(..., max_wait_s=0)) or wait for a token in
+a bounded queue: at most `max_waiters` requests per process wait at a time, each
+for at most `max_wait_s`.
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+RATE_LIMIT_DB_PATH = os.environ.get(
+    "RATE_LIMIT_DB", os.path.join(tempfile.gettempdir(), "goalaura_rate_limit.db")
+)
+
+GLOBAL_BUCKET = "__global__"
+# Drop full per-user buckets (same as having no row) every N writes, so one row
+# per caller-chosen user id does not pile up forever
+PRUNE_EVERY_WRITES = 256
+
+
+class RateLimitExceeded(Exception):
+    """No token within the allowed wait (or the wait queue was full)."""
+
+    def __init__(self, retry_after: float, reason: str = "rate limit exceeded"):
+        super().__init__(f"{reason}; retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class TokenBucketLimiter:
+    """
+    Per-user and global token buckets in a shared SQLite file.
+
+    `per_user` tokens per `period_s` for each user id, `global_limit` tokens per
+    `period_s` across all users. Buckets start full (burst = limit).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        per_user: float,
+        global_limit: float,
+        period_s: float,
+        path: str = RATE_LIMIT_DB_PATH,
+        max_waiters: int = 16,
+    ):
+        self.name = name
+        self.per_user = float(per_user)
+        self.global_limit = float(global_limit)
+        self.period_s = float(period_s)
+        self.path = path
+        self.max_waiters = max_waiters
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._waiters = 0
+        self._writes = 0
+        self._stats = {"allowed": 0, "rejected": 0, "waited": 0, "queue_full": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not cross a fork, so reopen in each worker process
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets ("
+                "limiter TEXT NOT NULL, bucket TEXT NOT NULL, tokens REAL NOT NULL, "
+                "updated_at REAL NOT NULL, PRIMARY KEY (limiter, bucket))"
+            )
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _refill(self, conn: sqlite3.Connection, bucket: str, capacity: float, now: float) -> float:
+        row = conn.execute(
+            "SELECT tokens, updated_at FROM token_buckets WHERE limiter = ? AND bucket = ?",
+            (self.name, bucket),
+        ).fetchone()
+        if row is None:
+            return capacity
+        tokens, updated_at = row
+        return min(capacity, tokens + max(0.0, now - updated_at) * capacity / self.period_s)
+
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        """Delete per-user buckets that have refilled completely."""
+        conn.execute(
+            "DELETE FROM token_buckets WHERE limiter = ? AND bucket != ? "
+            "AND tokens + (? - updated_at) * ? / ? >= ?",
+            (self.name, GLOBAL_BUCKET, now, self.per_user, self.period_s, self.per_user),
+        )
+
+    def try_acquire(self, user_id: str) -> Tuple[bool, float]:
+        """Take one token from both buckets. Returns (allowed, seconds until a token is likely)."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                user_tokens = self._refill(conn, user_id, self.per_user, now)
+                global_tokens = self._refill(conn, GLOBAL_BUCKET, self.global_limit, now)
+                allowed = user_tokens >= 1.0 and global_tokens >= 1.0
+                if allowed:
+                    user_tokens -= 1.0
+                    global_tokens -= 1.0
+                conn.executemany(
+                    "INSERT OR REPLACE INTO token_buckets (limiter, bucket, tokens, updated_at) VALUES (?, ?, ?, ?)",
+                    [(self.name, user_id, user_tokens, now), (self.name, GLOBAL_BUCKET, global_tokens, now)],
+                )
+                self._writes += 1
+                if self._writes % PRUNE_EVERY_WRITES == 0:
+                    self._prune(conn, now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        if allowed:
+            return True, 0.0
+        retry_after = max(
+            (1.0 - user_tokens) * self.period_s / self.per_user if user_tokens < 1.0 else 0.0,
+            (1.0 - global_tokens) * self.period_s / self.global_limit if global_tokens < 1.0 else 0.0,
+        )
+        return False, retry_after
+
+    async def acquire(self, user_id: str, max_wait_s: float = 0.0):
+        """
+        Take a token, waiting up to `max_wait_s` in this process's bounded queue.
+        Raises RateLimitExceeded when no token arrives in time or the queue is full.
+        The SQLite transaction can block on another worker's lock, so it runs in a
+        thread rather than on the event loop.
+        """
+        ok, retry_after = await asyncio.to_thread(self.try_acquire, user_id)
+        if ok:
+            self._stats["allowed"] += 1
+            return
+        if max_wait_s <= 0 or retry_after > max_wait_s:
+            self._stats["rejected"] += 1
+            raise RateLimitExceeded(retry_after)
+        if self._waiters >= self.max_waiters:
+            self._stats["queue_full"] += 1
+            raise RateLimitExceeded(retry_after, "rate limit wait queue is full")
+
+        deadline = time.monotonic() + max_wait_s
+        self._waiters += 1
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if retry_after > remaining:
+                    self._stats["rejected"] += 1
+                    raise RateLimitExceeded(retry_after)
+                await asyncio.sleep(retry_after)
+                ok, retry_after = await asyncio.to_thread(self.try_acquire, user_id)
+                if ok:
+                    self._stats["allowed"] += 1
+                    self._stats["waited"] += 1
+                    return
+                # Another worker took the token; back off a little before retrying
+                retry_after = max(retry_after, 0.01)
+        finally:
+            self._waiters -= 1
+
+    def reset(self):
+        """Refill every bucket of this limiter (e.g. between benchmark runs)."""
+        with self._lock:
+            self._connection().execute("DELETE FROM token_buckets WHERE limiter = ?", (self.name,))
+
+    def stats(self) -> Dict[str, float]:
+        return {**self._stats, "waiting": self._waiters}
@@ -0,0 +1,87 @@
+"""
+Single-flight request coalescing.
+
+While a call for a given key is in flight, later callers with the same key await
+the same task instead of starting a new one. The shared task is shielded, so a
+caller that disconnects does not cancel the work for everyone else.
+
+The task runs under the request budget of the caller that started it, so each
+caller waits for it only as long as its own budget allows; one that runs out
+is marked degraded and gets `on_timeout()` (its deterministic fallback).
+"""
+
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from core.deadline import DeadlineExceeded, current_budget, time_left
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_registry: Dict[str, "SingleFlight"] = {}
+
+
+def normalize_key_text(text: str) -> str:
+    """Case- and whitespace-insensitive form of free text used inside flight keys."""
+    return _WHITESPACE_RE.sub(" ", (text or "").lower()).strip()
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self.timed_out = 0
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        _registry[name] = self
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        on_timeout: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        """
+        Await the shared call for `key`, at most for this caller's remaining request
+        budget. Past it: on_timeout() if given, else DeadlineExceeded.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+            # Every waiter may have given up (deadline) before it fails; don't leave it unretrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), time_left())
+        except asyncio.TimeoutError:
+            if task.done():
+                raise  # the shared call itself failed with a timeout
+            budget = current_budget()
+            if budget is not None:
+                budget.mark_degraded("deadline")
+            self.timed_out += 1
+            if on_timeout is None:
+                raise DeadlineExceeded(f"Request deadline exceeded waiting for {self.name}")
+            return on_timeout()
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "timed_out": self.timed_out,
+            "in_flight": len(self._inflight),
+        }
+
+
+def singleflight_stats() -> Dict[str, Dict[str, int]]:
+    return {name: flight.stats() for name, flight in _registry.items()}
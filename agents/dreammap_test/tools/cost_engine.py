@@ -1,72 +1,95 @@
 import json
 import os
 import re
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
 
 from dotenv import load_dotenv
 load_dotenv()
 
-# If you use Gemini, import it; otherwise the code will gracefully skip
-try:
-    from google import genai
-    from google.genai import types
-    client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-except Exception:
-    client = None
+from google.genai import types
+
+from core.llm_gateway import get_gateway
+from core.model_router import TASK_CLASSIFY, TASK_NUMERIC_ESTIMATE, generate_for_task
+from tools.dream_classifier import build_default_classifier
+from tools.keyword_matcher import KeywordMatcher
 
 TEMPLATES_PATH = os.path.join(os.path.dirname(__file__), "dream_templates.json")
 with open(TEMPLATES_PATH, "r", encoding="utf-8") as f:
     TEMPLATES = json.load(f)
 
 
+# Compiled once from the "keywords" blocks in dream_templates.json
+KEYWORD_MATCHER = KeywordMatcher.from_templates(TEMPLATES, default="other")
+
+
+# Local naive Bayes model; classify_dream only calls the LLM below this confidence
+LOCAL_CLASSIFIER = build_default_classifier(TEMPLATES)
+LOCAL_CONFIDENCE_THRESHOLD = float(os.environ.get("DREAM_CLASSIFIER_THRESHOLD", "0.6"))
+# When no keyword matches, cheap_classify only trusts a local guess that clears this
+# floor and leads the runner-up label by this margin; anything else is "other"
+LOCAL_GUESS_FLOOR = float(os.environ.get("DREAM_CLASSIFIER_GUESS_FLOOR", "0.5"))
+LOCAL_GUESS_MARGIN = float(os.environ.get("DREAM_CLASSIFIER_GUESS_MARGIN", "0.3"))
+
+_classify_stats = {"requests": 0, "llm_skipped": 0}
+
+
+def classifier_stats() -> Dict[str, Any]:
+    requests = _classify_stats["requests"]
+    return {
+        **_classify_stats,
+        "skip_ratio": round(_classify_stats["llm_skipped"] / requests, 4) if requests else 0.0,
+        "threshold": LOCAL_CONFIDENCE_THRESHOLD,
+    }
+
+
 def _keyword_classify(dream_text: str) -> str:
     """
     Fallback cheap classifier using keywords.
     Returns a template key (category).
     """
-    t = dream_text.lower()
-    # map keywords to template keys
-    mapping = {
-        "bike": "purchase_vehicle",
-        "motorcycle": "purchase_vehicle",
-        "scooter": "purchase_vehicle",
-        "phone": "purchase_phone",
-        "smartphone": "purchase_phone",
-        "laptop": "purchase_laptop",
-        "travel": "world_tour",
-        "trip": "world_tour",
-        "europe": "world_tour",
-        "cafe": "start_cafe",
-        "coffee": "start_cafe",
-        "gym": "open_gym",
-        "car": "purchase_car",
-        "mba": "masters_degree",
-        "masters": "masters_degree",
-        "renovate": "home_renovation",
-        "wedding": "marriage_planning",
-        "marriage": "marriage_planning",
-        "dog": "buy_dog",
-        "puppy": "buy_dog",
-        "horse": "buy_horse",
-        "watch": "buy_luxury_item",
-        "guitar": "buy_luxury_item",
-        "salon": "small_business_service",
-        "tutoring": "small_business_service",
-        "course": "education_course",
-        "furniture": "furniture_purchase",
-        "appliance": "home_appliance"
-    }
-    for kw, key in mapping.items():
-        if kw in t:
-            return key
+    return KEYWORD_MATCHER.classify(dream_text)
+
+
+def cheap_classify(dream_text: str) -> str:
+    """
+    Zero-latency category guess (no LLM): the local model's answer when it is
+    confident, otherwise the keyword match, otherwise the local model's best guess
+    if it clears LOCAL_GUESS_FLOOR and LOCAL_GUESS_MARGIN, otherwise "other".
+    """
+    proba = LOCAL_CLASSIFIER.predict_proba(dream_text)
+    ranked = sorted(proba, key=proba.get, reverse=True)
+    local_key = ranked[0] if ranked else "other"
+    confidence = proba.get(local_key, 0.0)
+    runner_up = proba[ranked[1]] if len(ranked) > 1 else 0.0
+    if confidence >= LOCAL_CONFIDENCE_THRESHOLD:
+        return local_key
+    key = _keyword_classify(dream_text)
+    if key != "other":
+        return key
+    if confidence >= LOCAL_GUESS_FLOOR and confidence - runner_up >= LOCAL_GUESS_MARGIN:
+        return local_key
     return "other"
 
 
-def classify_dream(dream_text: str) -> Tuple[str, Dict[str, Any]]:
+def classify_many(dream_texts: List[str]) -> List[str]:
     """
-    Try to classify using LLM (one small call), otherwise use keyword fallback.
+    Batch keyword classification (no LLM). Returns one template key per text.
+    """
+    return KEYWORD_MATCHER.classify_many(dream_texts)
+
+
+async def classify_dream(dream_text: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Classify locally first; only if the local model's confidence is below
+    LOCAL_CONFIDENCE_THRESHOLD try the LLM (one small call), otherwise use keyword fallback.
     Returns (template_key, template_obj).
     """
+    _classify_stats["requests"] += 1
+    local_key, confidence = LOCAL_CLASSIFIER.predict(dream_text)
+    if confidence >= LOCAL_CONFIDENCE_THRESHOLD:
+        _classify_stats["llm_skipped"] += 1
+        return local_key, TEMPLATES.get(local_key, TEMPLATES["other"])
+
     # Attempt 1: LLM classification (single call, small)
     prompt = (
         "Classify the following user dream into one of the short categories (single token) "
@@ -75,15 +98,15 @@ def classify_dream(dream_text: str) -> Tuple[str, Dict[str, Any]]:
         "Only respond with the template key (e.g., purchase_vehicle) and nothing else."
     )
 
-    if client:
+    if get_gateway().available:
         try:
-            model = "gemini-1.5-flash"  # cheaper, higher quota
-            resp = client.models.generate_content(
-                model=model,
+            text = await generate_for_task(
+                TASK_CLASSIFY,
                 contents=[types.Content(role="user", parts=[types.Part.from_text(text=prompt)])],
-                config=types.GenerateContentConfig(response_mime_type="text")
+                config=types.GenerateContentConfig(response_mime_type="text"),
+                cache=True,
             )
-            text = resp.text.strip().lower()
+            text = text.strip().lower()
             # Very small sanity filter: only accept known keys
             for key in TEMPLATES.keys():
                 if key in text:
@@ -119,12 +142,12 @@ def _parse_numeric_estimate_from_text(text: str) -> Optional[float]:
     return None
 
 
-def estimate_total_cost_with_ai(dream_text: str, template_key: str) -> Optional[float]:
+async def estimate_total_cost_with_ai(dream_text: str, template_key: str) -> Optional[float]:
     """
     Try a small LLM call to return a numeric total estimate (single number).
     If LLM is unavailable or quota exceeds, return None so caller uses base_estimate.
     """
-    if not client:
+    if not get_gateway().available:
         return None
 
     prompt = (
@@ -134,13 +157,13 @@ def estimate_total_cost_with_ai(dream_text: str, template_key: str) -> Optional[
         "If unsure, return nothing."
     )
     try:
-        model = "gemini-2.5-pro"
-        resp = client.models.generate_content(
-            model=model,
+        text = await generate_for_task(
+            TASK_NUMERIC_ESTIMATE,
             contents=[types.Content(role="user", parts=[types.Part.from_text(text=prompt)])],
-            config=types.GenerateContentConfig(response_mime_type="text")
+            config=types.GenerateContentConfig(response_mime_type="text"),
+            cache=True,
         )
-        text = resp.text.strip()
+        text = text.strip()
         parsed = _parse_numeric_estimate_from_text(text)
         return parsed
     except Exception:
@@ -0,0 +1,121 @@
+"""
+Local statistical dream classifier.
+
+A multinomial naive Bayes over hashed features (word unigrams, word bigrams and
+character n-grams), trained at import time on the dream_templates.json labels,
+example queries and keywords plus the seed corpus in dream_seed_corpus.json.
+It returns a template key with a confidence score so classify_dream only pays
+for an LLM round-trip when the local model is unsure.
+"""
+
+import json
+import math
+import os
+import re
+import zlib
+from typing import Dict, Iterable, List, Tuple
+
+N_FEATURES = 2 ** 18
+CHAR_NGRAM_SIZES = (3, 4, 5)
+SMOOTHING_ALPHA = 0.1
+# Log-likelihoods are averaged per feature and scaled by this before the softmax,
+# which keeps naive Bayes from reporting ~1.0 confidence on everything.
+CONFIDENCE_SHARPNESS = 4.0
+
+SEED_CORPUS_PATH = os.path.join(os.path.dirname(__file__), "dream_seed_corpus.json")
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _hash(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8")) % N_FEATURES
+
+
+def extract_features(text: str) -> List[int]:
+    words = _WORD_RE.findall((text or "").lower())
+    feats = [_hash("w:" + w) for w in words]
+    feats += [_hash("b:" + a + " " + b) for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f"<{w}>"
+        for n in CHAR_NGRAM_SIZES:
+            feats += [_hash("c:" + padded[i:i + n]) for i in range(len(padded) - n + 1)]
+    return feats
+
+
+class NaiveBayesDreamClassifier:
+    """Hashed-feature multinomial naive Bayes with a calibrated confidence."""
+
+    def __init__(self, alpha: float = SMOOTHING_ALPHA):
+        self.alpha = alpha
+        self.labels: List[str] = []
+        self._log_prior: Dict[str, float] = {}
+        self._log_prob: Dict[str, Dict[int, float]] = {}
+        self._log_unseen: Dict[str, float] = {}
+
+    def fit(self, samples: Iterable[Tuple[str, str]]) -> "NaiveBayesDreamClassifier":
+        doc_counts: Dict[str, int] = {}
+        feat_counts: Dict[str, Dict[int, int]] = {}
+        totals: Dict[str, int] = {}
+        for text, label in samples:
+            doc_counts[label] = doc_counts.get(label, 0) + 1
+            counts = feat_counts.setdefault(label, {})
+            for f in extract_features(text):
+                counts[f] = counts.get(f, 0) + 1
+                totals[label] = totals.get(label, 0) + 1
+
+        n_docs = sum(doc_counts.values())
+        self.labels = sorted(doc_counts)
+        for label in self.labels:
+            denom = totals.get(label, 0) + self.alpha * N_FEATURES
+            self._log_prior[label] = math.log(doc_counts[label] / n_docs)
+            self._log_prob[label] = {
+                f: math.log((c + self.alpha) / denom) for f, c in feat_counts[label].items()
+            }
+            self._log_unseen[label] = math.log(self.alpha / denom)
+        return self
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        feats = extract_features(text)
+        if not feats or not self.labels:
+            return {label: 1.0 / len(self.labels) for label in self.labels} if self.labels else {}
+
+        scores = {}
+        for label in self.labels:
+            probs = self._log_prob[label]
+            unseen = self._log_unseen[label]
+            loglik = sum(probs.get(f, unseen) for f in feats)
+            scores[label] = self._log_prior[label] + CONFIDENCE_SHARPNESS * loglik / len(feats)
+
+        top = max(scores.values())
+        exp = {label: math.exp(s - top) for label, s in scores.items()}
+        z = sum(exp.values())
+        return {label: v / z for label, v in exp.items()}
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Return (template_key, confidence in [0, 1])."""
+        proba = self.predict_proba(text)
+        if not proba:
+            return "other", 0.0
+        label = max(proba, key=proba.get)
+        return label, proba[label]
+
+
+def training_samples(templates: Dict[str, Dict], seed_corpus: Dict[str, List[str]]) -> List[Tuple[str, str]]:
+    """Template labels, example queries and keywords, plus the seed corpus."""
+    samples = []
+    for key, tpl in templates.items():
+        samples.append((tpl.get("label", key), key))
+        samples += [(q, key) for q in tpl.get("example_queries", [])]
+        samples += [(kw, key) for kw in tpl.get("keywords", {})]
+    for key, texts in seed_corpus.items():
+        samples += [(t, key) for t in texts]
+    return samples
+
+
+def load_seed_corpus() -> Dict[str, List[str]]:
+    with open(SEED_CORPUS_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_default_classifier(templates: Dict[str, Dict]) -> NaiveBayesDreamClassifier:
+    return NaiveBayesDreamClassifier().fit(training_samples(templates, load_seed_corpus()))
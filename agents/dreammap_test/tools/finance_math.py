@@ -0,0 +1,75 @@
+"""
+Vectorized financial math shared by the agents.
+
+Every function accepts scalars or array-likes and broadcasts them with NumPy,
+so one call can evaluate a single purchase or a million scenarios. Scalar
+inputs return plain Python numbers; array inputs return ndarrays.
+"""
+
+from typing import Union
+
+import numpy as np
+
+ArrayLike = Union[float, int, np.ndarray, list, tuple]
+
+# Return assumptions used across the app. The opportunity-cost visualizer quotes
+# an equity-like 12% to the user; the decision tree and the opportunity-cost tool
+# use a more conservative 10%.
+DEFAULT_ANNUAL_RETURN_RATE = 0.10
+EQUITY_ANNUAL_RETURN_RATE = 0.12
+
+# Horizons (years) reported by the agents
+FV_HORIZONS_YEARS = (1, 5, 10)
+
+# Sentinel returned by months_to_save when nothing is being saved
+NEVER_MONTHS = 9999
+
+WORK_HOURS_PER_DAY = 8
+
+
+def _result(x: np.ndarray):
+    """Unwrap 0-d results to Python scalars."""
+    return x.item() if x.ndim == 0 else x
+
+
+def future_value(amount: ArrayLike, annual_rate: ArrayLike, years: ArrayLike):
+    """FV = amount * (1 + rate) ** years, broadcast over all three arguments."""
+    amount = np.asarray(amount, dtype=np.float64)
+    annual_rate = np.asarray(annual_rate, dtype=np.float64)
+    years = np.asarray(years, dtype=np.float64)
+    return _result(amount * np.power(1.0 + annual_rate, years))
+
+
+def future_values(amount: ArrayLike, annual_rate: ArrayLike, horizons=FV_HORIZONS_YEARS) -> np.ndarray:
+    """Future values for each amount at each horizon: shape amount.shape + (len(horizons),)."""
+    amount = np.asarray(amount, dtype=np.float64)[..., np.newaxis]
+    annual_rate = np.asarray(annual_rate, dtype=np.float64)[..., np.newaxis]
+    return amount * np.power(1.0 + annual_rate, np.asarray(horizons, dtype=np.float64))
+
+
+def depreciated_value(initial: ArrayLike, years: ArrayLike, annual_rate: ArrayLike):
+    """Declining-balance value after `years`; rates of 100% or more leave nothing."""
+    initial = np.asarray(initial, dtype=np.float64)
+    annual_rate = np.asarray(annual_rate, dtype=np.float64)
+    years = np.asarray(years, dtype=np.float64)
+    remaining = np.power(np.clip(1.0 - annual_rate, 0.0, None), years)
+    return _result(np.where(annual_rate < 1, initial * remaining, 0.0))
+
+
+def months_to_save(amount: ArrayLike, monthly_saved: ArrayLike):
+    """Whole months needed to save `amount` (rounded up); NEVER_MONTHS where nothing is saved."""
+    amount = np.asarray(amount, dtype=np.float64)
+    monthly_saved = np.asarray(monthly_saved, dtype=np.float64)
+    saving = monthly_saved > 0
+    safe = np.where(saving, monthly_saved, 1.0)
+    # A true ceiling: (amount + saved - 1) // saved is only one for whole rupees
+    months = np.maximum(np.ceil(amount / safe - 1e-9), 0)
+    return _result(np.where(saving, months, NEVER_MONTHS).astype(np.int64))
+
+
+def time_cost_hours(cost: ArrayLike, hourly_wage: ArrayLike):
+    """Hours of work that pay for `cost`; 0 where the wage is not positive."""
+    cost = np.asarray(cost, dtype=np.float64)
+    hourly_wage = np.asarray(hourly_wage, dtype=np.float64)
+    paid = hourly_wage > 0
+    return _result(np.where(paid, cost / np.where(paid, hourly_wage, 1.0), 0.0))
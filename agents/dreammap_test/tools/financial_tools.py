@@ -51,10 +51,11 @@ def parse_price_inr(text: str) -> float:
 
 # GoalAura_AI/tools/financial_tools.py (ADD THIS NEW FUNCTION)
 import json
-import math
+
+from tools.finance_math import DEFAULT_ANNUAL_RETURN_RATE, future_value, time_cost_hours
 
 # --- Constants for Opportunity Cost ---
-ASSUMED_ANNUAL_RETURN_RATE = 0.10  # 10% (r)
+ASSUMED_ANNUAL_RETURN_RATE = DEFAULT_ANNUAL_RETURN_RATE  # 10% (r)
 INVESTMENT_PERIOD_YEARS = 5       # 5 years (n)
 # -------------------------------------
 
@@ -71,17 +72,15 @@ def calculate_opportunity_cost(
     if user_hourly_wage <= 0:
         return json.dumps({"error": "Hourly wage must be greater than zero."})
         
-    hours_of_work = purchase_cost / user_hourly_wage
+    hours_of_work = time_cost_hours(purchase_cost, user_hourly_wage)
 
     # 2. Calculate Future Value (Investment Cost)
     # Formula: FV = PV * (1 + r)^n
-    future_value = purchase_cost * (
-        (1 + ASSUMED_ANNUAL_RETURN_RATE) ** INVESTMENT_PERIOD_YEARS
-    )
+    fv = future_value(purchase_cost, ASSUMED_ANNUAL_RETURN_RATE, INVESTMENT_PERIOD_YEARS)
     
     # Rounding the results for the visualization
     formatted_hours = round(hours_of_work, 1)
-    formatted_fv = round(future_value, 0) # Round to nearest rupee
+    formatted_fv = round(fv, 0) # Round to nearest rupee
 
     # Return the structured data as a JSON string
     return json.dumps({
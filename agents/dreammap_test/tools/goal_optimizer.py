@@ -0,0 +1,168 @@
+"""
+Savings allocation optimizer for several goals sharing one income.
+
+Monthly capacity is income minus fixed expenses. Each goal needs its remaining
+amount by its deadline. Funding goals one at a time in a chosen order (see
+tools.goal_simulator's waterfall) turns this into single-machine scheduling,
+where a goal's "processing time" is remaining / capacity months:
+
+    max_on_time      - Moore-Hodgson: take goals in deadline order and, whenever
+                       the running total misses a deadline, drop the largest goal
+                       taken so far. This is optimal for the number of goals met.
+                       Dropped goals are funded afterwards, smallest first.
+    min_total_delay  - (NP-hard) repair both the max_on_time order and the plain
+                       deadline order with adjacent swaps while the total months
+                       late keeps falling, and keep the better of the two.
+
+The chosen order is then replayed through simulate_cash_flow to produce the
+month-by-month schedule.
+"""
+
+import heapq
+from typing import Any, Dict, List
+
+import numpy as np
+
+from tools.goal_simulator import simulate_cash_flow
+
+OBJECTIVES = ("max_on_time", "min_total_delay")
+MAX_HORIZON_MONTHS = 600
+MAX_REPAIR_PASSES = 50
+
+
+def _moore_hodgson(remaining: np.ndarray, deadlines: np.ndarray, capacity: float, edf: np.ndarray) -> List[int]:
+    taken: List[tuple] = []
+    total = 0.0
+    late = []
+    for i in edf:
+        heapq.heappush(taken, (-remaining[i], i))
+        total += remaining[i]
+        if total > deadlines[i] * capacity + 1e-9:
+            amount, j = heapq.heappop(taken)
+            total += amount
+            late.append(j)
+    on_time = set(i for _, i in taken)
+    late.sort(key=lambda j: (remaining[j], deadlines[j]))
+    return [i for i in edf if i in on_time] + late
+
+
+def _months(amount: float, capacity: float) -> float:
+    return np.ceil(amount / capacity - 1e-9)
+
+
+def _total_delay(order: List[int], remaining: np.ndarray, deadlines: np.ndarray, capacity: float) -> float:
+    completion = _months(np.cumsum(remaining[order]), capacity)
+    return float(np.maximum(completion - deadlines[order], 0).sum())
+
+
+def _repair_total_delay(order: List[int], remaining: np.ndarray, deadlines: np.ndarray, capacity: float) -> List[int]:
+    """Adjacent-swap local search; a swap only moves the two goals involved."""
+    order = list(order)
+    for _ in range(MAX_REPAIR_PASSES):
+        improved = False
+        before = 0.0
+        for k in range(len(order) - 1):
+            a, b = order[k], order[k + 1]
+            both = before + remaining[a] + remaining[b]
+            current = max(_months(before + remaining[a], capacity) - deadlines[a], 0) + max(_months(both, capacity) - deadlines[b], 0)
+            swapped = max(_months(before + remaining[b], capacity) - deadlines[b], 0) + max(_months(both, capacity) - deadlines[a], 0)
+            if swapped < current:
+                order[k], order[k + 1] = b, a
+                improved = True
+            before += remaining[order[k]]
+        if not improved:
+            break
+    return order
+
+
+def _segments(contributions: np.ndarray) -> List[Dict[str, float]]:
+    """Run-length encode one goal's monthly contributions (months are 1-based)."""
+    rounded = np.round(contributions, 2)
+    paying = np.flatnonzero(rounded > 0)
+    if not len(paying):
+        return []
+    out = []
+    start = prev = paying[0]
+    for m in paying[1:]:
+        if m != prev + 1 or rounded[m] != rounded[start]:
+            out.append({"from_month": int(start) + 1, "to_month": int(prev) + 1, "amount": float(rounded[start])})
+            start = m
+        prev = m
+    out.append({"from_month": int(start) + 1, "to_month": int(prev) + 1, "amount": float(rounded[start])})
+    return out
+
+
+def optimize_goal_allocation(
+    goals: List[Dict[str, Any]],
+    monthly_income: float,
+    monthly_fixed_expenses: float,
+    objective: str = "max_on_time",
+) -> Dict[str, Any]:
+    """
+    Order and schedule goals {"name", "target_amount", "deadline_months",
+    optional "saved_amount", "priority"} against the monthly savings capacity.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective '{objective}', expected one of {OBJECTIVES}")
+
+    capacity = max(0.0, monthly_income - monthly_fixed_expenses)
+    n = len(goals)
+    targets = np.array([float(g.get("target_amount", 0)) for g in goals])
+    saved = np.minimum(np.array([float(g.get("saved_amount", 0) or 0) for g in goals]), targets)
+    deadlines = np.array([int(g.get("deadline_months", 12)) for g in goals])
+    priorities = np.array([g["priority"] if g.get("priority") is not None else i for i, g in enumerate(goals)], dtype=float)
+    remaining = targets - saved
+    edf = np.lexsort((priorities, deadlines))
+
+    if capacity > 0:
+        order = _moore_hodgson(remaining, deadlines, capacity, edf)
+        if objective == "min_total_delay":
+            order = min(
+                (_repair_total_delay(start, remaining, deadlines, capacity) for start in (order, edf.tolist())),
+                key=lambda o: _total_delay(o, remaining, deadlines, capacity)
+            )
+        horizon = int(min(MAX_HORIZON_MONTHS, max(deadlines.max(initial=1), np.ceil(remaining.sum() / capacity))))
+    else:
+        order = edf.tolist()
+        horizon = int(deadlines.max(initial=1))
+
+    rank = np.empty(n, dtype=int)
+    rank[order] = np.arange(n)
+    sim = simulate_cash_flow(targets, capacity, horizon, "priority", priorities=rank, deadlines=deadlines, saved=saved)
+    contributions = np.diff(sim["balances"], axis=0, prepend=saved[None, :])
+    completion = sim["completion_month"]
+
+    summaries = []
+    for i, g in enumerate(goals):
+        met = bool(sim["meets_deadline"][i])
+        segments = _segments(contributions[:, i])
+        summaries.append({
+            "name": g.get("name", f"Goal {i + 1}"),
+            "target_amount": float(targets[i]),
+            "saved_amount": float(saved[i]),
+            "deadline_months": int(deadlines[i]),
+            "funding_order": int(rank[i]) + 1,
+            "start_month": segments[0]["from_month"] if segments else 0,
+            "completion_month": int(completion[i]) if completion[i] <= horizon else None,
+            "meets_deadline": met,
+            # Unknown for a goal not funded within the horizon (see total_delay_months)
+            "delay_months": None if completion[i] > horizon else 0 if met else int(completion[i] - deadlines[i]),
+            "allocation": segments,
+        })
+
+    # A goal still unfunded at the horizon is at least horizon + 1 - deadline months
+    # late; that lower bound counts towards the total, which is then a lower bound too
+    unfunded = completion > horizon
+    delays = [s["delay_months"] for s in summaries if s["delay_months"] is not None]
+    unfunded_delay = np.maximum(horizon + 1 - deadlines[unfunded], 1)
+    return {
+        "objective": objective,
+        "monthly_capacity": round(capacity, 2),
+        "horizon_months": horizon,
+        "goals_total": n,
+        "goals_on_time": int(sim["meets_deadline"].sum()),
+        "total_delay_months": int(sum(delays) + unfunded_delay.sum()),
+        "total_delay_is_lower_bound": bool(unfunded.any()),
+        "unfunded_within_horizon": [s["name"] for s in summaries if s["completion_month"] is None],
+        "goals": summaries,
+    }
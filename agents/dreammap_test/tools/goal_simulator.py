@@ -0,0 +1,178 @@
+"""
+Month-by-month cash-flow simulator for several savings goals at once.
+
+Goals compete for one stream of monthly savings. The state is a months x goals
+matrix of balances, computed from the cumulative savings curve with NumPy
+instead of looping month by month:
+
+    priority      - goals are funded one after another (waterfall) in priority
+                    order, so goal k starts once goals 1..k-1 are complete
+    deadline      - priority ordering by earliest deadline
+    proportional  - each month is split across unfinished goals by weight
+                    (the target amount unless a weight is given); a finished
+                    goal's share flows to the rest immediately
+
+Negative months (e.g. a purchase being paid off) are covered by later savings
+before any goal receives money again.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from tools.finance_math import NEVER_MONTHS
+
+DEFAULT_HORIZON_MONTHS = 120
+STRATEGIES = ("priority", "deadline", "proportional")
+
+_EPS = 1e-9
+
+
+def _available_savings(monthly_savings: Union[float, Sequence[float]], horizon_months: int) -> np.ndarray:
+    """Cumulative savings that can go to goals by the end of each month (non-decreasing)."""
+    s = np.asarray(monthly_savings, dtype=np.float64)
+    if s.ndim == 0:
+        s = np.full(horizon_months, float(s))
+    else:
+        s = np.resize(s, horizon_months) if len(s) else np.zeros(horizon_months)
+    return np.maximum.accumulate(np.maximum(np.cumsum(s), 0.0))
+
+
+def _waterfall(available: np.ndarray, remaining: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """Money added to each goal by each month when goals are filled in `order`."""
+    need = remaining[order]
+    upper = np.cumsum(need)
+    lower = upper - need
+    added_sorted = np.clip(available[:, None] - lower[None, :], 0.0, need[None, :])
+    added = np.empty_like(added_sorted)
+    added[:, order] = added_sorted
+    return added
+
+
+def _proportional(available: np.ndarray, remaining: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Money added to each goal by each month when savings are split by weight."""
+    months, goals = len(available), len(remaining)
+    added = np.zeros((months, goals))
+    progress = np.zeros(goals)
+    active = remaining > _EPS
+    start, base = 0, 0.0
+    # One segment per completion event: at most `goals` vectorized steps. A segment
+    # ends at the savings level where the next goal fills up, which may be part-way
+    # through a month - the rest of that month goes to the remaining goals.
+    while active.any() and start < months:
+        w = np.where(active, weights, 0.0)
+        share = w / w.sum()
+        to_finish = np.where(active, (remaining - progress) / np.where(share > 0, share, 1.0), np.inf)
+        level = base + to_finish.min()
+        end = int(np.searchsorted(available, level - _EPS, side="left"))
+        stop = min(end, months)
+        added[start:stop] = np.minimum(progress + np.outer(available[start:stop] - base, share), remaining)
+        if end >= months:
+            return added
+        progress = np.minimum(progress + (level - base) * share, remaining)
+        active &= progress < remaining - _EPS
+        base = level
+        start = end
+    added[start:] = progress
+    return added
+
+
+def simulate_cash_flow(
+    targets: Sequence[float],
+    monthly_savings: Union[float, Sequence[float]],
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    strategy: str = "priority",
+    priorities: Optional[Sequence[float]] = None,
+    deadlines: Optional[Sequence[int]] = None,
+    weights: Optional[Sequence[float]] = None,
+    saved: Optional[Sequence[float]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate `horizon_months` of saving towards several goals.
+
+    Args:
+        targets: Target amount per goal.
+        monthly_savings: Savings per month - a constant or one value per month.
+        strategy: "priority", "deadline" or "proportional".
+        priorities: Lower is funded first (priority strategy); defaults to list order.
+        deadlines: Deadline in months per goal (used by the deadline strategy and checks).
+        weights: Split weights for the proportional strategy; defaults to the targets.
+        saved: Amount already saved per goal.
+
+    Returns:
+        balances            (months, goals) balance at the end of each month
+        completion_month    month each goal is fully funded (0 = already, NEVER_MONTHS = not in horizon)
+        funded_at_deadline  balance at each goal's deadline
+        shortfall_at_deadline, meets_deadline
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown allocation strategy '{strategy}', expected one of {STRATEGIES}")
+
+    targets = np.asarray(targets, dtype=np.float64)
+    n = len(targets)
+    months = max(1, int(horizon_months))
+    saved = np.zeros(n) if saved is None else np.minimum(np.asarray(saved, dtype=np.float64), targets)
+    deadlines = np.full(n, months) if deadlines is None else np.asarray(deadlines, dtype=np.int64)
+    remaining = np.maximum(targets - saved, 0.0)
+    available = _available_savings(monthly_savings, months)
+
+    if strategy == "proportional":
+        w = targets if weights is None else np.asarray(weights, dtype=np.float64)
+        added = _proportional(available, remaining, np.maximum(w, _EPS))
+    else:
+        keys = deadlines if strategy == "deadline" else (
+            np.arange(n) if priorities is None else np.asarray(priorities, dtype=np.float64)
+        )
+        added = _waterfall(available, remaining, np.argsort(keys, kind="stable"))
+
+    balances = saved + added
+    done = balances >= targets - _EPS
+    reached = done.any(axis=0)
+    completion = np.where(reached, done.argmax(axis=0) + 1, NEVER_MONTHS)
+    completion = np.where(remaining <= _EPS, 0, completion)
+
+    at = np.clip(deadlines, 0, months) - 1
+    funded = np.where(at >= 0, balances[np.maximum(at, 0), np.arange(n)], saved)
+    return {
+        "balances": balances,
+        "completion_month": completion,
+        "funded_at_deadline": funded,
+        "shortfall_at_deadline": np.maximum(targets - funded, 0.0),
+        "meets_deadline": completion <= deadlines,
+    }
+
+
+def simulate_goals(
+    goals: List[Dict[str, Any]],
+    monthly_savings: Union[float, Sequence[float]],
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    strategy: str = "priority",
+) -> List[Dict[str, Any]]:
+    """
+    simulate_cash_flow over goal dicts: {"name", "target_amount", "deadline_months",
+    optional "priority", "weight", "saved_amount"}. Returns one summary dict per goal.
+    """
+    if not goals:
+        return []
+    targets = [float(g.get("target_amount", 0)) for g in goals]
+    deadlines = [int(g.get("deadline_months", 12)) for g in goals]
+    priorities = [float(g["priority"]) if g.get("priority") is not None else i for i, g in enumerate(goals)]
+    weights = [float(g["weight"]) if g.get("weight") is not None else t for g, t in zip(goals, targets)]
+    saved = [float(g.get("saved_amount", 0) or 0) for g in goals]
+
+    sim = simulate_cash_flow(
+        targets, monthly_savings, horizon_months, strategy,
+        priorities=priorities, deadlines=deadlines, weights=weights, saved=saved,
+    )
+    return [
+        {
+            "name": g.get("name", "Unnamed Goal"),
+            "target_amount": targets[i],
+            "deadline_months": deadlines[i],
+            "completion_month": int(sim["completion_month"][i]),
+            "meets_deadline": bool(sim["meets_deadline"][i]),
+            "funded_at_deadline": round(float(sim["funded_at_deadline"][i]), 2),
+            "shortfall_at_deadline": round(float(sim["shortfall_at_deadline"][i]), 2),
+        }
+        for i, g in enumerate(goals)
+    ]
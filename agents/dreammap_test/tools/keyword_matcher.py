@@ -0,0 +1,109 @@
+"""
+Compiled multi-pattern keyword matcher for dream classification.
+
+Keywords (single words or phrases) are compiled once into a hash index of word
+n-grams. Matching tokenizes the text and, at each position, takes the longest
+keyword phrase that starts there - so "car" never matches inside "career" or
+"scar", and "gaming laptop" wins over a bare "laptop". Cost per call depends on
+the length of the text, not on the size of the keyword table.
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def _plural_forms(phrase: Tuple[str, ...]) -> List[Tuple[str, ...]]:
+    """The phrase itself plus simple English plurals of its last word."""
+    last = phrase[-1]
+    forms = [phrase]
+    if not last.endswith("s") and not last.isdigit():
+        forms.append(phrase[:-1] + (last + "s",))
+        if last.endswith(("ch", "sh", "x", "z")):
+            forms.append(phrase[:-1] + (last + "es",))
+    return forms
+
+
+class KeywordMatcher:
+    """
+    Weighted, longest-match keyword classifier.
+
+    `table` maps a label to {keyword_or_phrase: weight}. A matched phrase scores
+    weight * number_of_words, and the label with the highest total wins; ties go
+    to the label whose single best match was longest.
+    """
+
+    def __init__(self, table: Dict[str, Dict[str, float]], default: str = "other"):
+        self.default = default
+        self._index: Dict[Tuple[str, ...], List[Tuple[str, float]]] = {}
+        self._first_words = set()
+        self.max_ngram = 1
+        self.size = 0
+
+        for label, keywords in table.items():
+            for keyword, weight in keywords.items():
+                phrase = tuple(tokenize(keyword))
+                if not phrase:
+                    continue
+                self.size += 1
+                self.max_ngram = max(self.max_ngram, len(phrase))
+                for form in _plural_forms(phrase):
+                    self._index.setdefault(form, []).append((label, float(weight)))
+                    self._first_words.add(form[0])
+
+    @classmethod
+    def from_templates(cls, templates: Dict[str, Dict], default: str = "other") -> "KeywordMatcher":
+        """Build the matcher from the "keywords" blocks in dream_templates.json."""
+        table = {key: tpl.get("keywords", {}) for key, tpl in templates.items()}
+        return cls(table, default=default)
+
+    def matches(self, text: str) -> List[Tuple[str, str, float]]:
+        """Return non-overlapping (phrase, label, weight) matches, longest phrase first at each position."""
+        tokens = tokenize(text)
+        found = []
+        i = 0
+        n = len(tokens)
+        while i < n:
+            if tokens[i] not in self._first_words:
+                i += 1
+                continue
+            for size in range(min(self.max_ngram, n - i), 0, -1):
+                phrase = tuple(tokens[i:i + size])
+                hits = self._index.get(phrase)
+                if hits:
+                    for label, weight in hits:
+                        found.append((" ".join(phrase), label, weight))
+                    i += size
+                    break
+            else:
+                i += 1
+        return found
+
+    def scores(self, text: str) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        for phrase, label, weight in self.matches(text):
+            totals[label] = totals.get(label, 0.0) + weight * (phrase.count(" ") + 1)
+        return totals
+
+    def classify(self, text: str) -> str:
+        best_label = self.default
+        best_key = (0.0, 0)
+        longest: Dict[str, int] = {}
+        totals: Dict[str, float] = {}
+        for phrase, label, weight in self.matches(text):
+            words = phrase.count(" ") + 1
+            totals[label] = totals.get(label, 0.0) + weight * words
+            longest[label] = max(longest.get(label, 0), len(phrase))
+        for label, total in totals.items():
+            key = (total, longest[label])
+            if key > best_key:
+                best_label, best_key = label, key
+        return best_label
+
+    def classify_many(self, texts: Iterable[str]) -> List[str]:
+        return [self.classify(t) for t in texts]
@@ -0,0 +1,118 @@
+"""
+Monte Carlo simulator for purchase decisions (used by the quantum decision tree).
+
+Samples investment-return and depreciation paths with a seeded NumPy generator
+and summarizes what the money tied to a purchase is worth after 1 and 5 years
+under three scenarios:
+
+    Buy Now        - item bought today; its value depreciates along the path
+    Delay 30 days  - money stays invested for a month, then the item is bought
+                     at a (randomly) moved price; any difference stays invested
+    Do Not Buy     - money stays invested along the return path
+
+Only percentile bands and a few probabilities leave this module - never paths.
+"""
+
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+MC_DEFAULT_PATHS = int(os.environ.get("MC_PATHS", "100000"))
+MC_DEFAULT_SEED = 42  # fixed so identical requests get identical numbers
+
+RETURN_VOLATILITY = 0.15        # annual st.dev. of investment returns
+DEPRECIATION_VOLATILITY = 0.08  # st.dev. of the item's annual depreciation rate
+PRICE_CHANGE_VOLATILITY = 0.05  # st.dev. of the price move while waiting 30 days
+PRICE_CHANGE_MEAN = 0.0
+
+HORIZONS_YEARS = (1, 5)
+PERCENTILES = (10, 50, 90)
+DELAY_YEARS = 30 / 365
+SCENARIOS = ("Buy Now", "Delay 30 days", "Do Not Buy")
+
+
+def simulate_purchase_scenarios(
+    purchase_cost: float,
+    investment_return_rate: float,
+    depreciation_rate_ann: float,
+    n_paths: int = MC_DEFAULT_PATHS,
+    seed: Optional[int] = MC_DEFAULT_SEED,
+    return_volatility: float = RETURN_VOLATILITY,
+    depreciation_volatility: float = DEPRECIATION_VOLATILITY,
+    price_change_volatility: float = PRICE_CHANGE_VOLATILITY,
+) -> Dict:
+    """
+    Simulate `n_paths` futures and return per-scenario p10/p50/p90 of the value
+    and net cost (purchase_cost - value) at each horizon, plus:
+
+      prob_loss_5yr  - share of paths where the scenario ends below purchase_cost
+      prob_best_5yr  - share of paths where the scenario has the highest value
+      regret_probability - share of paths where buying now ends at least 5% of the
+                           cost worse after 1 year than waiting 30 days would have
+    """
+    rng = np.random.default_rng(seed)
+    n_paths = max(1, int(n_paths))
+    years = max(HORIZONS_YEARS)
+
+    # Lognormal annual growth whose arithmetic mean is 1 + investment_return_rate
+    sigma = return_volatility
+    mu = np.log1p(investment_return_rate) - 0.5 * sigma ** 2
+    log_growth = np.cumsum(mu + sigma * rng.standard_normal((n_paths, years)), axis=1)
+    growth = np.exp(log_growth[:, [h - 1 for h in HORIZONS_YEARS]])         # (paths, horizons)
+    first_month = np.exp(log_growth[:, 0] * DELAY_YEARS)                   # share of year-1 growth
+
+    dep_rate = np.clip(
+        depreciation_rate_ann + depreciation_volatility * rng.standard_normal(n_paths), 0.0, 0.95
+    )
+    horizons = np.asarray(HORIZONS_YEARS, dtype=np.float64)
+    keep = np.log1p(-dep_rate)[:, None]
+
+    price_later = purchase_cost * (
+        1 + PRICE_CHANGE_MEAN + price_change_volatility * rng.standard_normal(n_paths)
+    )
+
+    buy_now = purchase_cost * np.exp(keep * horizons)
+    leftover = purchase_cost * first_month - price_later
+    delay = (
+        price_later[:, None] * np.exp(keep * (horizons - DELAY_YEARS))
+        + leftover[:, None] * growth / first_month[:, None]
+    )
+    do_not_buy = purchase_cost * growth
+
+    values = np.stack([buy_now, delay, do_not_buy])                        # (scenarios, paths, horizons)
+    bands = np.percentile(values, PERCENTILES, axis=1)                     # (pct, scenarios, horizons)
+    last = values[:, :, -1]
+    prob_loss = (last < purchase_cost).mean(axis=1)
+    prob_best = np.bincount(last.argmax(axis=0), minlength=len(SCENARIOS)) / n_paths
+    regret = float((delay[:, 0] - buy_now[:, 0] > 0.05 * purchase_cost).mean())
+
+    scenarios = []
+    for s, name in enumerate(SCENARIOS):
+        entry = {"name": name}
+        for h, horizon in enumerate(HORIZONS_YEARS):
+            value = {f"p{p}": round(float(bands[i, s, h]), 2) for i, p in enumerate(PERCENTILES)}
+            # Net cost bands flip: a high value is a low cost
+            net_cost = {
+                f"p{p}": round(purchase_cost - value[f"p{q}"], 2)
+                for p, q in zip(PERCENTILES, reversed(PERCENTILES))
+            }
+            entry[f"value_{horizon}yr"] = value
+            entry[f"net_cost_{horizon}yr"] = net_cost
+        entry["prob_loss_5yr"] = round(float(prob_loss[s]), 4)
+        entry["prob_best_5yr"] = round(float(prob_best[s]), 4)
+        scenarios.append(entry)
+
+    return {
+        "paths": n_paths,
+        "seed": seed,
+        "assumptions": {
+            "mean_return": investment_return_rate,
+            "return_volatility": return_volatility,
+            "mean_depreciation": depreciation_rate_ann,
+            "depreciation_volatility": depreciation_volatility,
+            "price_change_volatility_30d": price_change_volatility,
+        },
+        "scenarios": scenarios,
+        "regret_probability": round(regret, 4),
+    }
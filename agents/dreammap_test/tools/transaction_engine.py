@@ -0,0 +1,246 @@
+"""
+Columnar transaction engine.
+
+A transaction history is parsed once into compact NumPy columns: float64
+amounts, int32 category codes (indexing `categories`) and datetime64[D] dates.
+Grouped aggregations (per-category totals, counts and medians, monthly series,
+top-k) are then vectorized with bincount / sorting instead of per-row loops.
+
+Rows can be added in chunks (TransactionTableBuilder), so a streamed upload
+only ever holds its raw strings for one chunk at a time.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Raw rows buffered before converting them to arrays
+BUILD_CHUNK_ROWS = 16384
+
+
+def _to_float(values: Sequence[str]) -> np.ndarray:
+    """Parse amount strings; unparsable entries become NaN."""
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        out = np.empty(len(values), dtype=np.float64)
+        for i, v in enumerate(values):
+            try:
+                out[i] = float(v)
+            except (TypeError, ValueError):
+                out[i] = np.nan
+        return out
+
+
+def _to_dates(values: Sequence[str]) -> np.ndarray:
+    """Parse ISO dates (YYYY-MM-DD); anything else becomes NaT."""
+    try:
+        return np.array(values, dtype="datetime64[D]")
+    except ValueError:
+        out = np.empty(len(values), dtype="datetime64[D]")
+        for i, v in enumerate(values):
+            try:
+                out[i] = np.datetime64(v.strip()[:10], "D")
+            except (AttributeError, ValueError):
+                out[i] = np.datetime64("NaT")
+        return out
+
+
+class TransactionTable:
+    """Immutable columns of one user's transactions plus vectorized aggregations."""
+
+    def __init__(self, amounts: np.ndarray, category_codes: np.ndarray, categories: List[str], dates: np.ndarray):
+        self.amounts = amounts
+        self.category_codes = category_codes
+        self.categories = categories
+        self.dates = dates
+        # Rows with an unparsable amount are counted but never summed
+        self._valid = ~np.isnan(amounts)
+        all_valid = bool(self._valid.all())
+        self._valid_codes = category_codes if all_valid else category_codes[self._valid]
+        self._valid_amounts = amounts if all_valid else amounts[self._valid]
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    @classmethod
+    def from_dicts(cls, transactions: Iterable[Dict]) -> "TransactionTable":
+        """Build from row dicts (e.g. csv.DictReader rows)."""
+        builder = TransactionTableBuilder()
+        for txn in transactions:
+            builder.add_row(txn.get("category", "Other") or "Other", txn.get("amount", 0), txn.get("date", ""))
+        return builder.build()
+
+    def category_totals(self) -> np.ndarray:
+        return np.bincount(self._valid_codes, weights=self._valid_amounts, minlength=len(self.categories))
+
+    def category_counts(self) -> np.ndarray:
+        return np.bincount(self.category_codes, minlength=len(self.categories))
+
+    def category_medians(self) -> np.ndarray:
+        """Median amount per category (NaN for a category with no valid amount)."""
+        # Group rows by category (an integer sort), then take each contiguous slice's median
+        grouped = self._valid_amounts[np.argsort(self._valid_codes, kind="stable")]
+        counts = np.bincount(self._valid_codes, minlength=len(self.categories))
+        ends = np.cumsum(counts)
+        medians = np.full(len(self.categories), np.nan)
+        for i in np.flatnonzero(counts):
+            medians[i] = np.median(grouped[ends[i] - counts[i]:ends[i]])
+        return medians
+
+    def monthly_totals(self) -> Dict[str, float]:
+        """Total spend per calendar month ("YYYY-MM"), rows without a date excluded."""
+        mask = self._valid & ~np.isnat(self.dates)
+        if not mask.any():
+            return {}
+        months = self.dates[mask].astype("datetime64[M]").astype(np.int64)
+        first = months.min()
+        totals = np.bincount(months - first, weights=self.amounts[mask])
+        counts = np.bincount(months - first)
+        labels = np.arange(first, first + len(totals)).astype("datetime64[M]").astype(str).tolist()
+        return {label: float(total) for label, total, n in zip(labels, totals, counts) if n}
+
+    def category_month_totals(self) -> List[Tuple[str, str, float, int, int]]:
+        """
+        One (category, month, total, valid_count, count) tuple per category and
+        calendar month present; month is "YYYY-MM", or "" for rows without a date.
+        These sums are additive, so they can be merged into stored aggregates.
+        """
+        if not len(self):
+            return []
+        dated = ~np.isnat(self.dates)
+        # Slot 0 = undated, slot k = the (k-1)th month after the earliest one;
+        # combined with the category code into one group key
+        slots = np.zeros(len(self), dtype=np.int64)
+        first = 0
+        if dated.any():
+            months = self.dates[dated].astype("datetime64[M]").astype(np.int64)
+            first = int(months.min())
+            slots[dated] = months - first + 1
+        span = int(slots.max()) + 1
+        keys, groups = np.unique(self.category_codes.astype(np.int64) * span + slots, return_inverse=True)
+        counts = np.bincount(groups, minlength=len(keys))
+        valid_groups = groups[self._valid]
+        valid_counts = np.bincount(valid_groups, minlength=len(keys))
+        totals = np.bincount(valid_groups, weights=self._valid_amounts, minlength=len(keys))
+
+        key_codes, key_slots = np.divmod(keys, span)
+        return [
+            (self.categories[code], str(np.datetime64(first + slot - 1, "M")) if slot else "", total, n_valid, n)
+            for code, slot, total, n_valid, n in zip(
+                key_codes.tolist(), key_slots.tolist(), totals.tolist(), valid_counts.tolist(), counts.tolist()
+            )
+        ]
+
+    def top_categories(self, k: int = 5) -> List[Dict]:
+        totals = self.category_totals()
+        top = np.argsort(-totals, kind="stable")[:k]
+        return [{"category": self.categories[i], "total": float(totals[i])} for i in top if totals[i]]
+
+    def top_transactions(self, k: int = 5) -> List[Dict]:
+        """The k largest transactions, biggest first."""
+        idx = np.flatnonzero(self._valid)
+        if len(idx) > k:
+            idx = idx[np.argpartition(-self.amounts[idx], k - 1)[:k]]
+        idx = idx[np.argsort(-self.amounts[idx], kind="stable")]
+        return [
+            {
+                "category": self.categories[self.category_codes[i]],
+                "amount": float(self.amounts[i]),
+                "date": None if np.isnat(self.dates[i]) else str(self.dates[i]),
+            }
+            for i in idx
+        ]
+
+    def summary(self) -> Dict:
+        """
+        The analysis dict used by the comparison agent: total_spent, categories and
+        transaction_count (as analyze_transactions always returned), plus
+        monthly_totals and per-category transaction counts. Medians and top-k are
+        separate calls since they need a sort.
+        """
+        totals = self.category_totals()
+        counts = self.category_counts()
+        valid_counts = np.bincount(self._valid_codes, minlength=len(self.categories))
+        return {
+            "total_spent": float(totals.sum()),
+            "categories": {c: float(totals[i]) for i, c in enumerate(self.categories) if valid_counts[i]},
+            "transaction_count": len(self),
+            "monthly_totals": self.monthly_totals(),
+            "category_counts": {c: int(counts[i]) for i, c in enumerate(self.categories) if counts[i]},
+        }
+
+
+class TransactionTableBuilder:
+    """Accumulates raw rows and converts them to columns every BUILD_CHUNK_ROWS rows."""
+
+    def __init__(self, chunk_rows: int = BUILD_CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+        self._codes: Dict[str, int] = {}
+        self._raw_categories: List[str] = []
+        self._raw_amounts: List[str] = []
+        self._raw_dates: List[str] = []
+        self._amount_chunks: List[np.ndarray] = []
+        self._code_chunks: List[np.ndarray] = []
+        self._date_chunks: List[np.ndarray] = []
+
+    def add_row(self, category: str, amount, date: str = ""):
+        self._raw_categories.append(category)
+        self._raw_amounts.append(amount)
+        self._raw_dates.append(date)
+        if len(self._raw_amounts) >= self.chunk_rows:
+            self._flush()
+
+    def add_records(
+        self,
+        records: Iterable[List[str]],
+        category_col: Optional[int],
+        amount_col: Optional[int],
+        date_col: Optional[int],
+    ):
+        """Add CSV records (lists of fields) given the column positions; blank records are skipped."""
+        rows = [r for r in records if r]
+        if not rows:
+            return
+        width = 1 + max(c for c in (category_col, amount_col, date_col, -1) if c is not None)
+        if min(map(len, rows)) >= width:
+            # Common case: every record has every column, extract them in bulk
+            self._raw_categories += [r[category_col] for r in rows] if category_col is not None else ["Other"] * len(rows)
+            self._raw_amounts += [r[amount_col] for r in rows] if amount_col is not None else ["0"] * len(rows)
+            self._raw_dates += [r[date_col] for r in rows] if date_col is not None else [""] * len(rows)
+            if len(self._raw_amounts) >= self.chunk_rows:
+                self._flush()
+            return
+        for record in rows:
+            n = len(record)
+            self.add_row(
+                record[category_col] if category_col is not None and category_col < n else "Other",
+                record[amount_col] if amount_col is not None and amount_col < n else "0",
+                record[date_col] if date_col is not None and date_col < n else "",
+            )
+
+    def _flush(self):
+        if not self._raw_amounts:
+            return
+        codes = self._codes
+        self._code_chunks.append(np.fromiter(
+            (codes.setdefault(c, len(codes)) for c in self._raw_categories),
+            dtype=np.int32,
+            count=len(self._raw_categories),
+        ))
+        self._amount_chunks.append(_to_float(self._raw_amounts))
+        self._date_chunks.append(_to_dates(self._raw_dates))
+        self._raw_categories, self._raw_amounts, self._raw_dates = [], [], []
+
+    def build(self) -> TransactionTable:
+        self._flush()
+        if not self._amount_chunks:
+            return TransactionTable(
+                np.empty(0), np.empty(0, dtype=np.int32), [], np.empty(0, dtype="datetime64[D]")
+            )
+        return TransactionTable(
+            np.concatenate(self._amount_chunks),
+            np.concatenate(self._code_chunks),
+            list(self._codes),
+            np.concatenate(self._date_chunks),
+        )
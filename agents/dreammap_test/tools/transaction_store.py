@@ -0,0 +1,201 @@
+"""
+Persistent per-user transaction aggregates.
+
+Instead of re-sending a user's whole history with every comparison, clients
+append only the transactions that are new since their last call. Each delta is
+grouped by (category, month) with the columnar engine and added to running
+totals in a SQLite file, so an append costs O(delta rows) and reading a user's
+summary costs O(categories x months), whatever the length of the history.
+
+Each user also has a watermark: a revision that goes up by one per applied
+delta, the id of the last applied batch (re-sending the same batch_id is a
+no-op, so a client can safely retry), the latest transaction date seen and the
+total row count.
+
+The file holds users' spending history: it defaults to data/ next to the app
+(not the shared temp dir), and the directory and file are created owner-only.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from tools.transaction_engine import TransactionTable
+
+TRANSACTION_STORE_DB_PATH = os.environ.get(
+    "TRANSACTION_STORE_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "transactions.db"),
+)
+
+
+def _create_private(path: str):
+    """Create the database file (and its directory) readable by the owner only."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+    # Also tighten a file created earlier with the default umask; SQLite gives
+    # its -wal/-shm files the database file's permissions
+    os.chmod(path, 0o600)
+
+
+class TransactionStore:
+    """Running category/month aggregates and a watermark per user, in a shared SQLite file."""
+
+    def __init__(self, path: str = TRANSACTION_STORE_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not cross a fork, so reopen in each worker process
+        if self._conn is None or self._pid != os.getpid():
+            _create_private(self.path)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_aggregates ("
+                "user_id TEXT NOT NULL, category TEXT NOT NULL, month TEXT NOT NULL, "
+                "total REAL NOT NULL, valid_count INTEGER NOT NULL, count INTEGER NOT NULL, "
+                "PRIMARY KEY (user_id, category, month))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_watermarks ("
+                "user_id TEXT PRIMARY KEY, revision INTEGER NOT NULL, batch_id TEXT, "
+                "last_date TEXT, transaction_count INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _read_watermark(self, conn: sqlite3.Connection, user_id: str) -> Optional[Dict]:
+        row = conn.execute(
+            "SELECT revision, batch_id, last_date, transaction_count, updated_at FROM user_watermarks WHERE user_id = ?",
+            (user_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        revision, batch_id, last_date, count, updated_at = row
+        return {
+            "user_id": user_id,
+            "revision": revision,
+            "batch_id": batch_id,
+            "last_date": last_date,
+            "transaction_count": count,
+            "updated_at": updated_at,
+        }
+
+    def append(self, user_id: str, table: TransactionTable, batch_id: Optional[str] = None) -> Dict:
+        """
+        Add a delta of new transactions to the user's aggregates and return the new
+        watermark. If `batch_id` equals the last applied batch, nothing changes.
+        """
+        groups = table.category_month_totals()
+        dated = table.dates[~np.isnat(table.dates)]
+        delta_last = str(dated.max()) if len(dated) else None
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                current = self._read_watermark(conn, user_id)
+                if current is not None and batch_id is not None and current["batch_id"] == batch_id:
+                    conn.execute("COMMIT")
+                    return current
+                conn.executemany(
+                    "INSERT INTO user_aggregates (user_id, category, month, total, valid_count, count) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (user_id, category, month) DO UPDATE SET "
+                    "total = total + excluded.total, valid_count = valid_count + excluded.valid_count, "
+                    "count = count + excluded.count",
+                    [(user_id, *group) for group in groups],
+                )
+                last_dates = [d for d in (current and current["last_date"], delta_last) if d]
+                conn.execute(
+                    "INSERT OR REPLACE INTO user_watermarks "
+                    "(user_id, revision, batch_id, last_date, transaction_count, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        user_id,
+                        (current["revision"] if current else 0) + 1,
+                        batch_id,
+                        max(last_dates) if last_dates else None,
+                        (current["transaction_count"] if current else 0) + len(table),
+                        time.time(),
+                    ),
+                )
+                watermark = self._read_watermark(conn, user_id)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return watermark
+
+    def watermark(self, user_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._read_watermark(self._connection(), user_id)
+
+    def summary(self, user_id: str) -> Optional[Dict]:
+        """
+        The user's analysis dict, in the shape of TransactionTable.summary(), built
+        from the stored aggregates (None for a user with no stored transactions).
+        """
+        with self._lock:
+            conn = self._connection()
+            if self._read_watermark(conn, user_id) is None:
+                return None
+            rows = conn.execute(
+                "SELECT category, month, total, valid_count, count FROM user_aggregates "
+                "WHERE user_id = ? ORDER BY month, category",
+                (user_id,),
+            ).fetchall()
+
+        categories: Dict[str, float] = {}
+        category_counts: Dict[str, int] = {}
+        monthly_totals: Dict[str, float] = {}
+        total_spent = 0.0
+        transaction_count = 0
+        for category, month, total, valid_count, count in rows:
+            transaction_count += count
+            category_counts[category] = category_counts.get(category, 0) + count
+            if valid_count:
+                total_spent += total
+                categories[category] = categories.get(category, 0.0) + total
+                if month:
+                    monthly_totals[month] = monthly_totals.get(month, 0.0) + total
+        return {
+            "total_spent": total_spent,
+            "categories": categories,
+            "transaction_count": transaction_count,
+            "monthly_totals": monthly_totals,
+            "category_counts": category_counts,
+        }
+
+    def reset(self, user_id: Optional[str] = None):
+        """Forget one user's stored transactions (or everyone's)."""
+        with self._lock:
+            conn = self._connection()
+            if user_id is None:
+                conn.execute("DELETE FROM user_aggregates")
+                conn.execute("DELETE FROM user_watermarks")
+            else:
+                conn.execute("DELETE FROM user_aggregates WHERE user_id = ?", (user_id,))
+                conn.execute("DELETE FROM user_watermarks WHERE user_id = ?", (user_id,))
+
+
+# --- Process-wide store ---
+_store: Optional[TransactionStore] = None
+
+
+def get_transaction_store() -> TransactionStore:
+    global _store
+    if _store is None:
+        _store = TransactionStore()
+    return _store
+
+
+def set_transaction_store(store: Optional[TransactionStore]):
+    """Swap the process-wide store (e.g. a temporary file in benchmarks)."""
+    global _store
+    _store = store
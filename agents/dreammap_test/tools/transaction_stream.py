@@ -0,0 +1,167 @@
+"""
+Incremental transaction CSV parsing and aggregation.
+
+Transaction histories are parsed as bytes arrive, straight into the compact
+columns of a TransactionTable, instead of being loaded into a CSV string and a
+list of row dicts first. Raw text is held for one chunk at a time; the table
+itself costs ~20 bytes per row. Gzip input (by magic bytes) is decompressed on
+the fly.
+
+The summary has the shape of comparison_agent.analyze_transactions():
+{"total_spent", "categories", "transaction_count", ...}.
+"""
+
+import codecs
+import csv
+import zlib
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List
+
+from tools.transaction_engine import TransactionTable, TransactionTableBuilder
+
+GZIP_MAGIC = b"\x1f\x8b"
+READ_CHUNK_BYTES = 64 * 1024
+
+
+class _ColumnarSink:
+    """Reads the header record, then passes every data record to a TransactionTableBuilder."""
+
+    def __init__(self):
+        self.builder = TransactionTableBuilder()
+        self._columns = None
+
+    def add_records(self, records: Iterable[List[str]]):
+        try:
+            self._add_records(iter(records))
+        except csv.Error as e:
+            # Malformed input (e.g. binary data) is a client error, like a bad amount
+            raise ValueError(f"Malformed CSV: {e}") from e
+
+    def _add_records(self, records: Iterator[List[str]]):
+        if self._columns is None:
+            header = next(records, None)
+            if header is None:
+                return
+            header = [h.strip().lower() for h in header]
+            self._columns = tuple(header.index(c) if c in header else None for c in ("category", "amount", "date"))
+        while True:
+            batch = list(islice(records, self.builder.chunk_rows))
+            if not batch:
+                return
+            self.builder.add_records(batch, *self._columns)
+
+    def table(self) -> TransactionTable:
+        return self.builder.build()
+
+
+def parse_csv_table(lines: Iterable[str]) -> TransactionTable:
+    """Parse CSV text given as an iterable of lines (a file, StringIO, ...) into columns."""
+    sink = _ColumnarSink()
+    sink.add_records(csv.reader(lines))
+    return sink.table()
+
+
+def aggregate_csv_lines(lines: Iterable[str]) -> Dict:
+    """Aggregate CSV text given as an iterable of lines (a file, StringIO, ...)."""
+    return parse_csv_table(lines).summary()
+
+
+class _RecordSplitter:
+    """
+    Turns decoded text chunks into complete CSV records. A line whose quotes
+    are unbalanced continues on the next line (newline inside a quoted field).
+    """
+
+    def __init__(self):
+        self._partial = ""
+
+    def feed(self, text: str) -> Iterator[str]:
+        data = self._partial + text
+        start = 0
+        record_start = 0
+        quotes = 0
+        while True:
+            end = data.find("\n", start)
+            if end == -1:
+                break
+            quotes += data.count('"', start, end)
+            start = end + 1
+            if quotes % 2 == 0:
+                yield data[record_start:start]
+                record_start = start
+                quotes = 0
+        self._partial = data[record_start:]
+
+    def close(self) -> Iterator[str]:
+        if self._partial:
+            yield self._partial
+        self._partial = ""
+
+
+class CSVStreamParser:
+    """Push-style parser: feed() raw (optionally gzipped) bytes, then table() or result()."""
+
+    def __init__(self, encoding: str = "utf-8-sig"):
+        self._sink = _ColumnarSink()
+        self.bytes_in = 0
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._splitter = _RecordSplitter()
+        self._gunzip = None
+        # Bytes held back until there are enough to check for the gzip magic
+        self._head = b""
+        self._started = False
+
+    def feed(self, chunk: bytes):
+        if not chunk:
+            return
+        self.bytes_in += len(chunk)
+        if not self._started:
+            # A short first read may not contain the whole magic yet
+            self._head += chunk
+            if len(self._head) < len(GZIP_MAGIC):
+                return
+            chunk, self._head = self._head, b""
+            self._start(chunk)
+        self._decode(chunk)
+
+    def _start(self, head: bytes):
+        self._started = True
+        if head[:2] == GZIP_MAGIC:
+            self._gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def _decode(self, chunk: bytes):
+        if self._gunzip is not None:
+            chunk = self._gunzip.decompress(chunk)
+        self._consume(self._decoder.decode(chunk))
+
+    def _consume(self, text: str):
+        if text:
+            self._sink.add_records(csv.reader(self._splitter.feed(text)))
+
+    def table(self) -> TransactionTable:
+        if not self._started and self._head:
+            self._start(self._head)
+            self._decode(self._head)
+            self._head = b""
+        tail = self._gunzip.flush() if self._gunzip is not None else b""
+        self._consume(self._decoder.decode(tail, final=True))
+        self._sink.add_records(csv.reader(self._splitter.close()))
+        return self._sink.table()
+
+    def result(self) -> Dict:
+        return self.table().summary()
+
+
+def read_csv_table(fileobj: BinaryIO, chunk_bytes: int = READ_CHUNK_BYTES) -> TransactionTable:
+    """Parse a binary file object holding CSV (plain or gzip) into columns, one chunk at a time."""
+    parser = CSVStreamParser()
+    while True:
+        chunk = fileobj.read(chunk_bytes)
+        if not chunk:
+            return parser.table()
+        parser.feed(chunk)
+
+
+def aggregate_csv_file(fileobj: BinaryIO, chunk_bytes: int = READ_CHUNK_BYTES) -> Dict:
+    """Aggregate a binary file object holding CSV (plain or gzip), one chunk at a time."""
+    return read_csv_table(fileobj, chunk_bytes).summary()